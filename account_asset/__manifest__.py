@@ -23,6 +23,7 @@ Keeps track of depreciations, and creates corresponding journal entries.
         'data/assets_report.xml',
         'data/account_report_actions.xml',
         'data/menuitems.xml',
+        'data/account_asset_cron.xml',
     ],
     'demo': [
         'demo/account_asset_demo.xml',
@@ -3,6 +3,7 @@
 
 import psycopg2
 import datetime
+import threading
 from dateutil.relativedelta import relativedelta
 from markupsafe import Markup
 from math import copysign
@@ -14,6 +15,24 @@ from odoo.tools import float_compare, float_is_zero, formatLang, end_of
 DAYS_PER_MONTH = 30
 DAYS_PER_YEAR = DAYS_PER_MONTH * 12
 
+
+class FiscalYearCache:
+    """ Fiscal years of the companies met while computing depreciation boards, so that
+    compute_fiscalyear_dates is only called once per company and fiscal year. """
+
+    def __init__(self):
+        self.fiscal_years = {}
+
+    def get_date_to(self, company, date):
+        fiscal_years = self.fiscal_years.setdefault(company.id, [])
+        for date_from, date_to in fiscal_years:
+            if date_from <= date <= date_to:
+                return date_to
+        fiscalyear_dates = company.compute_fiscalyear_dates(date)
+        fiscal_years.append((fiscalyear_dates['date_from'], fiscalyear_dates['date_to']))
+        return fiscalyear_dates['date_to']
+
+
 class AccountAsset(models.Model):
     _name = 'account.asset'
     _description = 'Asset/Revenue Recognition'
@@ -123,6 +142,9 @@ class AccountAsset(models.Model):
 
     # Links with entries
     depreciation_move_ids = fields.One2many('account.move', 'asset_id', string='Depreciation Lines')
+    # depreciations of the board beyond the rolling window, created by _cron_extend_depreciation_boards
+    depreciation_plan = fields.Json(copy=False)
+    depreciation_plan_date = fields.Date(copy=False, index=True)
     original_move_line_ids = fields.Many2many('account.move.line', 'asset_move_line_rel', 'asset_id', 'line_id', string='Journal Items', copy=False)
 
     # Dates
@@ -388,7 +410,7 @@ class AccountAsset(models.Model):
         """ When changing the fields that should change the values of the entries, we unlink the entries, so the
          depreciation board is not inconsistent with the values of the asset"""
         self.write(
-            {'depreciation_move_ids': [Command.set([])]}
+            {'depreciation_move_ids': [Command.set([])], 'depreciation_plan': False, 'depreciation_plan_date': False}
         )
 
     # -------------------------------------------------------------------------
@@ -406,6 +428,7 @@ class AccountAsset(models.Model):
             if (
                 asset.state == 'open'
                 and asset.depreciation_move_ids
+                and not asset.depreciation_plan
                 and not asset.currency_id.is_zero(
                     asset.depreciation_move_ids.sorted(lambda x: (x.date, x.id))[-1].asset_remaining_value
                 )
@@ -576,17 +599,96 @@ class AccountAsset(models.Model):
         # Need to unlink draft moves before adding new ones because if we create new moves before, it will cause an error
         self.depreciation_move_ids.filtered(lambda mv: mv.state == 'draft').unlink()
 
+        fiscalyear_cache = FiscalYearCache()
+        horizon = self._get_depreciation_board_horizon()
         new_depreciation_moves_data = []
         for asset in self:
-            new_depreciation_moves_data.extend(asset._recompute_board(date))
+            board = asset._compute_board(date, fiscalyear_cache=fiscalyear_cache)
+            plan = [vals for vals in board if horizon and vals['date'] > horizon]
+            new_depreciation_moves_data.extend(
+                self.env['account.move']._prepare_move_for_asset_depreciation(vals)
+                for vals in board[:len(board) - len(plan)]
+            )
+            asset._set_depreciation_plan(plan)
 
         new_depreciation_moves = self.env['account.move'].create(new_depreciation_moves_data)
         new_depreciation_moves_to_post = new_depreciation_moves.filtered(lambda move: move.asset_id.state == 'open')
         # In case of the asset is in running mode, we post in the past and set to auto post move in the future
         new_depreciation_moves_to_post._post()
 
+    @api.model
+    def _get_depreciation_board_horizon(self):
+        """ Date until which the depreciation moves are created, the following ones being kept in the
+        plan of the asset until they enter the rolling window. No limit if the window is not set. """
+        months = int(self.env['ir.config_parameter'].sudo().get_param('account_asset.depreciation_board_months', 0))
+        return months and fields.Date.context_today(self) + relativedelta(months=months)
+
+    def _set_depreciation_plan(self, plan):
+        self.ensure_one()
+        if not plan and not self.depreciation_plan:
+            return
+        self.write({
+            'depreciation_plan': [{
+                'amount': vals['amount'],
+                'depreciation_beginning_date': fields.Date.to_string(vals['depreciation_beginning_date']),
+                'date': fields.Date.to_string(vals['date']),
+                'asset_number_days': vals['asset_number_days'],
+            } for vals in plan] or False,
+            'depreciation_plan_date': plan[0]['date'] if plan else False,
+        })
+
+    def _get_depreciation_plan(self):
+        self.ensure_one()
+        return [{
+            **vals,
+            'asset_id': self,
+            'depreciation_beginning_date': fields.Date.to_date(vals['depreciation_beginning_date']),
+            'date': fields.Date.to_date(vals['date']),
+        } for vals in self.depreciation_plan or []]
+
+    def _report_to_depreciation_plan(self, amount):
+        """ Adds the amount to the first planned depreciation, the way a reversed depreciation
+        is reported to the next draft move when the board is fully created. """
+        self.ensure_one()
+        plan = self._get_depreciation_plan()
+        plan[0]['amount'] = self.currency_id.round(plan[0]['amount'] + amount)
+        self._set_depreciation_plan(plan)
+
+    @api.model
+    def _cron_extend_depreciation_boards(self, batch_size=1000):
+        """ Creates the depreciation moves of the plans entering the rolling window. When the
+        window is disabled, the remaining plans are created entirely. """
+        horizon = self._get_depreciation_board_horizon()
+        domain = [('depreciation_plan_date', '<=', horizon)] if horizon else [('depreciation_plan_date', '!=', False)]
+        while True:
+            assets = self.search(domain, limit=batch_size)
+            if not assets:
+                return
+            new_depreciation_moves_data = []
+            for asset in assets:
+                plan = asset._get_depreciation_plan()
+                new_depreciation_moves_data.extend(
+                    self.env['account.move']._prepare_move_for_asset_depreciation(vals)
+                    for vals in plan if not horizon or vals['date'] <= horizon
+                )
+                asset._set_depreciation_plan([vals for vals in plan if horizon and vals['date'] > horizon])
+            new_depreciation_moves = self.env['account.move'].create(new_depreciation_moves_data)
+            new_depreciation_moves.filtered(lambda move: move.asset_id.state == 'open')._post()
+            if not getattr(threading.current_thread(), 'testing', False):
+                self.env.cr.commit()
+
     def _recompute_board(self, start_depreciation_date=False):
         self.ensure_one()
+        return [
+            self.env['account.move']._prepare_move_for_asset_depreciation(vals)
+            for vals in self._compute_board(start_depreciation_date)
+        ]
+
+    def _compute_board(self, start_depreciation_date=False, fiscalyear_cache=None):
+        """ Computes the depreciations of the asset, as the values expected by
+        _prepare_move_for_asset_depreciation. """
+        self.ensure_one()
+        fiscalyear_cache = fiscalyear_cache or FiscalYearCache()
         # All depreciation moves that are posted
         posted_depreciation_move_ids = self.depreciation_move_ids.filtered(
             lambda mv: mv.state == 'posted' and not mv.asset_value_change
@@ -605,12 +707,12 @@ class AccountAsset(models.Model):
             # If it has a parent, we want the increase only for the remaining days the parent has
             final_depreciation_date = self.parent_id.paused_prorata_date + relativedelta(months=int(self.parent_id.method_period) * self.parent_id.method_number, days=-1)
 
-        final_depreciation_date = self._get_end_period_date(final_depreciation_date)
-        depreciation_move_values = []
+        final_depreciation_date = self._get_end_period_date(final_depreciation_date, fiscalyear_cache=fiscalyear_cache)
+        depreciation_values = []
         if not float_is_zero(self.value_residual, precision_rounding=self.currency_id.rounding):
             while not self.currency_id.is_zero(residual_amount) and start_depreciation_date < final_depreciation_date:
-                period_end_depreciation_date = self._get_end_period_date(start_depreciation_date)
-                period_end_fiscalyear_date = self.company_id.compute_fiscalyear_dates(period_end_depreciation_date).get('date_to')
+                period_end_depreciation_date = self._get_end_period_date(start_depreciation_date, fiscalyear_cache=fiscalyear_cache)
+                period_end_fiscalyear_date = fiscalyear_cache.get_date_to(self.company_id, period_end_depreciation_date)
 
                 days, amount = self._compute_board_amount(residual_amount, start_depreciation_date, period_end_depreciation_date, False, False, residual_declining)
                 residual_amount -= amount
@@ -631,28 +733,31 @@ class AccountAsset(models.Model):
 
                 if not float_is_zero(amount, precision_rounding=self.currency_id.rounding):
                     # For deferred revenues, we should invert the amounts.
-                    depreciation_move_values.append(self.env['account.move']._prepare_move_for_asset_depreciation({
+                    depreciation_values.append({
                         'amount': amount,
                         'asset_id': self,
                         'depreciation_beginning_date': start_depreciation_date,
                         'date': period_end_depreciation_date,
                         'asset_number_days': days,
-                    }))
+                    })
 
                 if period_end_depreciation_date == period_end_fiscalyear_date:
                     residual_declining = residual_amount
 
                 start_depreciation_date = period_end_depreciation_date + relativedelta(days=1)
 
-        return depreciation_move_values
+        return depreciation_values
 
-    def _get_end_period_date(self, start_depreciation_date):
+    def _get_end_period_date(self, start_depreciation_date, fiscalyear_cache=None):
         """Get the end of the period in which the depreciation is posted.
 
         Can be the end of the month if the asset is depreciated monthly, or the end of the fiscal year is it is depreciated yearly.
         """
         self.ensure_one()
-        fiscalyear_date = self.company_id.compute_fiscalyear_dates(start_depreciation_date).get('date_to')
+        if fiscalyear_cache:
+            fiscalyear_date = fiscalyear_cache.get_date_to(self.company_id, start_depreciation_date)
+        else:
+            fiscalyear_date = self.company_id.compute_fiscalyear_dates(start_depreciation_date).get('date_to')
         period_end_depreciation_date = fiscalyear_date if start_depreciation_date < fiscalyear_date else fiscalyear_date + relativedelta(years=1)
 
         if self.method_period == '1':  # If method period is set to monthly computation
@@ -878,6 +983,7 @@ class AccountAsset(models.Model):
             else:
                 asset._message_log(body=_('Asset Cancelled'))
             asset.depreciation_move_ids.filtered(lambda m: m.state == 'draft').with_context(force_delete=True).unlink()
+            asset._set_depreciation_plan([])
             asset.asset_paused_days = 0
             asset.write({'state': 'cancelled'})
 
@@ -1014,6 +1120,7 @@ class AccountAsset(models.Model):
                 and m.date > date
             ))
             obsolete_moves._unlink_or_reverse()
+            asset._set_depreciation_plan([])
 
     def _get_disposal_moves(self, invoice_lines_list, disposal_date):
         """Create the move for the disposal of an asset.
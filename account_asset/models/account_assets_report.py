@@ -349,6 +349,17 @@ class AssetsReportCustomHandler(models.AbstractModel):
             'include_draft': options.get('all_entries', False),
         }
 
+        # the depreciations beyond the rolling window of the boards are not created yet, take them from the
+        # plan: all of them with the draft entries, else the due ones, that would be posted by now
+        query_params['plan_date_to'] = options['date']['date_to'] if options.get('all_entries') else fields.Date.context_today(self)
+        plan_query = """COALESCE((
+                SELECT SUM((plan->>'amount')::numeric)
+                  FROM jsonb_array_elements(asset.depreciation_plan) plan
+                 WHERE jsonb_typeof(asset.depreciation_plan) = 'array'
+                   AND (plan->>'date')::date <= %(plan_date_to)s
+                   AND (plan->>'date')::date {date_filter}
+            ), 0)"""
+
         prefix_query = ''
         if prefix_to_match:
             prefix_query = "AND asset.name ILIKE %(prefix_to_match)s"
@@ -388,8 +399,10 @@ class AssetsReportCustomHandler(models.AbstractModel):
                    account.code AS account_code,
                    account.name AS account_name,
                    account.id AS account_id,
-                   COALESCE(SUM(move.depreciation_value) FILTER (WHERE move.date < %(date_from)s AND {move_filter}), 0) + COALESCE(asset.already_depreciated_amount_import, 0) AS depreciated_before,
-                   COALESCE(SUM(move.depreciation_value) FILTER (WHERE move.date BETWEEN %(date_from)s AND %(date_to)s AND {move_filter}), 0) AS depreciated_during,
+                   COALESCE(SUM(move.depreciation_value) FILTER (WHERE move.date < %(date_from)s AND {move_filter}), 0) + COALESCE(asset.already_depreciated_amount_import, 0)
+                   + {plan_query.format(date_filter="< %(date_from)s")} AS depreciated_before,
+                   COALESCE(SUM(move.depreciation_value) FILTER (WHERE move.date BETWEEN %(date_from)s AND %(date_to)s AND {move_filter}), 0)
+                   + {plan_query.format(date_filter="BETWEEN %(date_from)s AND %(date_to)s")} AS depreciated_during,
                    COALESCE(SUM(move.depreciation_value) FILTER (WHERE move.date BETWEEN %(date_from)s AND %(date_to)s AND {move_filter} AND move.asset_number_days IS NULL), 0) AS asset_disposal_value
               FROM account_asset AS asset
          LEFT JOIN account_account AS account ON asset.account_asset_id = account.id
@@ -132,6 +132,9 @@ class AccountMove(models.Model):
                 if first_draft:
                     # If there is a draft, simply move/add the depreciation amount here
                     first_draft.depreciation_value += move.depreciation_value
+                elif move.asset_id.depreciation_plan:
+                    # The next depreciations are beyond the rolling window, add the amount to the first one
+                    move.asset_id._report_to_depreciation_plan(move.depreciation_value)
                 else:
                     # If there was no draft move left, create one
                     last_date = max(move.asset_id.depreciation_move_ids.mapped('date'))
@@ -1114,3 +1114,53 @@ class TestAccountAssetNew(AccountTestInvoicingCommon):
             self._get_depreciation_move_values(date='2023-12-31', depreciation_value=12000, remaining_value=12000, depreciated_value=48000, state='draft'),
             self._get_depreciation_move_values(date='2024-12-31', depreciation_value=12000, remaining_value=0, depreciated_value=60000, state='draft'),
         ])
+
+    def test_linear_5_years_rolling_window_asset(self):
+        self.env['ir.config_parameter'].sudo().set_param('account_asset.depreciation_board_months', 12)
+        self.car.validate()
+
+        self.assertEqual(self.car.state, 'open')
+        self.assertEqual(self.car.book_value, 36000)
+        self.assertRecordValues(self.car.depreciation_move_ids, [
+            self._get_depreciation_move_values(date='2020-12-31', depreciation_value=12000, remaining_value=48000, depreciated_value=12000, state='posted'),
+            self._get_depreciation_move_values(date='2021-12-31', depreciation_value=12000, remaining_value=36000, depreciated_value=24000, state='posted'),
+            self._get_depreciation_move_values(date='2022-12-31', depreciation_value=12000, remaining_value=24000, depreciated_value=36000, state='draft'),
+        ])
+        self.assertEqual([vals['date'] for vals in self.car.depreciation_plan], ['2023-12-31', '2024-12-31'])
+        self.assertEqual(self.car.depreciation_plan_date, fields.Date.from_string('2023-12-31'))
+
+        with freeze_time('2023-01-15'):
+            self.env['account.asset']._cron_extend_depreciation_boards()
+        self.assertRecordValues(self.car.depreciation_move_ids, [
+            self._get_depreciation_move_values(date='2020-12-31', depreciation_value=12000, remaining_value=48000, depreciated_value=12000, state='posted'),
+            self._get_depreciation_move_values(date='2021-12-31', depreciation_value=12000, remaining_value=36000, depreciated_value=24000, state='posted'),
+            self._get_depreciation_move_values(date='2022-12-31', depreciation_value=12000, remaining_value=24000, depreciated_value=36000, state='draft'),
+            self._get_depreciation_move_values(date='2023-12-31', depreciation_value=12000, remaining_value=12000, depreciated_value=48000, state='draft'),
+        ])
+        self.assertEqual([vals['date'] for vals in self.car.depreciation_plan], ['2024-12-31'])
+
+        # modifying the board computes the plan again
+        self.car._cancel_future_moves(fields.Date.from_string('2022-07-01'))
+        self.assertFalse(self.car.depreciation_plan)
+        self.assertFalse(self.car.depreciation_plan_date)
+
+    def test_rolling_window_reversal_and_disabled_window(self):
+        self.env['ir.config_parameter'].sudo().set_param('account_asset.depreciation_board_months', 12)
+        self.car.validate()
+        last_move = self.car.depreciation_move_ids.filtered(lambda m: m.state == 'draft')
+        last_move._post(soft=False)
+
+        # without any draft entry left in the window, a reversed depreciation is reported to the plan
+        last_move._reverse_moves(cancel=True)
+        self.assertFalse(self.car.depreciation_move_ids.filtered(lambda m: m.date > last_move.date and not m.reversed_entry_id))
+        self.assertEqual([vals['date'] for vals in self.car.depreciation_plan], ['2023-12-31', '2024-12-31'])
+        self.assertEqual([vals['amount'] for vals in self.car.depreciation_plan], [24000, 12000])
+
+        # disabling the window creates the remaining plans entirely
+        self.env['ir.config_parameter'].sudo().set_param('account_asset.depreciation_board_months', 0)
+        self.env['account.asset']._cron_extend_depreciation_boards()
+        self.assertFalse(self.car.depreciation_plan)
+        self.assertRecordValues(self.car.depreciation_move_ids.filtered(lambda m: m.date > last_move.date).sorted('date'), [
+            self._get_depreciation_move_values(date='2023-12-31', depreciation_value=24000, remaining_value=12000, depreciated_value=48000, state='draft'),
+            self._get_depreciation_move_values(date='2024-12-31', depreciation_value=12000, remaining_value=0, depreciated_value=60000, state='draft'),
+        ])
@@ -1,8 +1,14 @@
 # -*- coding: utf-8 -*-
+import logging
+import time
+from collections import defaultdict
+
 from odoo import models, tools, _
 from odoo.addons.base.models.res_bank import sanitize_account_number
 from odoo.exceptions import UserError, RedirectWarning
 
+_logger = logging.getLogger(__name__)
+
 
 class AccountJournal(models.Model):
     _inherit = "account.journal"
@@ -42,9 +48,11 @@ class AccountJournal(models.Model):
         # The active_id is passed in context in case an implementation module requires information about the wizard state (see QIF)
         for attachment in attachments:
             try:
+                start_time = time.time()
                 currency_code, account_number, stmts_vals = self._parse_bank_statement_file(attachment)
                 # Check raw data
                 self._check_parsed_data(stmts_vals, account_number)
+                parse_time = time.time()
                 # Try to find the currency and journal in odoo
                 journal = self._find_additional_data(currency_code, account_number)
                 # If no journal found, ask the user about creating one
@@ -52,9 +60,14 @@ class AccountJournal(models.Model):
                     raise UserError(_('You have to set a Default Account for the journal: %s', journal.name))
                 # Prepare statement data to be used for bank statements creation
                 stmts_vals = self._complete_bank_statement_vals(stmts_vals, journal, account_number, attachment)
+                match_time = time.time()
                 # Create the bank statements
-                statement_ids, dummy, notifications = self._create_bank_statements(stmts_vals)
+                statement_ids, statement_line_ids, notifications = self._create_bank_statements(stmts_vals)
                 statement_ids_all.extend(statement_ids)
+                _logger.info(
+                    "Imported %s statement lines from %s: parse %.2fs, match %.2fs, create %.2fs",
+                    len(statement_line_ids), attachment.name,
+                    parse_time - start_time, match_time - parse_time, time.time() - match_time)
 
                 # Now that the import worked out, set it as the bank_statements_source of the journal
                 if journal.bank_statements_source != 'file_import':
@@ -214,6 +227,8 @@ class AccountJournal(models.Model):
         return journal
 
     def _complete_bank_statement_vals(self, stmts_vals, journal, account_number, attachment):
+        sanitized_account_number = sanitize_account_number(account_number)
+        lines_to_match = []
         for st_vals in stmts_vals:
             if not st_vals.get('reference'):
                 st_vals['reference'] = attachment.name
@@ -221,66 +236,88 @@ class AccountJournal(models.Model):
                 line_vals['journal_id'] = journal.id
                 unique_import_id = line_vals.get('unique_import_id')
                 if unique_import_id:
-                    sanitized_account_number = sanitize_account_number(account_number)
                     line_vals['unique_import_id'] = (sanitized_account_number and sanitized_account_number + '-' or '') + str(journal.id) + '-' + unique_import_id
 
-                if not line_vals.get('partner_bank_id'):
-                    # Find the partner and his bank account or create the bank account. The partner selected during the
-                    # reconciliation process will be linked to the bank when the statement is closed.
-                    identifying_string = line_vals.get('account_number')
-                    if identifying_string:
-                        if line_vals.get('partner_id'):
-                            partner_bank = self.env['res.partner.bank'].search([
-                                ('acc_number', '=', identifying_string),
-                                ('partner_id', '=', line_vals['partner_id'])
-                            ])
-                        else:
-                            partner_bank = self.env['res.partner.bank'].search([
-                                ('acc_number', '=', identifying_string),
-                                ('company_id', 'in', (False, journal.company_id.id))
-                            ])
-                        # If multiple partners share the same account number, do not try to guess and just avoid setting it
-                        if partner_bank and len(partner_bank) == 1:
-                            line_vals['partner_bank_id'] = partner_bank.id
-                            line_vals['partner_id'] = partner_bank.partner_id.id
+                # Find the partner and his bank account. The partner selected during the reconciliation process
+                # will be linked to the bank when the statement is closed.
+                if not line_vals.get('partner_bank_id') and line_vals.get('account_number'):
+                    lines_to_match.append(line_vals)
+
+        if lines_to_match:
+            # fetch the bank accounts of all the transactions at once
+            partner_banks_by_number = defaultdict(lambda: self.env['res.partner.bank'])
+            partner_banks = self.env['res.partner.bank'].search([
+                ('acc_number', 'in', list({line_vals['account_number'] for line_vals in lines_to_match})),
+            ])
+            for partner_bank in partner_banks:
+                partner_banks_by_number[partner_bank.sanitized_acc_number] |= partner_bank
+
+            for line_vals in lines_to_match:
+                partner_bank = partner_banks_by_number[sanitize_account_number(line_vals['account_number'])]
+                if line_vals.get('partner_id'):
+                    partner_bank = partner_bank.filtered(lambda b: b.partner_id.id == line_vals['partner_id'])
+                else:
+                    partner_bank = partner_bank.filtered(lambda b: not b.company_id or b.company_id == journal.company_id)
+                # If multiple partners share the same account number, do not try to guess and just avoid setting it
+                if len(partner_bank) == 1:
+                    line_vals['partner_bank_id'] = partner_bank.id
+                    line_vals['partner_id'] = partner_bank.partner_id.id
         return stmts_vals
 
+    def _get_imported_unique_import_ids(self, unique_import_ids):
+        """ Returns the subset of the given unique import ids that have already been imported. """
+        if not unique_import_ids:
+            return set()
+        self.env['account.bank.statement.line'].flush_model(['unique_import_id'])
+        self.env.cr.execute("""
+            SELECT unique_import_id
+              FROM account_bank_statement_line
+             WHERE unique_import_id = ANY(%s)
+        """, [list(unique_import_ids)])
+        return {unique_import_id for unique_import_id, in self.env.cr.fetchall()}
+
     def _create_bank_statements(self, stmts_vals, raise_no_imported_file=True):
         """ Create new bank statements from imported values, filtering out already imported transactions, and returns data used by the reconciliation widget """
         BankStatement = self.env['account.bank.statement']
-        BankStatementLine = self.env['account.bank.statement.line']
 
         # Filter out already imported transactions and create statements
-        statement_ids = []
-        statement_line_ids = []
+        seen_import_ids = self._get_imported_unique_import_ids({
+            line_vals['unique_import_id']
+            for st_vals in stmts_vals
+            for line_vals in st_vals['transactions']
+            if line_vals.get('unique_import_id')
+        })
+        statement_vals_list = []
         ignored_statement_lines_import_ids = []
         for st_vals in stmts_vals:
             filtered_st_lines = []
             for line_vals in st_vals['transactions']:
-                if (line_vals['amount'] != 0
-                   and ('unique_import_id' not in line_vals
-                   or not line_vals['unique_import_id']
-                   or not bool(BankStatementLine.sudo().search([('unique_import_id', '=', line_vals['unique_import_id'])], limit=1)))):
+                unique_import_id = line_vals.get('unique_import_id')
+                if line_vals['amount'] != 0 and (not unique_import_id or unique_import_id not in seen_import_ids):
                     filtered_st_lines.append(line_vals)
+                    if unique_import_id:
+                        seen_import_ids.add(unique_import_id)
                 else:
-                    ignored_statement_lines_import_ids.append(line_vals['unique_import_id'])
+                    ignored_statement_lines_import_ids.append(unique_import_id)
                     if st_vals.get('balance_start') is not None:
                         st_vals['balance_start'] += float(line_vals['amount'])
 
             if len(filtered_st_lines) > 0:
                 # Remove values that won't be used to create records
                 st_vals.pop('transactions', None)
-                # Create the statement
                 st_vals['line_ids'] = [[0, False, line] for line in filtered_st_lines]
-                statement = BankStatement.with_context(default_journal_id=self.id).create(st_vals)
-                if not statement.name:
-                    statement.name = st_vals['reference']
-                statement_ids.append(statement.id)
-                statement_line_ids.extend(statement.line_ids.ids)
-
-                # Create the report.
-                if statement.is_complete:
-                    statement.action_generate_attachment()
+                statement_vals_list.append(st_vals)
+
+        # Create the statements, and their lines, in batch
+        statements = BankStatement.with_context(default_journal_id=self.id).create(statement_vals_list)
+        for statement, st_vals in zip(statements, statement_vals_list):
+            if not statement.name:
+                statement.name = st_vals['reference']
+            # Create the report.
+            if statement.is_complete:
+                statement.action_generate_attachment()
+        statement_ids = statements.ids
+        statement_line_ids = statements.line_ids.ids
 
         if len(statement_line_ids) == 0 and raise_no_imported_file:
             raise UserError(_('You already have imported that file.'))
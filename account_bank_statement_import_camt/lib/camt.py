@@ -1,7 +1,9 @@
 
 import math
 import re
-from functools import partial
+from functools import lru_cache, partial
+
+from lxml import etree
 
 from odoo import _lt
 from odoo.exceptions import ValidationError
@@ -481,16 +483,28 @@ codes = {
 }
 
 
+@lru_cache(maxsize=512)
+def _compile_xpath(xpath, namespaces):
+    return etree.XPath(xpath, namespaces=dict(namespaces))
+
+
+def _xpath(node, xpath, namespaces):
+    """ Evaluates the xpath on the node, compiling each expression only once per set of namespaces. """
+    return _compile_xpath(xpath, tuple(namespaces.items()))(node)
+
+
 def _generic_get(*nodes, xpath, namespaces, placeholder=None):
     if placeholder is not None:
         xpath = xpath.format(placeholder=placeholder)
     for node in nodes:
-        item = node.xpath(xpath, namespaces=namespaces)
+        item = _xpath(node, xpath, namespaces)
         if item:
             return item[0]
     return False
 
 class CAMT:
+    _xpath = staticmethod(_xpath)
+
     # These are pair of getters: (getter for the amount, getter for the amount's currency)
     _amount_getters = [
         (partial(_generic_get, xpath='ns:AmtDtls/ns:CntrValAmt/ns:Amt/text()'), partial(_generic_get, xpath='ns:AmtDtls/ns:CntrValAmt/ns:Amt/@Ccy')),
@@ -729,7 +743,7 @@ class CAMT:
                 './/ns:RmtInf/ns:Strd/ns:CdtrRefInf/ns:Ref/text()',
                 'ns:AddtlNtryInf/text()')
         for xpath in xpaths:
-            transaction_name = node.xpath(xpath, namespaces=namespaces)
+            transaction_name = _xpath(node, xpath, namespaces)
             if transaction_name:
                 return ' '.join(transaction_name)
         return '/'
@@ -743,9 +757,9 @@ class CAMT:
 
     @staticmethod
     def _get_unique_import_id(entry, sequence, name, date, unique_import_set, namespaces):
-        unique_import_ref = entry.xpath('ns:AcctSvcrRef/text()', namespaces=namespaces)
+        unique_import_ref = _xpath(entry, 'ns:AcctSvcrRef/text()', namespaces)
         if unique_import_ref and not CAMT._is_full_of_zeros(unique_import_ref[0]) and unique_import_ref[0] != 'NOTPROVIDED':
-            entry_ref = entry.xpath('ns:NtryRef/text()', namespaces=namespaces)
+            entry_ref = _xpath(entry, 'ns:NtryRef/text()', namespaces)
             if entry_ref:
                 return '{}-{}-{}'.format(name, unique_import_ref[0], entry_ref[0])
             elif not entry_ref and unique_import_ref[0] not in unique_import_set:
@@ -757,9 +771,9 @@ class CAMT:
 
     @staticmethod
     def _get_transaction_type(node, namespaces):
-        code = node.xpath('ns:Domn/ns:Cd/text()', namespaces=namespaces)
-        family = node.xpath('ns:Domn/ns:Fmly/ns:Cd/text()', namespaces=namespaces)
-        subfamily = node.xpath('ns:Domn/ns:Fmly/ns:SubFmlyCd/text()', namespaces=namespaces)
+        code = _xpath(node, 'ns:Domn/ns:Cd/text()', namespaces)
+        family = _xpath(node, 'ns:Domn/ns:Fmly/ns:Cd/text()', namespaces)
+        subfamily = _xpath(node, 'ns:Domn/ns:Fmly/ns:SubFmlyCd/text()', namespaces)
         if code:
             return {'transaction_type': "{code}: {family} ({subfamily})".format(
                 code=codes[code[0]],
@@ -770,12 +784,12 @@ class CAMT:
 
     @staticmethod
     def _get_partner_address(node, ns, ph):
-        StrtNm = node.xpath('ns:RltdPties/ns:{}/ns:PstlAdr/ns:StrtNm/text()'.format(ph), namespaces=ns)
-        BldgNb = node.xpath('ns:RltdPties/ns:{}/ns:PstlAdr/ns:BldgNb/text()'.format(ph), namespaces=ns)
-        PstCd = node.xpath('ns:RltdPties/ns:{}/ns:PstlAdr/ns:PstCd/text()'.format(ph), namespaces=ns)
-        TwnNm = node.xpath('ns:RltdPties/ns:{}/ns:PstlAdr/ns:TwnNm/text()'.format(ph), namespaces=ns)
-        Ctry = node.xpath('ns:RltdPties/ns:{}/ns:PstlAdr/ns:Ctry/text()'.format(ph), namespaces=ns)
-        AdrLine = node.xpath('ns:RltdPties/ns:{}/ns:PstlAdr/ns:AdrLine/text()'.format(ph), namespaces=ns)
+        StrtNm = _xpath(node, 'ns:RltdPties/ns:{}/ns:PstlAdr/ns:StrtNm/text()'.format(ph), ns)
+        BldgNb = _xpath(node, 'ns:RltdPties/ns:{}/ns:PstlAdr/ns:BldgNb/text()'.format(ph), ns)
+        PstCd = _xpath(node, 'ns:RltdPties/ns:{}/ns:PstlAdr/ns:PstCd/text()'.format(ph), ns)
+        TwnNm = _xpath(node, 'ns:RltdPties/ns:{}/ns:PstlAdr/ns:TwnNm/text()'.format(ph), ns)
+        Ctry = _xpath(node, 'ns:RltdPties/ns:{}/ns:PstlAdr/ns:Ctry/text()'.format(ph), ns)
+        AdrLine = _xpath(node, 'ns:RltdPties/ns:{}/ns:PstlAdr/ns:AdrLine/text()'.format(ph), ns)
         address = "\n".join(AdrLine)
         if StrtNm:
             address = "\n".join([address, ", ".join(StrtNm + BldgNb)])
@@ -789,3 +803,41 @@ class CAMT:
     def _is_full_of_zeros(strg):
         pattern_zero = re.compile('^0+$')
         return bool(pattern_zero.match(strg))
+
+    @staticmethod
+    def _iter_statements(file):
+        """ Parses the CAMT file incrementally, yielding each statement (or notification) node
+        along with a generator of its entries. When an entry is yielded, the statement node
+        holds the elements preceding the entries (account, balances...), and it is complete
+        once its entries are exhausted. Processed entries and statements are removed from the
+        tree, so that it never holds more than the current statement and entry. This only
+        bounds the parsed tree: the content of the file is still read from memory, and the
+        values extracted from the statements grow with the number of transactions.
+        """
+        events = etree.iterparse(file, events=('end',), tag=('{*}Stmt', '{*}Ntfctn', '{*}Ntry'))
+        node = next(events, (None, None))[1]
+
+        def is_entry(node):
+            return etree.QName(node).localname == 'Ntry'
+
+        def iter_entries():
+            nonlocal node
+            while node is not None and is_entry(node):
+                entry = node
+                yield entry
+                entry.clear(keep_tail=True)
+                previous = entry.getprevious()
+                if previous is not None and previous.tag == entry.tag:
+                    entry.getparent().remove(previous)
+                node = next(events, (None, None))[1]
+
+        while node is not None:
+            entries = iter_entries()
+            yield node.getparent() if is_entry(node) else node, entries
+            # skip the entries that were not processed by the caller
+            for dummy in entries:
+                pass
+            node.clear()
+            while node.getprevious() is not None:
+                del node.getparent()[0]
+            node = next(events, (None, None))[1]
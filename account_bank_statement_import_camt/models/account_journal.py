@@ -24,22 +24,23 @@ class AccountJournal(models.Model):
 
     def _check_camt(self, attachment):
         try:
-            root = etree.parse(io.BytesIO(attachment.raw)).getroot()
+            # only the root element is needed to recognize the file, the content is parsed incrementally
+            dummy, root = next(etree.iterparse(io.BytesIO(attachment.raw), events=('start',)))
         except Exception:
             return None
-        if root.tag.find('camt.053') != -1:
+        if root.tag.find('camt.053') != -1 or root.tag.find('camt.054') != -1:
             return root
         return None
 
     def _parse_bank_statement_file(self, attachment):
-        root = self._check_camt(attachment)
-        if root is not None:
-            return self._parse_bank_statement_file_camt(root)
+        if self._check_camt(attachment) is not None:
+            try:
+                return self._parse_bank_statement_file_camt(attachment)
+            except etree.XMLSyntaxError as e:
+                raise UserError(_("The CAMT file could not be read: %s", e))
         return super()._parse_bank_statement_file(attachment)
 
-    def _parse_bank_statement_file_camt(self, root):
-        ns = {k or 'ns': v for k, v in root.nsmap.items()}
-
+    def _parse_bank_statement_file_camt(self, attachment):
         curr_cache = {c['name']: c['id'] for c in self.env['res.currency'].search_read([], ['id', 'name'])}
         statements_per_iban = {}
         currency_per_iban = {}
@@ -47,9 +48,10 @@ class AccountJournal(models.Model):
         currency = account_no = False
         has_multi_currency = self.env.user.user_has_groups('base.group_multi_currency')
         journal_currency = self.currency_id or self.company_id.currency_id
-        for statement in root[0].findall('ns:Stmt', ns):
+        for statement, entries in CAMT._iter_statements(io.BytesIO(attachment.raw)):
+            ns = {k or 'ns': v for k, v in statement.nsmap.items()}
             statement_vals = {}
-            statement_vals['name'] = (statement.xpath('ns:LglSeqNb/text()', namespaces=ns) or statement.xpath('ns:Id/text()', namespaces=ns))[0]
+            statement_vals['name'] = (CAMT._xpath(statement, 'ns:LglSeqNb/text()', ns) or CAMT._xpath(statement, 'ns:Id/text()', ns))[0]
             statement_date = CAMT._get_statement_date(statement, namespaces=ns)
 
             # Transaction Entries 0..n
@@ -58,20 +60,20 @@ class AccountJournal(models.Model):
 
             # Account Number    1..1
             # if not IBAN value then... <Othr><Id> would have.
-            account_no = sanitize_account_number(statement.xpath('ns:Acct/ns:Id/ns:IBAN/text() | ns:Acct/ns:Id/ns:Othr/ns:Id/text()',
-                namespaces=ns)[0])
+            account_no = sanitize_account_number(CAMT._xpath(statement, 'ns:Acct/ns:Id/ns:IBAN/text() | ns:Acct/ns:Id/ns:Othr/ns:Id/text()',
+                ns)[0])
 
             # Currency 0..1
-            currency = statement.xpath('ns:Acct/ns:Ccy/text() | ns:Bal/ns:Amt/@Ccy', namespaces=ns)[0]
+            currency = CAMT._xpath(statement, 'ns:Acct/ns:Ccy/text() | ns:Bal/ns:Amt/@Ccy | ns:Ntry/ns:Amt/@Ccy', ns)[0]
 
             if currency and journal_currency and currency != journal_currency.name:
                 continue
 
-            for entry in statement.findall('ns:Ntry', ns):
+            for entry in entries:
                 # Date 0..1
                 date = CAMT._get_transaction_date(entry, namespaces=ns) or statement_date
 
-                transaction_details = entry.xpath('.//ns:TxDtls', namespaces=ns)
+                transaction_details = CAMT._xpath(entry, './/ns:TxDtls', ns)
                 for entry_details in transaction_details or [entry]:
                     sequence += 1
                     counter_party = CAMT._get_counter_party(entry_details, entry, namespaces=ns)
@@ -103,7 +105,7 @@ class AccountJournal(models.Model):
                         has_multi_currency=has_multi_currency,
                         namespaces=ns)
 
-                    BkTxCd = entry.xpath('ns:BkTxCd', namespaces=ns)[0]
+                    BkTxCd = CAMT._xpath(entry, 'ns:BkTxCd', ns)[0]
                     entry_vals.update(CAMT._get_transaction_type(BkTxCd, namespaces=ns))
                     notes = []
                     entry_info = CAMT._get_additional_entry_info(entry, namespaces=ns)
@@ -84,6 +84,20 @@ class TestAccountBankStatementImportCamt(AccountTestInvoicingCommon):
         self.assertEqual(self.env.company.currency_id.id, usd_currency.id)
         self._test_minimal_camt_file_import('camt_053_minimal.xml', usd_currency)
 
+    def test_minimal_camt_054_file_import(self):
+        """
+        Notifications (camt.054) are imported like statements, their entries being streamed
+        """
+        usd_currency = self.env.ref('base.USD')
+        self._import_camt_file('camt_054_minimal.xml', usd_currency)
+        bank_st_record = self.env['account.bank.statement'].search(
+            [('name', '=', '2514988305.2019-02-13')]
+        ).ensure_one()
+        self.assertRecordValues(bank_st_record.line_ids.sorted('payment_ref'), [
+            {'payment_ref': 'label01', 'amount': 500.0},
+            {'payment_ref': 'label02', 'amount': -150.0},
+        ])
+
     def test_minimal_and_multicurrency_camt_file_import(self):
         """
         This test aims at importing a file with amounts expressed in EUR and USD.
@@ -1,6 +1,7 @@
 # -*- coding: utf-8 -*-
 # Part of Odoo. See LICENSE file for full copyright and licensing details.
 from odoo.addons.account.tests.common import AccountTestInvoicingCommon
+from odoo.exceptions import UserError
 from odoo.tests import tagged
 from odoo.tools import file_open
 
@@ -70,3 +71,32 @@ class TestAccountBankStatementImportOFX(AccountTestInvoicingCommon):
                 'account_number': partner_bank_norbert.acc_number,
             },
         ])
+
+    def test_ofx_file_import_twice(self):
+        bank_journal = self.env['account.journal'].create({
+            'name': 'Bank 123456',
+            'code': 'BNK67',
+            'type': 'bank',
+            'bank_acc_number': '123456',
+            'currency_id': self.env.ref('base.USD').id,
+        })
+
+        ofx_file_path = 'account_bank_statement_import_ofx/static/ofx/test_ofx.ofx'
+        with file_open(ofx_file_path, 'rb') as ofx_file:
+            ofx_content = ofx_file.read()
+        bank_journal.create_document_from_attachment(self.env['ir.attachment'].create({
+            'mimetype': 'application/xml',
+            'name': 'test_ofx.ofx',
+            'raw': ofx_content,
+        }).ids)
+        statement_lines = self.env['account.bank.statement.line'].search([('journal_id', '=', bank_journal.id)])
+        self.assertTrue(statement_lines)
+
+        # all the transactions are recognized as already imported
+        with self.assertRaises(UserError):
+            bank_journal.create_document_from_attachment(self.env['ir.attachment'].create({
+                'mimetype': 'application/xml',
+                'name': 'test_ofx.ofx',
+                'raw': ofx_content,
+            }).ids)
+        self.assertEqual(self.env['account.bank.statement.line'].search([('journal_id', '=', bank_journal.id)]), statement_lines)
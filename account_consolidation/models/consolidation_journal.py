@@ -112,6 +112,8 @@ class ConsolidationJournal(models.Model):
             # compute journal lines in sudo since it needs to browse several companies
             journal_line_values = origin.sudo()._get_journal_lines_values()
             record.write({'line_ids': [(0, 0, value) for value in journal_line_values]})
+            if record.company_period_id:
+                record.company_period_id.sudo()._link_journal_lines_to_move_lines(record.line_ids)
 
 
 class ConsolidationJournalLine(models.Model):
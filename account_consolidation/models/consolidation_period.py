@@ -6,6 +6,7 @@ import json
 from odoo import models, fields, api, _
 from odoo.exceptions import ValidationError
 from odoo.osv import expression
+from odoo.tools import SQL
 from odoo.tools.misc import formatLang
 
 
@@ -593,7 +594,7 @@ class ConsolidationCompanyPeriod(models.Model):
         """
         self.ensure_one()
         journal_lines_values = self._get_journal_lines_values()
-        self.env['consolidation.journal'].create({
+        journal = self.env['consolidation.journal'].create({
             'name': _("%s Consolidated Accounting", self.company_name),
             'auto_generated': True,
             'company_period_id': self.id,
@@ -601,45 +602,98 @@ class ConsolidationCompanyPeriod(models.Model):
             'line_ids': [(0, 0, value) for value in journal_lines_values],
             'chart_id': self.chart_id.id,
         })
+        self._link_journal_lines_to_move_lines(journal.line_ids)
 
     def _get_journal_lines_values(self):
         """
-        Get all the journal line values in order to create them.
+        Get all the journal line values in order to create them. The lines of the non historical accounts are linked
+        to their move lines by _link_journal_lines_to_move_lines once created.
         :return: a list of dict containing values for journal lines creation
         :rtype: list
         """
         self.ensure_one()
-        journal_lines_values = []
         historical_account_ids = self.period_id.chart_id.account_ids.filtered(lambda x: x.currency_mode == 'hist')
         non_hist_account_ids = self.period_id.chart_id.account_ids - historical_account_ids
-        for consolidation_account in historical_account_ids:
-            journal_lines_values += self._get_historical_journal_lines_values(consolidation_account)
+        journal_lines_values = self._get_historical_journal_lines_values(historical_account_ids)
 
+        total_balances = self._get_total_balances(non_hist_account_ids)
         for consolidation_account in non_hist_account_ids:
-            # Maybe there is a better way to group all move line ids and total balance by consolidation account
-            currency_amount, move_lines_ids = self._get_total_balance_and_audit_lines(consolidation_account)
+            currency_amount = total_balances.get(consolidation_account.id, 0.0)
             amount = self._apply_rates(currency_amount, consolidation_account)
             journal_lines_values.append({
                 "account_id": consolidation_account.id,
                 "currency_amount": currency_amount,
                 "amount": amount,
-                'move_line_ids': [(6, 0, move_lines_ids)]
             })
         return journal_lines_values
 
+    def _link_journal_lines_to_move_lines(self, journal_lines):
+        """
+        Link the given journal lines of the non historical accounts to the move lines they aggregate, directly in the
+        database.
+        :param journal_lines: the journal lines generated for this company period
+        """
+        self.ensure_one()
+        journal_lines = journal_lines.filtered(lambda line: line.account_id.currency_mode != 'hist')
+        if not journal_lines:
+            return
+        journal_lines.flush_recordset()
+        audit_field = journal_lines._fields['move_line_ids']
+        account_field = self.env['account.account']._fields['consolidation_account_ids']
+        move_lines_query = self.env['account.move.line']._search(self._get_company_move_lines_domain())
+        self.env.cr.execute(SQL(
+            """
+            INSERT INTO %(audit_table)s (%(audit_line_column)s, %(audit_move_line_column)s)
+                 SELECT journal_line.id, move_line.id
+                   FROM consolidation_journal_line journal_line
+                   JOIN %(account_table)s account_rel ON account_rel.%(consolidation_account_column)s = journal_line.account_id
+                   JOIN account_move_line move_line ON move_line.account_id = account_rel.%(account_column)s
+                  WHERE journal_line.id = ANY(%(journal_line_ids)s)
+                    AND move_line.id IN %(move_lines)s
+            ON CONFLICT DO NOTHING
+            """,
+            audit_table=SQL.identifier(audit_field.relation),
+            audit_line_column=SQL.identifier(audit_field.column1),
+            audit_move_line_column=SQL.identifier(audit_field.column2),
+            account_table=SQL.identifier(account_field.relation),
+            account_column=SQL.identifier(account_field.column1),
+            consolidation_account_column=SQL.identifier(account_field.column2),
+            journal_line_ids=journal_lines.ids,
+            move_lines=move_lines_query.subselect(),
+        ))
+        journal_lines.invalidate_recordset(['move_line_ids'])
+
     # PROTECTEDS
 
-    def _get_total_balance_and_audit_lines(self, consolidation_account):
+    def _get_total_balances(self, consolidation_accounts):
         """
-        Get the total balance of all the move lines "linked" to this company and a given consolidation account
-        :param consolidation_account: the consolidation account
-        :return: the total balance as a float and the
-        :rtype: tuple
+        Get the total balance of the move lines "linked" to this company for each of the given consolidation accounts,
+        in a single query.
+        :param consolidation_accounts: the consolidation accounts
+        :return: a dict mapping the consolidation account ids to their total balance
+        :rtype: dict
         """
         self.ensure_one()
-        domain = self._get_move_lines_domain(consolidation_account)
-        res = self.env['account.move.line']._read_group(domain, [], ['balance:sum', 'id:array_agg'])
-        return res[0]
+        if not consolidation_accounts:
+            return {}
+        account_field = self.env['account.account']._fields['consolidation_account_ids']
+        move_lines_query = self.env['account.move.line']._search(self._get_company_move_lines_domain())
+        self.env.cr.execute(SQL(
+            """
+              SELECT account_rel.%(consolidation_account_column)s, SUM(move_line.balance)
+                FROM account_move_line move_line
+                JOIN %(account_table)s account_rel ON account_rel.%(account_column)s = move_line.account_id
+               WHERE account_rel.%(consolidation_account_column)s = ANY(%(consolidation_account_ids)s)
+                 AND move_line.id IN %(move_lines)s
+            GROUP BY account_rel.%(consolidation_account_column)s
+            """,
+            account_table=SQL.identifier(account_field.relation),
+            account_column=SQL.identifier(account_field.column1),
+            consolidation_account_column=SQL.identifier(account_field.column2),
+            consolidation_account_ids=consolidation_accounts.ids,
+            move_lines=move_lines_query.subselect(),
+        ))
+        return dict(self.env.cr.fetchall())
 
     def _apply_rates(self, amount, consolidation_account):
         """
@@ -658,41 +712,85 @@ class ConsolidationCompanyPeriod(models.Model):
             amount = self._convert(amount, consolidation_account.currency_mode)
         return self._apply_consolidation_rate(amount)
 
-    def _apply_historical_rates(self, move_line):
+    def _get_historical_journal_lines_values(self, consolidation_accounts):
         """
-        Apply all the needed rates to a move line using its historical rate. Needed rates are :
-        - consolidation rate, which is only based on this company period,
-        - currency rate, which is computed based on move line date
-        :param move_line: the move line
-        :return: a float representing the appliance of all needed rate to move line balance
-        :rtype: float
+        Get all the journal line values for the given consolidation accounts when using historical currency mode. The
+        move lines are fetched in a single query, joined with the consolidation rate applicable at their date, the
+        currency rates being only computed once per date.
+        :param consolidation_accounts: the consolidation accounts
+        :return: a list of dict containing values for journal lines creation
+        :rtype: list
         """
         self.ensure_one()
-        rate = self.env['consolidation.rate'].get_rate_for(move_line.date, self.company_id.id,
-                                                                         self.chart_id.id)
-        if rate:
-            amount = move_line.balance * rate
-        else:
-            amount = move_line.balance
-            currency = move_line.company_currency_id
-            if currency != self.currency_chart_id:
-                amount = currency._convert(amount, self.currency_chart_id, self.company_id, move_line.date)
-        return self._apply_consolidation_rate(amount)
+        if not consolidation_accounts:
+            return []
+        account_field = self.env['account.account']._fields['consolidation_account_ids']
+        move_lines_query = self.env['account.move.line']._search(self._get_company_move_lines_domain())
+        self.env['consolidation.rate'].flush_model()
+        self.env.cr.execute(SQL(
+            """
+              SELECT account_rel.%(consolidation_account_column)s, move_line.id, move_line.balance, move_line.date,
+                     consolidation_rate.rate
+                FROM account_move_line move_line
+                JOIN %(account_table)s account_rel ON account_rel.%(account_column)s = move_line.account_id
+           LEFT JOIN LATERAL (
+                         SELECT rate
+                           FROM consolidation_rate
+                          WHERE company_id = %(company_id)s
+                            AND chart_id = %(chart_id)s
+                            AND date_start <= move_line.date
+                            AND date_end >= move_line.date
+                       ORDER BY date_end DESC
+                          LIMIT 1
+                     ) consolidation_rate ON TRUE
+               WHERE account_rel.%(consolidation_account_column)s = ANY(%(consolidation_account_ids)s)
+                 AND move_line.id IN %(move_lines)s
+            ORDER BY account_rel.%(consolidation_account_column)s, move_line.id
+            """,
+            account_table=SQL.identifier(account_field.relation),
+            account_column=SQL.identifier(account_field.column1),
+            consolidation_account_column=SQL.identifier(account_field.column2),
+            company_id=self.company_id.id,
+            chart_id=self.chart_id.id,
+            consolidation_account_ids=consolidation_accounts.ids,
+            move_lines=move_lines_query.subselect(),
+        ))
+        currency = self.currency_company_id
+        currency_rates = {}
+        journal_lines_values = []
+        for consolidation_account_id, move_line_id, balance, date, rate in self.env.cr.fetchall():
+            if rate:
+                amount = balance * rate
+            elif currency != self.currency_chart_id:
+                if date not in currency_rates:
+                    currency_rates[date] = currency._get_conversion_rate(currency, self.currency_chart_id, self.company_id, date)
+                amount = self.currency_chart_id.round(balance * currency_rates[date])
+            else:
+                amount = balance
+            journal_lines_values.append({
+                "account_id": consolidation_account_id,
+                "currency_amount": balance,
+                "amount": self._apply_consolidation_rate(amount),
+                'move_line_ids': [(6, 0, [move_line_id])],
+            })
+        return journal_lines_values
 
-    def _get_historical_journal_lines_values(self, consolidation_account):
+    def _get_company_move_lines_domain(self):
         """
-        Get all the journal line values for a given consolidation account when using historical currency mode.
-        :param consolidation_account: the consolidation account
-        :return: a list of dict containing values for journal lines creation
-        :rtype: list
+        Get the domain definition to get all the move lines "linked" to this company period, whatever their account.
+        See _get_move_lines_domain.
+        :return: a domain definition to be use in search ORM method.
         """
         self.ensure_one()
-        domain = self._get_move_lines_domain(consolidation_account)
-        move_lines = self.env['account.move.line'].search(domain)
-        return [{"account_id": consolidation_account.id,
-                 "currency_amount": move_line.balance,
-                 "amount": self._apply_historical_rates(move_line),
-                 'move_line_ids': [(6, 0, [move_line.id])]} for move_line in move_lines]
+        return [
+            ('parent_state', '=', 'posted'),
+            ('company_id', '=', self.company_id.id),
+            ('journal_id', 'not in', self.mapped('exclude_journal_ids.id')),
+            ('date', '<=', self.date_company_end),
+            '|',
+            ('date', '>=', self.date_company_begin),
+            ('account_id.include_initial_balance', '=', True)
+        ]
 
     def _get_move_lines_domain(self, consolidation_account):
         """
@@ -706,16 +804,10 @@ class ConsolidationCompanyPeriod(models.Model):
         :return: a domain definition to be use in search ORM method.
         """
         self.ensure_one()
-        return [
-            ('parent_state', '=', 'posted'),
-            ('company_id', '=', self.company_id.id),
-            ('journal_id', 'not in', self.mapped('exclude_journal_ids.id')),
-            ('account_id.consolidation_account_ids', '=', consolidation_account.id),
-            ('date', '<=', self.date_company_end),
-            '|',
-            ('date', '>=', self.date_company_begin),
-            ('account_id.include_initial_balance', '=', True)
-        ]
+        return expression.AND([
+            [('account_id.consolidation_account_ids', '=', consolidation_account.id)],
+            self._get_company_move_lines_domain(),
+        ])
 
     def _convert(self, amount, mode):
         """
@@ -465,12 +465,12 @@ class TestConsolidationCompanyPeriod(AccountConsolidationTestCase):
         self.assertEqual(expected_str, cp.display_name)
 
     @patch(
-        'odoo.addons.account_consolidation.models.consolidation_period.ConsolidationCompanyPeriod._get_total_balance_and_audit_lines',
-        return_value=(42.0, []))
+        'odoo.addons.account_consolidation.models.consolidation_period.ConsolidationCompanyPeriod._get_total_balances',
+        side_effect=lambda consolidation_accounts: dict.fromkeys(consolidation_accounts.ids, 42.0))
     @patch(
         'odoo.addons.account_consolidation.models.consolidation_period.ConsolidationCompanyPeriod._apply_rates',
         return_value=191289.0)
-    def test_generate_journal(self, patch_apply_rates, patched_get_total_balance):
+    def test_generate_journal(self, patch_apply_rates, patched_get_total_balances):
         Journal = self.env['consolidation.journal']
         JournalLine = self.env['consolidation.journal.line']
         self._create_consolidation_account('First', 'end')
@@ -489,18 +489,18 @@ class TestConsolidationCompanyPeriod(AccountConsolidationTestCase):
         self.assertNotEqual(journal_lines[0].account_id, journal_lines[1].account_id,
                             'Generated journals lines should be linked to different accounts')
         for journal_line in journal_lines:
-            self.assertAlmostEqual(journal_line.currency_amount, patched_get_total_balance.return_value[0],
+            self.assertAlmostEqual(journal_line.currency_amount, 42.0,
                                    msg='Generated journals should have the right currency amount')
             self.assertAlmostEqual(journal_line.amount, patch_apply_rates.return_value,
                                    msg='Generated journals should have the right amount')
 
     @patch(
-        'odoo.addons.account_consolidation.models.consolidation_period.ConsolidationCompanyPeriod._get_total_balance_and_audit_lines',
-        return_value=(420.0, []))
+        'odoo.addons.account_consolidation.models.consolidation_period.ConsolidationCompanyPeriod._get_total_balances',
+        side_effect=lambda consolidation_accounts: dict.fromkeys(consolidation_accounts.ids, 420.0))
     @patch(
         'odoo.addons.account_consolidation.models.consolidation_period.ConsolidationCompanyPeriod._apply_rates',
         return_value=191289.0)
-    def test_get_journal_lines_values(self, patch_apply_rates, patch_get_total_balance):
+    def test_get_journal_lines_values(self, patch_apply_rates, patch_get_total_balances):
         accounts = (
             self._create_consolidation_account('First', 'end'),
             self._create_consolidation_account('Second', 'avg')
@@ -511,19 +511,17 @@ class TestConsolidationCompanyPeriod(AccountConsolidationTestCase):
         expected = [{
             'account_id': accounts[0].id,
             'amount': patch_apply_rates.return_value,
-            'currency_amount': patch_get_total_balance.return_value[0],
-            'move_line_ids': [(6, 0, patch_get_total_balance.return_value[1])]
+            'currency_amount': 420.0,
         }, {
             'account_id': accounts[1].id,
             'amount': patch_apply_rates.return_value,
-            'currency_amount': patch_get_total_balance.return_value[0],
-            'move_line_ids': [(6, 0, patch_get_total_balance.return_value[1])]}
-        ]
+            'currency_amount': 420.0,
+        }]
         for cp in cps:
             result = cp._get_journal_lines_values()
             self.assertListEqual(expected, result)
 
-    def test__apply_historical_rates(self):
+    def test__get_historical_journal_lines_values(self):
         ap = self._create_analysis_period()
         consolidation_rate = 50
         cp = self._create_company_period(period=ap, rate_consolidation=consolidation_rate,
@@ -546,13 +544,16 @@ class TestConsolidationCompanyPeriod(AccountConsolidationTestCase):
         })
         move = self._create_basic_move(1000, company=self.us_company, move_date=move_date,
                                        account_credit=account_credit)
-        move_line = move.line_ids[0]
+        move_line = move.line_ids.filtered(lambda line: line.account_id == account_credit)
         # = (50/100) * (mlb/1.25)
         # = 0.5 * 0.8 * mlb
         expected_amount = 0.4 * move_line.balance
-        self.assertAlmostEqual(cp._apply_historical_rates(move_line), expected_amount)
+        [journal_line_values] = cp._get_historical_journal_lines_values(consolidation_account)
+        self.assertEqual(journal_line_values['move_line_ids'], [(6, 0, move_line.ids)])
+        self.assertAlmostEqual(journal_line_values['currency_amount'], move_line.balance)
+        self.assertAlmostEqual(journal_line_values['amount'], expected_amount)
 
-    def test__apply_historical_rates_with_fixed_rates(self):
+    def test__get_historical_journal_lines_values_with_fixed_rates(self):
         ap = self._create_analysis_period()
         consolidation_rate = 50
         cp = self._create_company_period(period=ap, rate_consolidation=consolidation_rate,
@@ -598,11 +599,13 @@ class TestConsolidationCompanyPeriod(AccountConsolidationTestCase):
         })
         move = self._create_basic_move(1000, company=self.us_company, move_date=move_date,
                                        account_credit=account_credit)
-        move_line = move.line_ids[0]
+        move_line = move.line_ids.filtered(lambda line: line.account_id == account_credit)
         # = (50/100) * (mlb*1.5) (1.5 = good rate above)
         # = 0.75 * mlb
         expected_amount = 0.75 * move_line.balance
-        self.assertAlmostEqual(cp._apply_historical_rates(move_line), expected_amount)
+        [journal_line_values] = cp._get_historical_journal_lines_values(consolidation_account)
+        self.assertEqual(journal_line_values['move_line_ids'], [(6, 0, move_line.ids)])
+        self.assertAlmostEqual(journal_line_values['amount'], expected_amount)
 
     @patch(
         'odoo.addons.account_consolidation.models.consolidation_period.ConsolidationCompanyPeriod._convert')
@@ -619,7 +622,7 @@ class TestConsolidationCompanyPeriod(AccountConsolidationTestCase):
         patched_apply_consolidation_rate.assert_called_once_with(patched_convert.return_value)
         pass
 
-    def test__get_total_balance_and_audit_lines(self):
+    def test__get_total_balances_and_audit_lines(self):
         journals = {
             'good': self.env['account.journal'].create({'name': 'Bank 123456', 'code': 'BNK67', 'type': 'bank',
                                                         'bank_acc_number': '123456', 'company_id': self.default_company.id}),
@@ -722,11 +725,17 @@ class TestConsolidationCompanyPeriod(AccountConsolidationTestCase):
             ]
         }).action_post()
 
-        total_balance, associated_move_line_ids = cp._get_total_balance_and_audit_lines(conso_account)
-        self.assertAlmostEqual(sum(not_ignored_amounts), total_balance)
-        self.assertEqual(2, len(associated_move_line_ids))
-        for move_line_id in associated_move_line_ids:
-            self.assertEqual(self.env['account.move.line'].browse(move_line_id).move_id, right_move)
+        self.assertEqual(cp._get_total_balances(conso_account), {conso_account.id: sum(not_ignored_amounts)})
+        journal = self.env['consolidation.journal'].create({
+            'name': 'Audit',
+            'company_period_id': cp.id,
+            'period_id': cp.period_id.id,
+            'chart_id': cp.chart_id.id,
+            'line_ids': [(0, 0, {'account_id': conso_account.id, 'amount': sum(not_ignored_amounts)})],
+        })
+        cp._link_journal_lines_to_move_lines(journal.line_ids)
+        self.assertEqual(journal.line_ids.move_line_ids,
+                         right_move.line_ids.filtered(lambda line: line.account_id in conso_account.account_ids))
 
     def test__get_move_lines(self):
         journal = self._create_journal()
@@ -2,9 +2,12 @@
 # Part of Odoo. See LICENSE file for full copyright and licensing details.
 import ast
 import logging
+import threading
+import time
+
 from odoo import api, fields, models, _
 from odoo.tools.misc import format_date
-from datetime import datetime, timedelta
+from datetime import date, datetime, timedelta
 from odoo.tools import DEFAULT_SERVER_DATE_FORMAT
 from odoo.exceptions import UserError
 
@@ -55,6 +58,13 @@ class ResPartner(models.Model):
         groups='account.group_account_readonly,account.group_account_invoice',
     )
     followup_reminder_type = fields.Selection([('automatic', 'Automatic'), ('manual', 'Manual')], string="Reminders", default='automatic')
+    followup_failure_date = fields.Date(
+        string='Last Failed Follow-up',
+        copy=False,
+        company_dependent=True,
+        help="Date of the last automatic follow-up of the partner that failed. The partner is not retried by the "
+             "automatic follow-ups before the next day, and comes after the other partners in need of action.",
+    )
     type = fields.Selection(
         selection_add=[('followup', 'Follow-up Address'), ('other',)],
         help="- Contact: Use this to organize the contact details of employees of a given company (e.g. CEO, CFO, ...).\n"
@@ -596,21 +606,78 @@ class ResPartner(models.Model):
         if partners_with_missing_info:
             return partners_with_missing_info._create_followup_missing_information_wizard()
 
-    def _cron_execute_followup_company(self):
-        followup_data = self._query_followup_data(all_partners=True)
-        in_need_of_action = self.env['res.partner'].browse([d['partner_id'] for d in followup_data.values() if d['followup_status'] == 'in_need_of_action'])
-        in_need_of_action_auto = in_need_of_action.filtered(lambda p: p.followup_line_id.auto_execute and p.followup_reminder_type == 'automatic')
-        for partner in in_need_of_action_auto:
+    def _execute_followup_partners(self, auto_commit=False):
+        """ Execute the automatic follow-ups of the partners in self.
+        Each partner is processed in its own savepoint, and committed when auto_commit is set, so that a failing
+        partner doesn't prevent the others from being processed. As processed partners are no longer in need of
+        action, an interrupted run resumes where it stopped. The date of the failure is kept on the failing partners.
+
+        Returns the number of partners whose follow-up was executed.
+        """
+        executed_count = 0
+        today = fields.Date.context_today(self)
+        for partner in self:
+            failed = True
             try:
-                partner._execute_followup_partner()
+                with self.env.cr.savepoint():
+                    if partner._execute_followup_partner():
+                        executed_count += 1
+                    failed = False
             except UserError as e:
                 # followup may raise exception due to configuration issues
                 # i.e. partner missing email
                 _logger.warning(e, exc_info=True)
+            except Exception:
+                _logger.exception("Could not execute the follow-up of partner %s", partner.id)
+            if failed:
+                partner.followup_failure_date = today
+            elif partner.followup_failure_date:
+                partner.followup_failure_date = False
+            if auto_commit:
+                self.env.cr.commit()
+        return executed_count
+
+    def _cron_execute_followup_company(self, batch_size=100, auto_commit=False):
+        """ Execute the automatic follow-ups of at most batch_size partners of the current company.
+
+        Returns the number of partners whose follow-up was executed, and whether partners remain to be processed by
+        a next run of the cron. The partners whose follow-up failed today are left to the next day, so that they
+        neither take the batch of the others nor retrigger the cron endlessly; the older failures come last.
+        """
+        today = fields.Date.context_today(self)
+        followup_data = self._query_followup_data(all_partners=True)
+        in_need_of_action = self.env['res.partner'].browse([d['partner_id'] for d in followup_data.values() if d['followup_status'] == 'in_need_of_action'])
+        in_need_of_action_auto = in_need_of_action.filtered(lambda p: (
+            p.followup_line_id.auto_execute
+            and p.followup_reminder_type == 'automatic'
+            and p.followup_failure_date != today
+        )).sorted(lambda p: p.followup_failure_date or date.min)
+        executed_count = in_need_of_action_auto[:batch_size]._execute_followup_partners(auto_commit=auto_commit)
+        return executed_count, len(in_need_of_action_auto) > batch_size
 
     def _cron_execute_followup(self):
+        auto_commit = not getattr(threading.current_thread(), 'testing', False)
+        start_time = time.time()
+        executed_count = 0
+        remaining = False
         for company in self.env["res.company"].search([]):
             # Since the cache is done by database and not by company, we need to invalidate in this special case
             # where the context is changing in the same transaction
             self.env.cr.execute("DROP TABLE IF EXISTS followup_data_cache")
-            self.with_context(allowed_company_ids=company.ids)._cron_execute_followup_company()
+            # the emails are queued and sent by the mail queue, not while rendering the follow-ups
+            company_executed_count, company_remaining = self.with_context(
+                allowed_company_ids=company.ids,
+                mail_notify_force_send=False,
+            )._cron_execute_followup_company(auto_commit=auto_commit)
+            executed_count += company_executed_count
+            remaining = remaining or company_remaining
+        if remaining:
+            # the processed partners are no longer in need of action and the failed ones wait for the next day, the
+            # next run picks the following ones
+            self.env.ref('account_followup.ir_cron_auto_post_draft_entry')._trigger()
+        if executed_count:
+            self.env.ref('mail.ir_cron_mail_scheduler_action')._trigger()
+            elapsed_time = time.time() - start_time
+            _logger.info(
+                "Executed %s follow-ups in %.2fs (%.2f follow-ups/s)",
+                executed_count, elapsed_time, executed_count / (elapsed_time or 1))
@@ -25,11 +25,11 @@ class TestAccountFollowupReports(AccountTestInvoicingCommon):
             'company_id': self.company_data['company'].id
         })
 
-    def create_invoice(self, date):
+    def create_invoice(self, date, partner=None):
         invoice = self.env['account.move'].create({
             'move_type': 'out_invoice',
             'invoice_date': date,
-            'partner_id': self.partner_a.id,
+            'partner_id': (partner or self.partner_a).id,
             'invoice_line_ids': [Command.create({
                 'quantity': 1,
                 'price_unit': 500,
@@ -307,6 +307,74 @@ class TestAccountFollowupReports(AccountTestInvoicingCommon):
             patched.assert_called_once()
             self.assertPartnerFollowup(self.partner_a, 'with_overdue_invoices', followup_10)
 
+    def test_followup_cron_partner_failure(self):
+        cron = self.env.ref('account_followup.ir_cron_auto_post_draft_entry')
+        followup_10 = self.create_followup(delay=10)
+        followup_10.auto_execute = True
+
+        self.create_invoice('2022-01-01')
+        self.create_invoice('2022-01-01', partner=self.partner_b)
+
+        def send_followup(partner, options):
+            if partner == self.partner_a:
+                raise ValueError("Cannot send the follow-up")
+
+        # A failing partner is rolled back without preventing the others from being processed
+        with freeze_time('2022-01-11'), patch.object(type(self.env['res.partner']), '_send_followup', autospec=True, side_effect=send_followup) as patched:
+            with self.assertLogs('odoo.addons.account_followup.models.res_partner', level='ERROR'):
+                cron.method_direct_trigger()
+            self.assertEqual(patched.call_count, 2)
+            self.assertPartnerFollowup(self.partner_a, 'in_need_of_action', followup_10)
+            self.assertPartnerFollowup(self.partner_b, 'with_overdue_invoices', followup_10)
+
+    def test_followup_cron_batch(self):
+        followup_10 = self.create_followup(delay=10)
+        followup_10.auto_execute = True
+
+        self.create_invoice('2022-01-01')
+        self.create_invoice('2022-01-01', partner=self.partner_b)
+
+        # Each run processes a batch of partners, the next run picks the partners still in need of action
+        Partner = self.env['res.partner'].with_context(allowed_company_ids=self.env.company.ids)
+        with freeze_time('2022-01-11'), patch.object(type(self.env['res.partner']), '_send_followup') as patched:
+            self.assertEqual(Partner._cron_execute_followup_company(batch_size=1), (1, True))
+            self.env.cr.execute("DROP TABLE IF EXISTS followup_data_cache")
+            self.assertEqual(Partner._cron_execute_followup_company(batch_size=1), (1, False))
+            self.assertEqual(patched.call_count, 2)
+            self.assertPartnerFollowup(self.partner_a, 'with_overdue_invoices', followup_10)
+            self.assertPartnerFollowup(self.partner_b, 'with_overdue_invoices', followup_10)
+
+    def test_followup_cron_batch_partner_failure(self):
+        followup_10 = self.create_followup(delay=10)
+        followup_10.auto_execute = True
+
+        self.create_invoice('2022-01-01')
+        self.create_invoice('2022-01-01', partner=self.partner_b)
+
+        def send_followup(partner, options):
+            if partner == self.partner_a:
+                raise ValueError("Cannot send the follow-up")
+
+        # A failing partner doesn't take the batch of the others, and is only retried the next day
+        Partner = self.env['res.partner'].with_context(allowed_company_ids=self.env.company.ids)
+        with freeze_time('2022-01-11'), patch.object(type(self.env['res.partner']), '_send_followup', autospec=True, side_effect=send_followup) as patched:
+            with self.assertLogs('odoo.addons.account_followup.models.res_partner', level='ERROR'):
+                self.assertTrue(Partner._cron_execute_followup_company(batch_size=1)[1])
+                self.env.cr.execute("DROP TABLE IF EXISTS followup_data_cache")
+                self.assertFalse(Partner._cron_execute_followup_company(batch_size=1)[1])
+            self.env.cr.execute("DROP TABLE IF EXISTS followup_data_cache")
+            self.assertEqual(Partner._cron_execute_followup_company(batch_size=1), (0, False))
+            self.assertEqual(patched.call_count, 2)
+            self.assertEqual(self.partner_a.followup_failure_date, fields.Date.from_string('2022-01-11'))
+            self.assertPartnerFollowup(self.partner_a, 'in_need_of_action', followup_10)
+            self.assertPartnerFollowup(self.partner_b, 'with_overdue_invoices', followup_10)
+
+        with freeze_time('2022-01-12'), patch.object(type(self.env['res.partner']), '_send_followup') as patched:
+            self.env.cr.execute("DROP TABLE IF EXISTS followup_data_cache")
+            self.assertEqual(Partner._cron_execute_followup_company(batch_size=1), (1, False))
+            self.assertFalse(self.partner_a.followup_failure_date)
+            self.assertPartnerFollowup(self.partner_a, 'with_overdue_invoices', followup_10)
+
     def test_onchange_residual_amount(self):
         '''
         Test residual onchange on account move lines: the residual amount is
@@ -14,3 +14,6 @@ from . import calendar_event
 from . import onboarding_onboarding
 from . import onboarding_onboarding_step
 from . import res_partner
+from . import resource_calendar_attendance
+from . import resource_calendar_leaves
+from . import resource_resource
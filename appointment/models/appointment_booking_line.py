@@ -50,3 +50,20 @@ class AppointmentBookingLine(models.Model):
                 line.capacity_used = line.appointment_resource_id.capacity
             else:
                 line.capacity_used = line.capacity_reserved
+
+    @api.model_create_multi
+    def create(self, vals_list):
+        lines = super().create(vals_list)
+        self.env['appointment.type']._clear_appointment_slots_cache_for_appointment_resources(lines.appointment_resource_id)
+        return lines
+
+    def write(self, vals):
+        resources = self.appointment_resource_id
+        res = super().write(vals)
+        self.env['appointment.type']._clear_appointment_slots_cache_for_appointment_resources(
+            resources | self.appointment_resource_id)
+        return res
+
+    def unlink(self):
+        self.env['appointment.type']._clear_appointment_slots_cache_for_appointment_resources(self.appointment_resource_id)
+        return super().unlink()
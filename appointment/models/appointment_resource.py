@@ -81,6 +81,23 @@ class AppointmentResource(models.Model):
             display_name = resource_name_capacity if resource.capacity > 1 else resource.name
             resource.display_name = display_name
 
+    @api.model_create_multi
+    def create(self, vals_list):
+        resources = super().create(vals_list)
+        self.env['appointment.type']._clear_appointment_slots_cache_for_appointment_resources(resources)
+        return resources
+
+    def write(self, vals):
+        # the resources may no longer be used by some appointment types afterwards
+        self.env['appointment.type']._clear_appointment_slots_cache_for_appointment_resources(self)
+        res = super().write(vals)
+        self.env['appointment.type']._clear_appointment_slots_cache_for_appointment_resources(self)
+        return res
+
+    def unlink(self):
+        self.env['appointment.type']._clear_appointment_slots_cache_for_appointment_resources(self)
+        return super().unlink()
+
     def copy(self, default=None):
         default = dict(default or {})
         if not default.get('name'):
@@ -93,6 +93,24 @@ class AppointmentSlot(models.Model):
         if any(self.filtered(lambda slot: slot.slot_type == "unique" and not (slot.start_datetime and slot.end_datetime))):
             raise ValidationError(_("An unique type slot should have a start and end datetime"))
 
+    @api.model_create_multi
+    def create(self, vals_list):
+        slots = super().create(vals_list)
+        slots.appointment_type_id._clear_appointment_slots_cache()
+        return slots
+
+    def write(self, vals):
+        appointment_types = self.appointment_type_id
+        res = super().write(vals)
+        (appointment_types | self.appointment_type_id)._clear_appointment_slots_cache()
+        return res
+
+    def unlink(self):
+        appointment_types = self.appointment_type_id
+        res = super().unlink()
+        appointment_types._clear_appointment_slots_cache()
+        return res
+
     def _convert_end_hour_24_format(self):
         """Convert end_hour from [0, 24[ to ]0, 24] by replacing 0 by 24 if necessary.
 
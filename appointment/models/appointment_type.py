@@ -3,6 +3,7 @@
 
 import ast
 import calendar as cal
+import copy
 import random
 import pytz
 from datetime import datetime, timedelta, time
@@ -13,10 +14,10 @@ from werkzeug.urls import url_encode, url_join
 
 from odoo import api, fields, models, _, Command
 from odoo.exceptions import ValidationError
-from odoo.tools import float_compare
+from odoo.tools import float_compare, ormcache
 from odoo.tools.misc import babel_locale_parse, get_lang
 from odoo.addons.base.models.res_partner import _tz_get
-from ..utils import intervals_overlap
+from ..utils import BusyIntervals, intervals_overlap
 
 
 class AppointmentType(models.Model):
@@ -159,6 +160,8 @@ class AppointmentType(models.Model):
 
     # Technical field for backward compatibility with previous default published appointment type
     is_published = fields.Boolean('Is Published')
+    # Technical field versioning the cached month grids, see _clear_appointment_slots_cache
+    slots_cache_version = fields.Integer('Slots Cache Version', readonly=True, copy=False)
     # override mail.thread for better string/help
     message_partner_ids = fields.Many2many(string='CC to',
                                            help="Contacts that need to be notified whenever a new appointment is booked or canceled, \
@@ -324,6 +327,11 @@ class AppointmentType(models.Model):
         """ We don't want the current user to be follower of all created types """
         return super(AppointmentType, self.with_context(mail_create_nosubscribe=True)).create(vals_list)
 
+    def write(self, vals):
+        res = super().write(vals)
+        self._clear_appointment_slots_cache()
+        return res
+
     @api.returns('self', lambda value: value.id)
     def copy(self, default=None):
         default = default or {}
@@ -719,6 +727,7 @@ class AppointmentType(models.Model):
         if not self.active:
             return []
         now = datetime.utcnow()
+        cache_reference_date = reference_date
         if not reference_date:
             reference_date = now
 
@@ -743,6 +752,99 @@ class AppointmentType(models.Model):
             first_day = requested_tz.fromutc(reference_date + relativedelta(hours=self.min_schedule_hours))
             last_day = requested_tz.fromutc(reference_date + relativedelta(days=appointment_duration_days))
 
+        # the month grid only changes with the configuration and the bookings,
+        # share it between the visitors until one of them changes
+        months = copy.deepcopy(self._get_cached_appointment_slots_months(
+            timezone, first_day, last_day, reference_date,
+            tuple(filter_users.ids) if filter_users else None,
+            tuple(filter_resources.ids) if filter_resources else None,
+            asked_capacity, cache_reference_date, now.replace(second=0, microsecond=0),
+            self.sudo().slots_cache_version,
+        ))
+        if self.schedule_based_on == 'users':
+            self._slots_assign_staff_users(months)
+        return months
+
+    @ormcache(
+        'self.id', 'timezone', 'self.env.lang', 'self.env.uid', 'self.env.su', 'tuple(self.env.companies.ids)',
+        'filter_user_ids', 'filter_resource_ids', 'asked_capacity', 'cache_reference_date', 'now_minute',
+        'slots_cache_version',
+    )
+    def _get_cached_appointment_slots_months(self, timezone, first_day, last_day, reference_date,
+                                             filter_user_ids, filter_resource_ids, asked_capacity,
+                                             cache_reference_date, now_minute, slots_cache_version):
+        """ ``_get_appointment_slots_months`` cached for a minute. The cached
+        grids are dropped when the configuration, the staff, their meetings or the
+        bookings change, see ``_clear_appointment_slots_cache``. The staff user of
+        each slot is picked afterwards, see ``_slots_assign_staff_users``. """
+        return self._get_appointment_slots_months(
+            timezone, first_day, last_day, reference_date,
+            filter_users=self.env['res.users'].browse(filter_user_ids) if filter_user_ids else None,
+            filter_resources=self.env['appointment.resource'].browse(filter_resource_ids) if filter_resource_ids else None,
+            asked_capacity=asked_capacity,
+        )
+
+    def _clear_appointment_slots_cache(self):
+        """ Drop the cached month grids of available slots of the appointment
+        types, by increasing the version they are cached with. The grids of the
+        other appointment types are kept. The leaves and attendances of whole
+        calendars clear the registry cache instead, see resource.cached.intervals.mixin. """
+        if not self.ids:
+            return
+        self.env.cr.execute(
+            "UPDATE appointment_type SET slots_cache_version = COALESCE(slots_cache_version, 0) + 1 WHERE id IN %s",
+            [tuple(self.ids)])
+        self.invalidate_recordset(['slots_cache_version'])
+
+    @api.model
+    def _clear_appointment_slots_cache_for_partners(self, partners):
+        """ Drop the cached month grids of the appointment types whose staff
+        contains one of the partners. """
+        if partners:
+            self.sudo().with_context(active_test=False).search(
+                [('staff_user_ids.partner_id', 'in', partners.ids)])._clear_appointment_slots_cache()
+
+    @api.model
+    def _clear_appointment_slots_cache_for_appointment_resources(self, appointment_resources):
+        """ Drop the cached month grids of the appointment types using the
+        appointment resources, or resources that can be combined with them. """
+        if appointment_resources:
+            appointment_resources = appointment_resources.sudo().with_context(active_test=False)
+            (appointment_resources | appointment_resources.linked_resource_ids).appointment_type_ids._clear_appointment_slots_cache()
+
+    @api.model
+    def _clear_appointment_slots_cache_for_resources(self, resources):
+        """ Drop the cached month grids of the appointment types whose staff
+        users or appointment resources are the resources. """
+        if resources:
+            self.sudo().with_context(active_test=False).search([
+                '|', ('resource_ids.resource_id', 'in', resources.ids),
+                     ('staff_user_ids', 'in', resources.user_id.ids),
+            ])._clear_appointment_slots_cache()
+
+    def _slots_assign_staff_users(self, months):
+        """ Assign to each slot of the month grids a staff user picked at random
+        among the available ones, to avoid having the same one assigned every time
+        the cached grids are used. """
+        for month in months:
+            for week in month['weeks']:
+                for day in week:
+                    for slot in day['slots']:
+                        staff_user_ids = slot.pop('available_staff_user_ids', None)
+                        if not staff_user_ids:
+                            continue
+                        slot['staff_user_id'] = random.choice(staff_user_ids)
+                        slot['url_parameters'] = url_encode({
+                            'date_time': slot['datetime'],
+                            'duration': slot['slot_duration'],
+                            'staff_user_id': str(slot['staff_user_id']),
+                        })
+
+    def _get_appointment_slots_months(self, timezone, first_day, last_day, reference_date, filter_users=None, filter_resources=None, asked_capacity=1):
+        """ Compute the month grid of ``_get_appointment_slots`` between two
+        days given in the requested timezone. """
+        requested_tz = pytz.timezone(timezone)
+
         # Compute available slots (ordered)
         slots = self._slots_generate(
             first_day.astimezone(pytz.utc),
@@ -842,6 +944,8 @@ class AppointmentType(models.Model):
                                 }
                                 if self.schedule_based_on == 'users':
                                     url_parameters.update(staff_user_id=str(slots[0]['staff_user_id'].id))
+                                    # the staff user is picked again each time the grid is used
+                                    slot['available_staff_user_ids'] = slots[0]['available_staff_user_ids'].ids
                                 else:
                                     url_parameters.update(available_resource_ids=str(slots[0]['available_resource_ids'].ids))
                                 slot['url_parameters'] = url_encode(url_parameters)
@@ -981,17 +1085,15 @@ class AppointmentType(models.Model):
           for fixed appointment types or can contain several users e.g. with random assignment and
           filters) If not set, use all users assigned to this appointment type.
 
-        :return: None but instead update ``slots`` adding ``staff_user_id`` key
-          containing found available user ID;
+        :return: None but instead update ``slots`` adding ``available_staff_user_ids``
+          key containing the available users and ``staff_user_id`` key containing
+          one of them, picked at random;
         """
-        # shuffle the available users into a random order to avoid having the same
-        # one assigned every time, force timezone
-        available_users = [
+        # force timezone
+        available_users_tz = self.env['res.users'].concat(*[
             user.with_context(tz=user.tz)
             for user in (filter_users or self.staff_user_ids)
-        ]
-        random.shuffle(available_users)
-        available_users_tz = self.env['res.users'].concat(*available_users)
+        ])
 
         # fetch value used for availability in batch
         availability_values = self._slot_availability_prepare_users_values(
@@ -999,15 +1101,16 @@ class AppointmentType(models.Model):
         )
 
         for slot in slots:
-            available_staff_user = next(
-                (staff_user for staff_user in available_users_tz if self._slot_availability_is_user_available(
+            available_staff_users = available_users_tz.filtered(
+                lambda staff_user: self._slot_availability_is_user_available(
                     slot,
                     staff_user,
                     availability_values
-                )),
-                False)
-            if available_staff_user:
-                slot['staff_user_id'] = available_staff_user
+                ))
+            if available_staff_users:
+                slot['available_staff_user_ids'] = available_staff_users
+                # pick one of them at random to avoid having the same one assigned every time
+                slot['staff_user_id'] = random.choice(available_staff_users)
 
     def _slot_availability_is_user_available(self, slot, staff_user, availability_values):
         """ This method verifies if the user is available on the given slot.
@@ -1031,21 +1134,16 @@ class AppointmentType(models.Model):
         if slot['slot'].restrict_to_user_ids and staff_user not in slot['slot'].restrict_to_user_ids:
             return False
 
-        partner_to_events = availability_values.get('partner_to_events') or {}
-        if partner_to_events.get(staff_user.partner_id):
-            for day_dt in rrule.rrule(freq=rrule.DAILY,
-                                      dtstart=slot_start_dt_utc,
-                                      until=slot_end_dt_utc,
-                                      interval=1):
-                day_events = partner_to_events[staff_user.partner_id].get(day_dt.date()) or []
-                if any(not event.allday and (event.start < slot_end_dt_utc and event.stop > slot_start_dt_utc) for event in day_events):
-                    return False
+        partner_busy_intervals = (availability_values.get('partner_to_busy_intervals') or {}).get(staff_user.partner_id)
+        if partner_busy_intervals and partner_busy_intervals.overlaps(slot_start_dt_utc, slot_end_dt_utc):
+            return False
+        partner_allday_dates = (availability_values.get('partner_to_allday_dates') or {}).get(staff_user.partner_id)
+        if partner_allday_dates:
             for day_dt in rrule.rrule(freq=rrule.DAILY,
                                       dtstart=slot_start_dt_user_timezone,
                                       until=slot_end_dt_user_timezone,
                                       interval=1):
-                day_events = partner_to_events[staff_user.partner_id].get(day_dt.date()) or []
-                if any(event.allday for event in day_events):
+                if day_dt.date() in partner_allday_dates:
                     return False
         return True
 
@@ -1065,8 +1163,9 @@ class AppointmentType(models.Model):
 
         :return: dict containing main values for computation, formatted like
           {
-            'partner_to_events': meetings (not declined), based on user_partner_id
+            'partner_to_busy_intervals': busy time of meetings (not declined), based on user_partner_id
               (see ``_slot_availability_prepare_users_values_meetings()``);
+            'partner_to_allday_dates': days of allday meetings (not declined), based on user_partner_id;
           }
         """
         return self._slot_availability_prepare_users_values_meetings(staff_users, start_dt, end_dt)
@@ -1083,15 +1182,12 @@ class AppointmentType(models.Model):
 
         :return: dict containing main values for computation, formatted like
           {
-            'partner_to_events': meetings (not declined), formatted as a dict
-              {
-                'user_partner_id': dict of day-based meetings: {
-                  'date in UTC': calendar events;
-                  'date in UTC': calendar events;
-                  ...
-              },
-              { ... }
-            }
+            'partner_to_busy_intervals': merged time ranges of the meetings (not
+              declined and not allday) as a dict {'user_partner_id': BusyIntervals},
+              checked by bisection;
+            'partner_to_allday_dates': days covered by allday meetings (not declined)
+              as a dict {'user_partner_id': set of dates};
+          }
         """
         related_partners = staff_users.partner_id
 
@@ -1110,24 +1206,27 @@ class AppointmentType(models.Model):
                 ],
                 order='start asc',
             )
-        partner_to_events = {}
+        partner_to_busy_intervals = {}
+        partner_to_allday_dates = {}
         for event in all_events:
             for attendee in event.attendee_ids.filtered_domain([
                 ('state', '!=', 'declined'),
                 ('partner_id', 'in', related_partners.ids)
             ]):
-                for day_dt in rrule.rrule(freq=rrule.DAILY,
-                                          dtstart=event.start,
-                                          until=event.stop,
-                                          interval=1):
-                    partner_events = partner_to_events.setdefault(attendee.partner_id, {})
-                    date_date = day_dt.date()  # map per day, not per hour
-                    if partner_events.get(date_date):
-                        partner_events[date_date] += event
-                    else:
-                        partner_events[date_date] = event
+                if not event.allday:
+                    partner_to_busy_intervals.setdefault(attendee.partner_id, BusyIntervals()).add(event.start, event.stop)
+                    continue
+                partner_to_allday_dates.setdefault(attendee.partner_id, set()).update(
+                    day_dt.date() for day_dt in rrule.rrule(freq=rrule.DAILY,
+                                                            dtstart=event.start,
+                                                            until=event.stop,
+                                                            interval=1)
+                )
 
-        return {'partner_to_events': partner_to_events}
+        return {
+            'partner_to_busy_intervals': partner_to_busy_intervals,
+            'partner_to_allday_dates': partner_to_allday_dates,
+        }
 
     # --------------------------------------
     # Resources - Slots Availability
@@ -1,12 +1,30 @@
 # -*- coding: utf-8 -*-
 # Part of Odoo. See LICENSE file for full copyright and licensing details.
 
-from odoo import models, tools
+from odoo import api, models, tools
 
 
 class Attendee(models.Model):
     _inherit = 'calendar.attendee'
 
+    @api.model_create_multi
+    def create(self, vals_list):
+        attendees = super().create(vals_list)
+        self.env['appointment.type']._clear_appointment_slots_cache_for_partners(attendees.partner_id)
+        return attendees
+
+    def write(self, vals):
+        partners = self.partner_id
+        res = super().write(vals)
+        if {'event_id', 'partner_id', 'state'} & vals.keys():
+            # declined meetings do not take the time of the staff
+            self.env['appointment.type']._clear_appointment_slots_cache_for_partners(partners | self.partner_id)
+        return res
+
+    def unlink(self):
+        self.env['appointment.type']._clear_appointment_slots_cache_for_partners(self.partner_id)
+        return super().unlink()
+
     def _compute_mail_tz(self):
         toupdate = self.filtered(lambda r: r.event_id.appointment_type_id.appointment_tz)
         for attendee in toupdate:
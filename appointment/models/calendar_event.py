@@ -8,6 +8,9 @@ from odoo import _, api, Command, fields, models, SUPERUSER_ID
 from odoo.tools import html2plaintext, email_normalize, email_split_tuples
 from ..utils import interval_from_events, intervals_overlap
 
+# fields of the meetings changing the available slots of the appointment types
+APPOINTMENT_SLOTS_EVENT_FIELDS = {'active', 'allday', 'attendee_ids', 'partner_ids', 'show_as', 'start', 'start_date', 'stop', 'stop_date'}
+
 _logger = logging.getLogger(__name__)
 
 class CalendarEvent(models.Model):
@@ -160,6 +163,33 @@ class CalendarEvent(models.Model):
         if column_name != 'access_token':
             super(CalendarEvent, self)._init_column(column_name)
 
+    @api.model_create_multi
+    def create(self, vals_list):
+        events = super().create(vals_list)
+        events._clear_appointment_slots_cache()
+        return events
+
+    def write(self, vals):
+        if APPOINTMENT_SLOTS_EVENT_FIELDS & vals.keys():
+            # clear before the write as well, the meeting may no longer concern the staff afterwards
+            self._clear_appointment_slots_cache()
+        res = super().write(vals)
+        if APPOINTMENT_SLOTS_EVENT_FIELDS & vals.keys():
+            self._clear_appointment_slots_cache()
+        return res
+
+    def unlink(self):
+        self._clear_appointment_slots_cache()
+        return super().unlink()
+
+    def _clear_appointment_slots_cache(self):
+        """ The available slots of the appointment types are cached, see
+        appointment.type._get_cached_appointment_slots_months. They depend on the
+        meetings of the staff and on the bookings of the resources. """
+        self.env['appointment.type']._clear_appointment_slots_cache_for_appointment_resources(
+            self.booking_line_ids.appointment_resource_id)
+        self.env['appointment.type']._clear_appointment_slots_cache_for_partners(self.partner_ids)
+
     def _inverse_appointment_resource_id_or_capacity(self):
         """Update booking lines as inverse of both resource capacity and resource id.
 
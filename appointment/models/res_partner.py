@@ -9,6 +9,13 @@ from odoo import models
 class Partner(models.Model):
     _inherit = "res.partner"
 
+    def write(self, vals):
+        res = super().write(vals)
+        if 'tz' in vals:
+            # the slots of the staff are computed in their timezone
+            self.env['appointment.type']._clear_appointment_slots_cache_for_partners(self)
+        return res
+
     def calendar_verify_availability(self, date_start, date_end):
         """ Verify availability of the partner(s) between 2 datetimes on their calendar.
         We only verify events that are not linked to an appointment type with resources since
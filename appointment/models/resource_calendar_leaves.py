@@ -0,0 +1,16 @@
+# -*- coding: utf-8 -*-
+# Part of Odoo. See LICENSE file for full copyright and licensing details.
+
+from odoo import models
+
+
+class ResourceCalendarLeaves(models.Model):
+    _inherit = 'resource.calendar.leaves'
+
+    def _invalidate_cached_intervals(self):
+        """ The available slots of the appointment types are cached, see
+        appointment.type._get_cached_appointment_slots_months. Besides the leaves
+        of the whole calendars, they depend on the time off of the staff and of
+        the appointment resources. """
+        super()._invalidate_cached_intervals()
+        self.env['appointment.type']._clear_appointment_slots_cache_for_resources(self.resource_id)
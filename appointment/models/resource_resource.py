@@ -0,0 +1,15 @@
+# -*- coding: utf-8 -*-
+# Part of Odoo. See LICENSE file for full copyright and licensing details.
+
+from odoo import models
+
+
+class ResourceResource(models.Model):
+    _inherit = 'resource.resource'
+
+    def _invalidate_cached_intervals(self):
+        """ The available slots of the appointment types are cached, see
+        appointment.type._get_cached_appointment_slots_months. They depend on the
+        calendar and the timezone of the staff and of the appointment resources. """
+        super()._invalidate_cached_intervals()
+        self.env['appointment.type']._clear_appointment_slots_cache_for_resources(self)
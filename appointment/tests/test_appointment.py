@@ -5,6 +5,7 @@ import pytz
 
 from datetime import date, datetime, timedelta
 from freezegun import freeze_time
+from unittest.mock import patch
 from werkzeug.urls import url_encode, url_join
 
 import odoo
@@ -904,6 +905,91 @@ class AppointmentTest(AppointmentCommon, HttpCaseWithUserDemo):
         self.assertTrue(len(self._filter_appointment_slots(slots_user_bxls_exterior_user)) == 2)
         self.assertTrue(len(self._filter_appointment_slots(slots_user_no_tz)) == 1)
 
+    @users('apt_manager')
+    def test_slots_cache_follows_meetings(self):
+        """ The month grid is shared between calls until the meetings or the
+        timezone of the staff change. """
+        apt_type = self.apt_type_bxls_2days.with_user(self.env.user)
+        tuesday = (self.reference_monday + timedelta(days=1)).strftime('%Y-%m-%d')
+
+        def get_tuesday_slots():
+            with freeze_time(self.reference_now):
+                slots = apt_type._get_appointment_slots('Europe/Brussels')
+            return [slot for slot in self._filter_appointment_slots(slots) if slot['datetime'].startswith(tuesday)]
+
+        self.assertEqual(len(get_tuesday_slots()), 6)
+        with self.mockAppointmentCalls():
+            self.assertEqual(len(get_tuesday_slots()), 6)
+        self.assertFalse(self._mock_calevent_search.called, 'Unchanged meetings should not be searched again')
+
+        meeting = self._create_meetings(
+            self.staff_user_bxls,
+            [(self.reference_monday + timedelta(days=1),  # 3 hours first Tuesday
+              self.reference_monday + timedelta(days=1, hours=3),
+              False
+             )]
+        )
+        self.assertEqual(len(get_tuesday_slots()), 3)
+
+        meeting.attendee_ids.filtered(lambda att: att.partner_id == self.staff_user_bxls.partner_id).do_decline()
+        self.assertEqual(len(get_tuesday_slots()), 6)
+
+        # the availability of the staff is computed in their timezone
+        self.staff_user_bxls.sudo().tz = 'Europe/London'
+        with self.mockAppointmentCalls():
+            get_tuesday_slots()
+        self.assertTrue(self._mock_calevent_search.called, 'A timezone change of the staff should compute the slots again')
+
+    @users('apt_manager')
+    def test_slots_cache_picks_staff_user(self):
+        """ The month grid only caches the availability of the staff, the staff
+        user of each slot is picked at random for every call. """
+        apt_type = self.apt_type_bxls_2days.with_user(self.env.user)
+        apt_type.sudo().staff_user_ids = self.staff_user_bxls | self.staff_user_aust
+
+        def get_slots(pick):
+            with freeze_time(self.reference_now), \
+                 patch('odoo.addons.appointment.models.appointment_type.random.choice', side_effect=pick):
+                return self._filter_appointment_slots(apt_type._get_appointment_slots('Europe/Brussels'))
+
+        first_slots = get_slots(lambda staff_users: staff_users[0])
+        self.assertTrue(first_slots)
+        with self.mockAppointmentCalls():
+            last_slots = get_slots(lambda staff_users: staff_users[-1])
+        self.assertFalse(self._mock_calevent_search.called, 'The cached grid should be used')
+        self.assertEqual(len(last_slots), len(first_slots))
+        self.assertNotEqual(
+            [slot['staff_user_id'] for slot in last_slots],
+            [slot['staff_user_id'] for slot in first_slots],
+            'The staff user should be picked again when the grid comes from the cache')
+        for slot in last_slots:
+            self.assertIn(url_encode({'staff_user_id': slot['staff_user_id']}), slot['url_parameters'])
+            self.assertNotIn('available_staff_user_ids', slot)
+
+    @users('apt_manager')
+    def test_slots_cache_per_appointment_type(self):
+        """ The meetings of the staff of an appointment type keep the cached grids
+        of the other appointment types. """
+        apt_type = self.apt_type_bxls_2days.with_user(self.env.user)
+        other_apt_type = apt_type.sudo().copy({'staff_user_ids': [Command.set(self.staff_user_aust.ids)]}).with_user(self.env.user)
+        with freeze_time(self.reference_now):
+            apt_type._get_appointment_slots('Europe/Brussels')
+            other_apt_type._get_appointment_slots('Europe/Brussels')
+
+        self._create_meetings(
+            self.staff_user_bxls,
+            [(self.reference_monday + timedelta(days=1),
+              self.reference_monday + timedelta(days=1, hours=3),
+              False
+             )]
+        )
+        with self.mockAppointmentCalls(), freeze_time(self.reference_now):
+            other_apt_type._get_appointment_slots('Europe/Brussels')
+        self.assertFalse(self._mock_calevent_search.called, 'The grid of the other appointment type should be kept')
+        with self.mockAppointmentCalls(), freeze_time(self.reference_now):
+            apt_type._get_appointment_slots('Europe/Brussels')
+        self.assertTrue(self._mock_calevent_search.called, 'The grid of the appointment type of the staff should be dropped')
+
     @users('apt_manager')
     def test_slots_for_today(self):
         test_reference_now = datetime(2022, 2, 14, 11, 0, 0)  # is a Monday
@@ -1,8 +1,42 @@
 # -*- coding: utf-8 -*-
 # Part of Odoo. See LICENSE file for full copyright and licensing details.
 
+from bisect import bisect_left, bisect_right
+
 from odoo.addons.resource.models.utils import Intervals, timezone_datetime
 
+
+class BusyIntervals:
+    """ Sorted and merged busy time ranges of an attendee, so that checking a
+    slot against them is a bisection instead of a scan of the events.
+    """
+    __slots__ = ('starts', 'stops')
+
+    def __init__(self, intervals=()):
+        self.starts = []
+        self.stops = []
+        for start, stop in intervals:
+            self.add(start, stop)
+
+    def __bool__(self):
+        return bool(self.starts)
+
+    def add(self, start, stop):
+        """ Insert a time range, merging it with the ranges it touches. """
+        left = bisect_left(self.stops, start)
+        right = bisect_right(self.starts, stop)
+        if left < right:
+            start = min(start, self.starts[left])
+            stop = max(stop, self.stops[right - 1])
+        self.starts[left:right] = [start]
+        self.stops[left:right] = [stop]
+
+    def overlaps(self, start, stop):
+        """ Whether a busy range shares some time with the range [start, stop]. """
+        index = bisect_right(self.stops, start)
+        return index < len(self.starts) and self.starts[index] < stop
+
+
 def intervals_overlap(interval_a, interval_b):
     """Check whether an interval of time intersects another.
 
@@ -54,17 +54,36 @@ class HrPayrollEmployeeDeclaration(models.Model):
         for line_to_post, posted_document in zip(lines_to_post, posted_documents):
             line_to_post.document_id = posted_document
 
+    @api.model
+    def _cron_generate_pdf(self, batch_size=False):
+        is_rescheduled = super()._cron_generate_pdf(batch_size=batch_size)
+        if is_rescheduled:
+            return is_rescheduled
+
+        # Post declarations from mixin
+        lines = self.search([('pdf_to_post', '=', True)])
+        if lines:
+            BATCH_SIZE = batch_size or 30
+            lines_batch = lines[:BATCH_SIZE]
+            lines_batch._post_pdf()
+            lines_batch.write({'pdf_to_post': False})
+            # if necessary, retrigger the cron to generate more pdfs
+            if len(lines) > BATCH_SIZE:
+                self.env.ref('hr_payroll.ir_cron_generate_declaration_pdfs')._trigger()
+                return True
+        return False
+
     @api.model_create_multi
     def create(self, vals_list):
         declarations = super().create(vals_list)
         if any(declaration.pdf_to_post for declaration in declarations):
-            self.env.ref('hr_payroll.ir_cron_generate_payslip_pdfs')._trigger()
+            self.env.ref('hr_payroll.ir_cron_generate_declaration_pdfs')._trigger()
         return declarations
 
     def write(self, vals):
         res = super().write(vals)
         if vals.get('pdf_to_post'):
-            self.env.ref('hr_payroll.ir_cron_generate_payslip_pdfs')._trigger()
+            self.env.ref('hr_payroll.ir_cron_generate_declaration_pdfs')._trigger()
         return res
 
     def action_post_in_documents(self):
@@ -72,7 +91,7 @@ class HrPayrollEmployeeDeclaration(models.Model):
             if not company._payroll_documents_enabled():
                 raise UserError(_('Document posting is not properly set in configuration'))
         self.write({'pdf_to_post': True})
-        self.env.ref('hr_payroll.ir_cron_generate_payslip_pdfs')._trigger()
+        self.env.ref('hr_payroll.ir_cron_generate_declaration_pdfs')._trigger()
 
         return {
             'type': 'ir.actions.client',
@@ -15,7 +15,7 @@
         'rating',
         'web_tour',
         'web_cohort',
-        'resource',
+        'resource_gantt',
         'portal',
         'digest',
     ],
@@ -15,3 +15,7 @@ from . import mail_message
 from . import res_users
 from . import res_partner
 from . import res_company
+from . import resource_calendar
+from . import resource_calendar_attendance
+from . import resource_calendar_leaves
+from . import resource_resource
@@ -22,8 +22,16 @@ class HelpdeskSLAStatus(models.Model):
     color = fields.Integer("Color Index", compute='_compute_color')
     exceeded_hours = fields.Float("Exceeded Working Hours", compute='_compute_exceeded_hours', compute_sudo=True, store=True, help="Working hours exceeded for reached SLAs compared with deadline. Positive number means the SLA was reached after the deadline.")
 
+    def _get_working_time_indexes(self):
+        """ Working time index of each calendar of the statuses' teams, see resource.calendar """
+        return {
+            calendar: calendar._get_working_time_index()
+            for calendar in self.ticket_id.team_id.resource_calendar_id
+        }
+
     @api.depends('ticket_id.create_date', 'sla_id', 'ticket_id.stage_id')
     def _compute_deadline(self):
+        working_time_indexes = self._get_working_time_indexes()
         for status in self:
             if (status.deadline and status.reached_datetime) or (status.deadline and not status.sla_id.exclude_stage_ids) or (status.status == 'failed'):
                 continue
@@ -40,28 +48,29 @@ class HelpdeskSLAStatus(models.Model):
                     status.deadline = False
                     continue
 
+            working_time_index = working_time_indexes[working_calendar]
             avg_hour = working_calendar.hours_per_day or 8  # default to 8 working hours/day
             time_days = math.floor(status.sla_id.time / avg_hour)
             if time_days > 0:
-                deadline = working_calendar.plan_days(time_days + 1, deadline, compute_leaves=True)
+                deadline = working_time_index.plan_days(time_days + 1, deadline, compute_leaves=True)
                 # We should also depend on ticket creation time, otherwise for 1 day SLA, all tickets
                 # created on monday will have their deadline filled with tuesday 8:00
-                create_dt = working_calendar.plan_hours(0, status.ticket_id.create_date)
+                create_dt = working_time_index.plan_hours(0, status.ticket_id.create_date)
                 deadline = deadline and deadline.replace(hour=create_dt.hour, minute=create_dt.minute, second=create_dt.second, microsecond=create_dt.microsecond)
 
             sla_hours = status.sla_id.time % avg_hour
 
             if status.sla_id.exclude_stage_ids:
-                sla_hours += status._get_freezed_hours(working_calendar)
+                sla_hours += status._get_freezed_hours(working_calendar, working_time_index)
 
             # Except if ticket creation time is later than the end time of the working day
-            deadline_for_working_cal = working_calendar.plan_hours(0, deadline)
+            deadline_for_working_cal = working_time_index.plan_hours(0, deadline)
             if deadline_for_working_cal and deadline.day < deadline_for_working_cal.day and time_days > 0:
                 deadline = deadline.replace(hour=0, minute=0, second=0, microsecond=0)
             # We should execute the function plan_hours in any case because, in a 1 day SLA environment,
             # if I create a ticket knowing that I'm not working the day after at the same time, ticket
             # deadline will be set at time I don't work (ticket creation time might not be in working calendar).
-            status.deadline = deadline and working_calendar.plan_hours(sla_hours, deadline, compute_leaves=True)
+            status.deadline = deadline and working_time_index.plan_hours(sla_hours, deadline, compute_leaves=True)
 
     @api.depends('deadline', 'reached_datetime')
     def _compute_status(self):
@@ -104,6 +113,7 @@ class HelpdeskSLAStatus(models.Model):
 
     @api.depends('deadline', 'reached_datetime')
     def _compute_exceeded_hours(self):
+        working_time_indexes = self._get_working_time_indexes()
         for status in self:
             if status.deadline and status.ticket_id.team_id.resource_calendar_id:
                 reached_datetime = status.reached_datetime or fields.Datetime.now()
@@ -115,14 +125,16 @@ class HelpdeskSLAStatus(models.Model):
                     start_dt = status.deadline
                     end_dt = reached_datetime
                     factor = 1
-                duration_data = status.ticket_id.team_id.resource_calendar_id.get_work_duration_data(start_dt, end_dt, compute_leaves=True)
-                status.exceeded_hours = duration_data['hours'] * factor
+                working_time_index = working_time_indexes[status.ticket_id.team_id.resource_calendar_id]
+                status.exceeded_hours = working_time_index.get_work_hours(start_dt, end_dt) * factor
             else:
                 status.exceeded_hours = False
 
-    def _get_freezed_hours(self, working_calendar):
+    def _get_freezed_hours(self, working_calendar, working_time_index=None):
         self.ensure_one()
         hours_freezed = 0
+        if working_time_index is None:
+            working_time_index = working_calendar._get_working_time_index()
 
         field_stage = self.env['ir.model.fields']._get(self.ticket_id._name, "stage_id")
         freeze_stages = self.sla_id.exclude_stage_ids.ids
@@ -134,10 +146,10 @@ class HelpdeskSLAStatus(models.Model):
         old_time = self.ticket_id.create_date
         for tracking_line in tracking_lines:
             if tracking_line.old_value_integer in freeze_stages:
-                # We must use get_work_hours_count to compute real waiting hours (as the deadline computation is also based on calendar)
-                hours_freezed += working_calendar.get_work_hours_count(old_time, tracking_line.create_date)
+                # We must use the working hours to compute real waiting hours (as the deadline computation is also based on calendar)
+                hours_freezed += working_time_index.get_work_hours(old_time, tracking_line.create_date)
             old_time = tracking_line.create_date
         if tracking_lines[-1].new_value_integer in freeze_stages:
             # the last tracking line is not yet created
-            hours_freezed += working_calendar.get_work_hours_count(old_time, fields.Datetime.now())
+            hours_freezed += working_time_index.get_work_hours(old_time, fields.Datetime.now())
         return hours_freezed
@@ -5,11 +5,11 @@ import datetime
 
 from dateutil import relativedelta
 from collections import defaultdict
-from pytz import timezone
+from pytz import timezone, utc
 from odoo import api, Command, fields, models, _
 from odoo.exceptions import ValidationError
 from odoo.osv import expression
-from odoo.tools import float_round
+from odoo.tools import float_round, ormcache, SQL
 from odoo.addons.rating.models.rating_data import RATING_LIMIT_MIN
 from odoo.addons.web.controllers.utils import clean_action
 
@@ -327,6 +327,9 @@ class HelpdeskTeam(models.Model):
     @api.model_create_multi
     def create(self, vals_list):
         teams = super(HelpdeskTeam, self.with_context(mail_create_nosubscribe=True)).create(vals_list)
+        if any(vals.get('member_ids') for vals in vals_list):
+            # see _get_cached_working_intervals_per_member
+            self.env.registry.clear_cache()
         teams.sudo()._check_sla_group()
         teams.sudo()._check_rating_group()
         teams.sudo()._check_auto_assignment_group()
@@ -344,6 +347,9 @@ class HelpdeskTeam(models.Model):
             vals['alias_name'] = self.alias_name or default_alias
 
         result = super(HelpdeskTeam, self).write(vals)
+        if 'member_ids' in vals:
+            # see _get_cached_working_intervals_per_member
+            self.env.registry.clear_cache()
         if 'active' in vals:
             self.with_context(active_test=False).mapped('ticket_ids').write({'active': vals['active']})
         if 'use_sla' in vals:
@@ -593,31 +599,33 @@ class HelpdeskTeam(models.Model):
             })
             return result
 
-        def _is_sla_failed(data):
-            deadline = data.get('sla_deadline')
-            sla_deadline = fields.Datetime.now() > deadline if deadline else False
-            return sla_deadline or data.get('sla_reached_late')
-
-        def add_to(ticket, key="my_all"):
-            result[key]['count'] += 1
-            result[key]['hours'] += ticket['open_hours']
-            if _is_sla_failed(ticket):
-                result[key]['failed'] += 1
-
         domain = [('user_id', '=', self.env.uid)]
-        tickets = HelpdeskTicket.search_read(
-            expression.AND([
-                domain,
-                [('stage_id.fold', '=', False)]
-            ]),
-            ['sla_deadline', 'open_hours', 'sla_reached_late', 'priority']
-        )
-        for ticket in tickets:
-            add_to(ticket, 'my_all')
-            if ticket['priority'] == '2':
-                add_to(ticket, 'my_high')
-            if ticket['priority'] == '3':
-                add_to(ticket, 'my_urgent')
+        open_tickets_query = HelpdeskTicket._search(expression.AND([
+            domain,
+            [('stage_id.fold', '=', False)]
+        ]))
+        HelpdeskTicket.flush_model(['create_date', 'close_date', 'priority', 'sla_deadline', 'sla_reached_late'])
+        now = fields.Datetime.now()
+        # open_hours is computed in SQL the same way as in _compute_open_hours
+        self.env.cr.execute(SQL("""
+            SELECT priority,
+                   COUNT(*),
+                   COALESCE(SUM(TRUNC(EXTRACT(EPOCH FROM COALESCE(close_date, %s) - create_date) / 3600)), 0),
+                   COUNT(*) FILTER (WHERE sla_deadline < %s OR sla_reached_late)
+              FROM helpdesk_ticket
+             WHERE id IN %s
+          GROUP BY priority
+        """, now, now, open_tickets_query.subselect()))
+        for priority, count, hours, failed in self.env.cr.fetchall():
+            keys = ['my_all']
+            if priority == '2':
+                keys.append('my_high')
+            if priority == '3':
+                keys.append('my_urgent')
+            for key in keys:
+                result[key]['count'] += count
+                result[key]['hours'] += float(hours)
+                result[key]['failed'] += failed
 
         group_fields = []
         if user_uses_sla:
@@ -658,33 +666,26 @@ class HelpdeskTeam(models.Model):
         if self._check_rating_feature_enabled(check_user_has_group=True):
             result['rating_enable'] = True
             # rating of today
-            domain = [('user_id', '=', self.env.uid)]
             today = fields.Date.today()
             one_week_before = today - relativedelta.relativedelta(weeks=1)
-            helpdesk_ratings = self.env['rating.rating'].search([
+            rating_domain = [
                 ('res_model', '=', 'helpdesk.ticket'),
-                ('res_id', '!=', False),
+                ('res_id', 'in', HelpdeskTicket._search([('user_id', '=', self._uid)])),
                 ('write_date', '>', fields.Datetime.to_string(one_week_before)),
                 ('write_date', '<=', today),
                 ('rating', '>=', RATING_LIMIT_MIN),
                 ('consumed', '=', True),
-            ])
-            tickets = HelpdeskTicket.search([('id', 'in', helpdesk_ratings.mapped('res_id')), ('user_id', '=', self._uid)])
-            today_rating_stat = {'count': 0.0, 'score': 0.0}
-            rating_stat = {**today_rating_stat}
-            for rating in helpdesk_ratings:
-                if rating.res_id not in tickets.ids:
-                    continue
-                if rating.write_date.date() == today:
-                    today_rating_stat['count'] += 1
-                    today_rating_stat['score'] += rating.rating
-                rating_stat['score'] += rating.rating
-                rating_stat['count'] += 1
-
-            avg = lambda d: fields.Float.round(d['score'] / d['count'] if d['count'] > 0 else 0.0, 2) * 20
-
-            result['today']['rating'] = avg(today_rating_stat)
-            result['7days']['rating'] = avg(rating_stat)
+            ]
+            Rating = self.env['rating.rating']
+            [(week_score, week_count)] = Rating._read_group(rating_domain, aggregates=['rating:sum', '__count'])
+            [(today_score, today_count)] = Rating._read_group(
+                expression.AND([rating_domain, [('write_date', '>=', today)]]),
+                aggregates=['rating:sum', '__count'])
+
+            avg = lambda score, count: fields.Float.round(score / count if count > 0 else 0.0, 2) * 20
+
+            result['today']['rating'] = avg(today_score, today_count)
+            result['7days']['rating'] = avg(week_score, week_count)
         return result
 
     def _action_view_rating(self, period=False, only_closed_tickets=False, user_id=None):
@@ -879,60 +880,135 @@ class HelpdeskTeam(models.Model):
             compute_leaves=compute_leaves
         )
 
+    @api.model
+    def _has_assigned_members(self, users):
+        """ Whether the availability of the given users is part of the cached working intervals
+            of the team members, see _get_cached_working_intervals_per_member.
+        """
+        return bool(users) and bool(self.sudo().with_context(active_test=False).search_count(
+            [('member_ids', 'in', users.ids)], limit=1))
+
+    @api.model
+    def _get_cached_working_intervals_range(self):
+        """ Naive UTC datetimes containing the work intervals cached per member, whatever
+            their timezone, see _get_cached_working_intervals_per_member. The availability
+            of the members out of this range doesn't change the cached intervals.
+        """
+        now = fields.Datetime.now()
+        return now - relativedelta.relativedelta(days=1), now + relativedelta.relativedelta(days=10)
+
     def _get_working_users_per_first_working_day(self):
+        """ Members of the teams grouped by first working day within the next week, the
+            groups being sorted by date. The work intervals of the members are cached per
+            hour, until the availability of the members changes.
+        """
+        members = self.member_ids
         tz = timezone(self._context.get('tz') or 'UTC')
-        start_dt = fields.Datetime.now().astimezone(tz)
+        now = fields.Datetime.now()
+        start_dt = utc.localize(now).astimezone(tz)
         end_dt = start_dt + relativedelta.relativedelta(days=7, hour=23, minute=59, second=59)
+        intervals_per_member = self._get_cached_working_intervals_per_member(
+            tuple(members.ids),
+            self.env.company.id,
+            tz.zone,
+            now.replace(minute=0, second=0, microsecond=0),
+        )
         workers_per_first_working_date = defaultdict(list)
+        for user_id, intervals_per_resource in intervals_per_member:
+            # the first resource of the user working within the week, like _get_working_user_interval
+            for intervals in intervals_per_resource:
+                first_start = next((max(start, start_dt) for start, stop in intervals if stop > start_dt and start < end_dt), None)
+                if first_start:
+                    workers_per_first_working_date[first_start.date()].append(user_id)
+                    break
+        return [user_ids for dummy, user_ids in sorted(workers_per_first_working_date.items())]
+
+    @api.model
+    @ormcache('member_ids', 'company_id', 'tz_name', 'hour_start')
+    def _get_cached_working_intervals_per_member(self, member_ids, company_id, tz_name, hour_start):
+        """ Work intervals of the members from the start of the given hour until the end of
+            the next week, as a tuple of (user id, intervals of each resource of the user).
+            The cache is cleared when the members, their calendars or their time off change.
+        """
+        tz = timezone(tz_name)
+        start_dt = utc.localize(hour_start).astimezone(tz)
+        # the week of any moment of the hour, even if the hour spans two days in the timezone
+        end_dt = start_dt + relativedelta.relativedelta(days=8, hour=23, minute=59, second=59)
         members_per_calendar = defaultdict(lambda: self.env['res.users'])
-        company_calendar = self.env.company.resource_calendar_id
-        for member in self.member_ids:
+        company_calendar = self.env['res.company'].browse(company_id).resource_calendar_id
+        for member in self.env['res.users'].browse(member_ids):
             calendar = member.resource_calendar_id or company_calendar
             members_per_calendar[calendar] |= member
+        intervals_per_member = []
         for calendar, users in members_per_calendar.items():
             work_intervals_per_resource = self._get_working_user_interval(start_dt, end_dt, calendar, users)
             for user in users:
-                for resource_id in user.resource_ids.ids:
-                    intervals = work_intervals_per_resource[resource_id]
-                    if intervals:
-                        # select the start_date of the first interval to get the first working day for this user
-                        workers_per_first_working_date[(intervals._items)[0][0].date()].append(user.id)
-                        break
-                # if the user doesn't linked to any employee then add according to company calendar
-                if user.id and not user.resource_ids:
-                    intervals = work_intervals_per_resource[False]
-                    if intervals:
-                        workers_per_first_working_date[(intervals._items)[0][0].date()].append(user.id)
-        return [value for key, value in sorted(workers_per_first_working_date.items())]
+                # if the user isn't linked to any employee, the company calendar applies
+                resource_ids = user.resource_ids.ids or [False]
+                intervals_per_member.append((user.id, tuple(
+                    tuple((start, stop) for start, stop, dummy in work_intervals_per_resource[resource_id])
+                    for resource_id in resource_ids
+                )))
+        return tuple(intervals_per_member)
 
     def _determine_user_to_assign(self):
         """ Get a dict with the user (per team) that should be assign to the nearly created ticket according to the team policy
             :returns a mapping of team identifier with the "to assign" user (maybe an empty record).
             :rtype : dict (key=team_id, value=record of res.users)
         """
-        team_without_manually = self.filtered(lambda x: x.assign_method in ['randomly', 'balanced'] and x.auto_assignment)
+        users_per_team = self._determine_users_to_assign(dict.fromkeys(self.ids, 1))
+        return {team_id: users[0] for team_id, users in users_per_team.items()}
+
+    def _determine_users_to_assign(self, ticket_count_per_team):
+        """ Get the users (per team) that should be assigned to a batch of new tickets, in one pass:
+            the round-robin cursor of the "randomly" teams and the open ticket counters of the
+            "balanced" teams are kept up to date from one ticket to the next.
+            :param ticket_count_per_team: mapping of team identifier with the number of tickets to assign
+            :returns a mapping of team identifier with a list of "to assign" users (maybe empty records),
+                one per ticket.
+            :rtype : dict (key=team_id, value=list of records of res.users)
+        """
+        result = {team.id: [self.env['res.users']] * ticket_count_per_team.get(team.id, 0) for team in self}
+        team_without_manually = self.filtered(lambda x: x.assign_method in ['randomly', 'balanced'] and x.auto_assignment and ticket_count_per_team.get(x.id))
+        if not team_without_manually:
+            return result
         users_per_working_days = team_without_manually._get_working_users_per_first_working_day()
-        result = dict.fromkeys(self.ids, self.env['res.users'])
+
+        balanced_teams = team_without_manually.filtered(lambda x: x.assign_method == 'balanced')
+        open_ticket_count_per_team_user = {}
+        if balanced_teams:
+            ticket_count_data = self.env['helpdesk.ticket']._read_group(
+                [('stage_id.fold', '=', False), ('user_id', 'in', balanced_teams.member_ids.ids), ('team_id', 'in', balanced_teams.ids)],
+                ['team_id', 'user_id'], ['__count'])
+            open_ticket_count_per_team_user = {(team.id, user.id): count for team, user, count in ticket_count_data}
+
         for team in team_without_manually:
             member_ids = team.member_ids.ids  # By default, all members of the team
             for user_ids in users_per_working_days:
-                if any(user_id in team.member_ids.ids for user_id in user_ids):
+                if any(user_id in member_ids for user_id in user_ids):
                     # filter members in team to get the ones working in the nearest date of today.
-                    member_ids = [user_id for user_id in user_ids if user_id in self.member_ids.ids]
+                    member_ids = [user_id for user_id in user_ids if user_id in team.member_ids.ids]
                     break
+            if not member_ids:
+                continue
 
+            assigned_user_ids = []
             if team.assign_method == 'randomly':  # randomly means new tickets get uniformly distributed
                 last_assigned_user = self.env['helpdesk.ticket'].search([('team_id', '=', team.id)], order='create_date desc, id desc', limit=1).user_id
                 index = 0
                 if last_assigned_user and last_assigned_user.id in member_ids:
                     previous_index = member_ids.index(last_assigned_user.id)
                     index = (previous_index + 1) % len(member_ids)
-                result[team.id] = self.env['res.users'].browse(member_ids[index])
+                for dummy in range(ticket_count_per_team[team.id]):
+                    assigned_user_ids.append(member_ids[index])
+                    index = (index + 1) % len(member_ids)
             elif team.assign_method == 'balanced':  # find the member with the least open ticket
-                ticket_count_data = self.env['helpdesk.ticket']._read_group([('stage_id.fold', '=', False), ('user_id', 'in', member_ids), ('team_id', '=', team.id)], ['user_id'], ['__count'])
-                open_ticket_per_user_map = dict.fromkeys(member_ids, 0)  # dict: user_id -> open ticket count
-                open_ticket_per_user_map.update((user.id, count) for user, count in ticket_count_data)
-                result[team.id] = self.env['res.users'].browse(min(open_ticket_per_user_map, key=open_ticket_per_user_map.get))
+                open_ticket_per_user_map = {user_id: open_ticket_count_per_team_user.get((team.id, user_id), 0) for user_id in member_ids}
+                for dummy in range(ticket_count_per_team[team.id]):
+                    user_id = min(open_ticket_per_user_map, key=open_ticket_per_user_map.get)
+                    assigned_user_ids.append(user_id)
+                    open_ticket_per_user_map[user_id] += 1
+            result[team.id] = [self.env['res.users'].browse(user_id) for user_id in assigned_user_ids]
         return result
 
     def _determine_stage(self):
@@ -955,40 +1031,30 @@ class HelpdeskTeam(models.Model):
         return closed_stage
 
     def _cron_auto_close_tickets(self):
-        teams = self.env['helpdesk.team'].search_read(
-            domain=[
-                ('auto_close_ticket', '=', True),
-                ('auto_close_day', '>', 0),
-                ('to_stage_id', '!=', False)],
-            fields=[
-                'id',
-                'auto_close_day',
-                'from_stage_ids',
-                'to_stage_id']
-        )
-        teams_dict = defaultdict(dict)  # key: team_id, values: the remaining result of the search_group
+        teams = self.env['helpdesk.team'].search([
+            ('auto_close_ticket', '=', True),
+            ('auto_close_day', '>', 0),
+            ('to_stage_id', '!=', False),
+        ])
+        if not teams:
+            return
         today = fields.datetime.today()
+        # the inactivity threshold and the stages of each team are filtered by the database
+        team_domains = []
         for team in teams:
-            # Compute the threshold_date
-            team['threshold_date'] = today - relativedelta.relativedelta(days=team['auto_close_day'])
-            teams_dict[team['id']] = team
-        tickets_domain = [('stage_id.fold', '=', False), ('team_id', 'in', list(teams_dict.keys()))]
-        tickets = self.env['helpdesk.ticket'].search(tickets_domain)
-
-        def is_inactive_ticket(ticket):
-            team = teams_dict[ticket.team_id.id]
-            is_write_date_ok = ticket.write_date <= team['threshold_date']
-            if team['from_stage_ids']:
-                is_stage_ok = ticket.stage_id.id in team['from_stage_ids']
-            else:
-                is_stage_ok = not ticket.stage_id.fold
-            return is_write_date_ok and is_stage_ok
-
-        inactive_tickets = tickets.filtered(is_inactive_ticket)
-        for ticket in inactive_tickets:
-            # to_stage_id is mandatory in the view but not in the model so it is better to test it.
-            if teams_dict[ticket.team_id.id]['to_stage_id']:
-                ticket.write({'stage_id': teams_dict[ticket.team_id.id]['to_stage_id'][0]})
+            team_domain = [
+                ('team_id', '=', team.id),
+                ('write_date', '<=', today - relativedelta.relativedelta(days=team.auto_close_day)),
+            ]
+            if team.from_stage_ids:
+                team_domain.append(('stage_id', 'in', team.from_stage_ids.ids))
+            team_domains.append(team_domain)
+        inactive_tickets = self.env['helpdesk.ticket'].search(expression.AND([
+            [('stage_id.fold', '=', False)],
+            expression.OR(team_domains),
+        ]))
+        for team, tickets in inactive_tickets.grouped('team_id').items():
+            tickets.write({'stage_id': team.to_stage_id.id})
 
     def action_view_helpdesk_rating(self):
         action = self.env['ir.actions.act_window']._for_xml_id('helpdesk.rating_rating_action_helpdesk')
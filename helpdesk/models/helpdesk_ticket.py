@@ -2,6 +2,7 @@
 # Part of Odoo. See LICENSE file for full copyright and licensing details.
 
 import ast
+from collections import Counter
 from dateutil.relativedelta import relativedelta
 
 from odoo import api, Command, fields, models, tools, _
@@ -81,7 +82,7 @@ class HelpdeskTicket(models.Model):
     domain_user_ids = fields.Many2many('res.users', compute='_compute_domain_user_ids')
     user_id = fields.Many2one(
         'res.users', string='Assigned to', compute='_compute_user_and_stage_ids', store=True,
-        readonly=False, tracking=True,
+        readonly=False, tracking=True, index=True,
         domain=lambda self: [('groups_id', 'in', self.env.ref('helpdesk.group_helpdesk_user').id)])
     properties = fields.Properties(
         'Properties', definition='team_id.ticket_properties',
@@ -428,13 +429,10 @@ class HelpdeskTicket(models.Model):
     def create(self, list_value):
         now = fields.Datetime.now()
         # determine user_id and stage_id if not given. Done in batch.
-        teams = self.env['helpdesk.team'].browse([vals['team_id'] for vals in list_value if vals.get('team_id')])
-        team_default_map = dict.fromkeys(teams.ids, dict())
-        for team in teams:
-            team_default_map[team.id] = {
-                'stage_id': team._determine_stage()[team.id].id,
-                'user_id': team._determine_user_to_assign()[team.id].id
-            }
+        teams = self.env['helpdesk.team'].browse({vals['team_id'] for vals in list_value if vals.get('team_id')})
+        stage_per_team = teams._determine_stage()
+        ticket_count_per_team = Counter(vals['team_id'] for vals in list_value if vals.get('team_id') and 'user_id' not in vals)
+        users_per_team = teams._determine_users_to_assign(ticket_count_per_team)
 
         # Manually create a partner now since '_generate_template_recipients' doesn't keep the name. This is
         # to avoid intrusive changes in the 'mail' module
@@ -459,14 +457,11 @@ class HelpdeskTicket(models.Model):
             company = company_per_team_id.get(vals.get('team_id', False))
             vals['ticket_ref'] = self.env['ir.sequence'].with_company(company).sudo().next_by_code('helpdesk.ticket')
             if vals.get('team_id'):
-                team_default = team_default_map[vals['team_id']]
                 if 'stage_id' not in vals:
-                    vals['stage_id'] = team_default['stage_id']
-                # Note: this will break the randomly distributed user assignment. Indeed, it will be too difficult to
-                # equally assigned user when creating ticket in batch, as it requires to search after the last assigned
-                # after every ticket creation, which is not very performant. We decided to not cover this user case.
+                    vals['stage_id'] = stage_per_team[vals['team_id']].id
+                # the users of the whole batch are determined together, see _determine_users_to_assign
                 if 'user_id' not in vals:
-                    vals['user_id'] = team_default['user_id']
+                    vals['user_id'] = users_per_team[vals['team_id']].pop(0).id
                 if vals.get('user_id'):  # if a user is finally assigned, force ticket assign_date and reset assign_hours
                     vals['assign_date'] = fields.Datetime.now()
                     vals['assign_hours'] = 0
@@ -13,6 +13,14 @@ class ResCompany(models.Model):
         company._create_helpdesk_team()
         return company
 
+    def write(self, vals):
+        res = super().write(vals)
+        if 'resource_calendar_id' in vals:
+            # the calendar of the team members without one of their own, see
+            # helpdesk.team._get_cached_working_intervals_per_member
+            self.env.registry.clear_cache()
+        return res
+
     def _create_helpdesk_team(self):
         results = []
         stage_ids = []
@@ -0,0 +1,158 @@
+# -*- coding: utf-8 -*-
+# Part of Odoo. See LICENSE file for full copyright and licensing details.
+
+from bisect import bisect_left, bisect_right
+from datetime import datetime, timedelta
+from pytz import utc
+
+from odoo import models
+from odoo.tools import ormcache
+
+HOUR = timedelta(hours=1)
+MICROSECOND = timedelta(microseconds=1)
+# number of days covered by a window of the working time index
+WINDOW_DAYS = 400
+
+
+def _make_aware(dt):
+    return dt if dt.tzinfo else dt.replace(tzinfo=utc)
+
+
+def _to_naive_utc(dt):
+    return dt.astimezone(utc).replace(tzinfo=None)
+
+
+class WorkingTimeWindow:
+    """ Working intervals of a calendar between two datetimes, together with the
+        cumulative working time (in microseconds) elapsed at the start and at the
+        end of each interval, so that working time can be planned or measured by
+        bisecting the arrays instead of recomputing the intervals.
+        All the methods return None when the answer is not inside the window.
+    """
+    __slots__ = ('date_from', 'date_to', 'starts', 'stops', 'cumul_starts', 'cumul_stops', 'day_indexes')
+
+    def __init__(self, intervals, date_from, date_to):
+        self.date_from = date_from
+        self.date_to = date_to
+        starts, stops, cumul_starts, cumul_stops, day_indexes = [], [], [], [], []
+        cumul = 0
+        day_index = -1
+        last_day = None
+        for start, stop, dummy in intervals:
+            # days are counted in the timezone of the calendar, like plan_days does
+            if start.date() != last_day:
+                last_day = start.date()
+                day_index += 1
+            starts.append(start.astimezone(utc))
+            stops.append(stop.astimezone(utc))
+            cumul_starts.append(cumul)
+            cumul += (stop - start) // MICROSECOND
+            cumul_stops.append(cumul)
+            day_indexes.append(day_index)
+        self.starts = tuple(starts)
+        self.stops = tuple(stops)
+        self.cumul_starts = tuple(cumul_starts)
+        self.cumul_stops = tuple(cumul_stops)
+        self.day_indexes = tuple(day_indexes)
+
+    def _get_offset(self, dt):
+        """ Working time elapsed between the start of the window and ``dt``. """
+        if not self.date_from <= dt <= self.date_to:
+            return None
+        index = bisect_right(self.starts, dt) - 1
+        if index < 0:
+            return 0
+        return self.cumul_starts[index] + (min(dt, self.stops[index]) - self.starts[index]) // MICROSECOND
+
+    def plan_hours(self, hours, dt):
+        if hours < 0 or not self.date_from <= dt <= self.date_to:
+            return None
+        if not hours:
+            # start of the first working interval ending after dt
+            index = bisect_right(self.stops, dt)
+            return max(self.starts[index], dt) if index < len(self.starts) else None
+        target = self._get_offset(dt) + round(hours * (HOUR // MICROSECOND))
+        index = bisect_left(self.cumul_stops, target)
+        if index == len(self.starts):
+            return None
+        return self.starts[index] + timedelta(microseconds=target - self.cumul_starts[index])
+
+    def plan_days(self, days, dt):
+        """ Stop of the first working interval of the ``days``-th working day from dt. """
+        if days <= 0 or not self.date_from <= dt <= self.date_to:
+            return None
+        index = bisect_right(self.stops, dt)
+        if index == len(self.starts):
+            return None
+        index = bisect_left(self.day_indexes, self.day_indexes[index] + days - 1)
+        # the last day of the window may be truncated
+        if index == len(self.starts) or self.stops[index] >= self.date_to:
+            return None
+        return self.stops[index]
+
+    def get_work_hours(self, start_dt, end_dt):
+        start_offset = self._get_offset(start_dt)
+        end_offset = self._get_offset(end_dt)
+        if start_offset is None or end_offset is None:
+            return None
+        return max(end_offset - start_offset, 0) * MICROSECOND / HOUR
+
+
+class WorkingTimeIndex:
+    """ Answers the planning and duration questions of a calendar from cached
+        windows of working time, falling back on the calendar methods when the
+        dates are out of the windows. The windows are shared between workers
+        until the calendar, its attendances or its leaves change.
+    """
+
+    def __init__(self, calendar):
+        self.calendar = calendar
+        self.windows = {}
+
+    def _get_window(self, dt, compute_leaves):
+        date_from = datetime(dt.year, dt.month, 1, tzinfo=utc)
+        key = (date_from, compute_leaves)
+        if key not in self.windows:
+            self.windows[key] = self.calendar._get_working_time_window(compute_leaves, date_from)
+        return self.windows[key]
+
+    def plan_hours(self, hours, dt, compute_leaves=False):
+        aware_dt = _make_aware(dt)
+        result = self._get_window(aware_dt, compute_leaves).plan_hours(hours, aware_dt)
+        if result is None:
+            return self.calendar.plan_hours(hours, dt, compute_leaves=compute_leaves)
+        return _to_naive_utc(result)
+
+    def plan_days(self, days, dt, compute_leaves=False):
+        aware_dt = _make_aware(dt)
+        result = self._get_window(aware_dt, compute_leaves).plan_days(days, aware_dt)
+        if result is None:
+            return self.calendar.plan_days(days, dt, compute_leaves=compute_leaves)
+        return _to_naive_utc(result)
+
+    def get_work_hours(self, start_dt, end_dt, compute_leaves=True):
+        aware_start_dt, aware_end_dt = _make_aware(start_dt), _make_aware(end_dt)
+        result = self._get_window(aware_start_dt, compute_leaves).get_work_hours(aware_start_dt, aware_end_dt)
+        if result is None:
+            return self.calendar.get_work_hours_count(start_dt, end_dt, compute_leaves=compute_leaves)
+        return result
+
+
+class ResourceCalendar(models.Model):
+    _inherit = 'resource.calendar'
+
+    @ormcache('self.id', 'compute_leaves', 'date_from')
+    def _get_working_time_window(self, compute_leaves, date_from):
+        """ The cache is cleared when the calendar, its attendances or the leaves
+            of the whole calendar change, see resource.cached.intervals.mixin.
+        """
+        date_to = date_from + timedelta(days=WINDOW_DAYS)
+        if compute_leaves:
+            intervals = self._work_intervals_batch(date_from, date_to)[False]
+        else:
+            intervals = self._attendance_intervals_batch(date_from, date_to)[False]
+        return WorkingTimeWindow(intervals, date_from, date_to)
+
+    def _get_working_time_index(self):
+        self.ensure_one()
+        return WorkingTimeIndex(self)
@@ -0,0 +1,17 @@
+# -*- coding: utf-8 -*-
+# Part of Odoo. See LICENSE file for full copyright and licensing details.
+
+from odoo import models
+
+
+class ResourceCalendarAttendance(models.Model):
+    _inherit = 'resource.calendar.attendance'
+
+    def _affects_cached_intervals(self):
+        """ The cached working time windows of the calendars only contain the attendances
+            of the whole calendar, see resource.calendar._get_working_time_window, while
+            the cached work intervals of the team members contain their own attendances,
+            see helpdesk.team._get_cached_working_intervals_per_member.
+        """
+        return super()._affects_cached_intervals() \
+            or self.env['helpdesk.team']._has_assigned_members(self.resource_id.user_id)
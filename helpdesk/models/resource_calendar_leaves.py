@@ -0,0 +1,21 @@
+# -*- coding: utf-8 -*-
+# Part of Odoo. See LICENSE file for full copyright and licensing details.
+
+from odoo import models
+
+
+class ResourceCalendarLeaves(models.Model):
+    _inherit = 'resource.calendar.leaves'
+
+    def _affects_cached_intervals(self):
+        """ The cached working time windows of the calendars only contain the leaves
+            of the whole calendar, see resource.calendar._get_working_time_window,
+            while the cached work intervals of the team members contain their own
+            time off of the next days, see helpdesk.team._get_cached_working_intervals_per_member.
+        """
+        if super()._affects_cached_intervals():
+            return True
+        date_from, date_to = self.env['helpdesk.team']._get_cached_working_intervals_range()
+        member_leaves = self.filtered(lambda leave:
+            leave.resource_id and leave.time_type == 'leave' and leave.date_from < date_to and leave.date_to > date_from)
+        return self.env['helpdesk.team']._has_assigned_members(member_leaves.resource_id.user_id)
@@ -0,0 +1,15 @@
+# -*- coding: utf-8 -*-
+# Part of Odoo. See LICENSE file for full copyright and licensing details.
+
+from odoo import models
+
+
+class ResourceResource(models.Model):
+    _inherit = 'resource.resource'
+
+    def _affects_cached_intervals(self):
+        """ The work intervals of the team members are cached, see
+            helpdesk.team._get_cached_working_intervals_per_member.
+        """
+        return super()._affects_cached_intervals() \
+            or self.env['helpdesk.team']._has_assigned_members(self.user_id)
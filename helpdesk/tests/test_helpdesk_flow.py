@@ -4,9 +4,11 @@
 from datetime import datetime
 from dateutil.relativedelta import relativedelta
 from freezegun import freeze_time
+from unittest.mock import patch
 
 from .common import HelpdeskCommon
 from odoo.exceptions import AccessError
+from odoo.modules.registry import Registry
 
 
 class TestHelpdeskFlow(HelpdeskCommon):
@@ -216,6 +218,106 @@ Content-Transfer-Encoding: quoted-printable
         self.assertEqual(self.env['helpdesk.ticket'].search_count([('user_id', '=', self.helpdesk_user.id), ('close_date', '=', False)]), 3)
         self.assertEqual(self.env['helpdesk.ticket'].search_count([('user_id', '=', self.helpdesk_manager.id), ('close_date', '=', False)]), 3)
 
+    def test_team_assignation_batch(self):
+        self.test_team.member_ids = [(6, 0, [self.helpdesk_user.id, self.helpdesk_manager.id])]
+        self.test_team.update({'assign_method': 'randomly', 'auto_assignment': True})
+        tickets = self.env['helpdesk.ticket'].create([{
+            'name': 'test ticket %s' % i,
+            'team_id': self.test_team.id,
+        } for i in range(4)])
+        self.assertEqual(len(tickets.filtered(lambda t: t.user_id == self.helpdesk_user)), 2)
+        self.assertEqual(len(tickets.filtered(lambda t: t.user_id == self.helpdesk_manager)), 2)
+
+        self.test_team.assign_method = 'balanced'
+        tickets.filtered(lambda t: t.user_id == self.helpdesk_user).write({'stage_id': self.stage_done.id})
+        tickets = self.env['helpdesk.ticket'].create([{
+            'name': 'test ticket %s' % i,
+            'team_id': self.test_team.id,
+        } for i in range(4)])
+        self.assertEqual(len(tickets.filtered(lambda t: t.user_id == self.helpdesk_user)), 3)
+        self.assertEqual(len(tickets.filtered(lambda t: t.user_id == self.helpdesk_manager)), 1)
+
+    def test_dashboard_follows_ticket_writes(self):
+        ticket = self.env['helpdesk.ticket'].create({
+            'name': 'test ticket',
+            'team_id': self.test_team.id,
+            'user_id': self.env.uid,
+            'priority': '0',
+        })
+        HelpdeskTeam = self.env['helpdesk.team']
+        data = HelpdeskTeam.retrieve_dashboard()
+        my_all_count = data['my_all']['count']
+        self.assertGreaterEqual(my_all_count, 1)
+        self.assertEqual(data['my_urgent']['count'], 0)
+
+        ticket.priority = '3'
+        data = HelpdeskTeam.retrieve_dashboard()
+        self.assertEqual(data['my_all']['count'], my_all_count)
+        self.assertEqual(data['my_urgent']['count'], 1)
+
+        ticket.user_id = self.helpdesk_user
+        data = HelpdeskTeam.retrieve_dashboard()
+        self.assertEqual(data['my_all']['count'], my_all_count - 1)
+
+    def test_team_assignation_first_working_day(self):
+        """ The first working day of the members is the one of the exact moment of the assignation,
+            even though their work intervals are cached per hour.
+        """
+        def create_calendar(name, weekdays):
+            return self.env['resource.calendar'].create({
+                'name': name,
+                'tz': 'UTC',
+                'attendance_ids': [(0, 0, {
+                    'name': f'{name} {weekday}',
+                    'dayofweek': weekday,
+                    'hour_from': 8,
+                    'hour_to': 16.5,
+                    'day_period': 'morning',
+                }) for weekday in weekdays],
+            })
+        user_resource = self.env['resource.resource'].create({
+            'name': 'Helpdesk User',
+            'user_id': self.helpdesk_user.id,
+            'calendar_id': create_calendar('Full Week', ['0', '1', '2', '3', '4']).id,
+        })
+        self.env['resource.resource'].create({
+            'name': 'Helpdesk Manager',
+            'user_id': self.helpdesk_manager.id,
+            'calendar_id': create_calendar('Thursday', ['3']).id,
+        })
+        team = self.test_team.with_context(tz='UTC')
+        team.member_ids = self.helpdesk_user + self.helpdesk_manager
+
+        # Wednesday, before the end of the day of the user
+        with freeze_time('2024-01-10 16:10:00'):
+            self.assertEqual(team._get_working_users_per_first_working_day(), [[self.helpdesk_user.id], [self.helpdesk_manager.id]])
+        # Wednesday, after the end of the day of the user, both members first work on Thursday
+        with freeze_time('2024-01-10 16:50:00'):
+            self.assertEqual(
+                sorted(map(sorted, team._get_working_users_per_first_working_day())),
+                [sorted((self.helpdesk_user + self.helpdesk_manager).ids)])
+
+            # the time off of a member is taken into account
+            self.env['resource.calendar.leaves'].create({
+                'name': 'Time Off',
+                'resource_id': user_resource.id,
+                'calendar_id': user_resource.calendar_id.id,
+                'date_from': datetime(2024, 1, 11, 0, 0),
+                'date_to': datetime(2024, 1, 11, 23, 59),
+            })
+            self.assertEqual(team._get_working_users_per_first_working_day(), [[self.helpdesk_manager.id], [self.helpdesk_user.id]])
+
+            # the time off after the cached week doesn't clear the cache
+            with patch.object(Registry, 'clear_cache') as clear_cache:
+                self.env['resource.calendar.leaves'].create({
+                    'name': 'Time Off',
+                    'resource_id': user_resource.id,
+                    'calendar_id': user_resource.calendar_id.id,
+                    'date_from': datetime(2024, 2, 12, 0, 0),
+                    'date_to': datetime(2024, 2, 16, 23, 59),
+                })
+            clear_cache.assert_not_called()
+
     def test_create_from_email_multicompany(self):
         company0 = self.env.company
         company1 = self.env['res.company'].create({'name': 'new_company0'})
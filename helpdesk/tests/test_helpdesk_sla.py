@@ -5,6 +5,7 @@ from unittest.mock import patch
 from dateutil.relativedelta import relativedelta
 from datetime import datetime
 from freezegun import freeze_time
+from pytz import utc
 
 from odoo import fields, Command
 from odoo.tests.common import TransactionCase
@@ -285,3 +286,47 @@ class HelpdeskSLA(TransactionCase):
             # Success rate checks
             self.assertEqual(self.test_team_reached.success_rate, 100.0, "Team without late tickets should have 100.0 success rate")
             self.assertEqual(self.test_team_late.success_rate, 0.0, "Team with only late tickets should have 0.0 success rate")
+
+    def test_working_time_index(self):
+        calendar = self.test_team_reached.resource_calendar_id
+        index = calendar._get_working_time_index()
+        for dt in [NOW, NOW + relativedelta(hour=20), NOW + relativedelta(days=3, hour=12, minute=30), NOW2]:
+            for hours in [0, 1.5, 8, 27.25]:
+                self.assertEqual(index.plan_hours(hours, dt), calendar.plan_hours(hours, dt))
+                self.assertEqual(index.plan_hours(hours, dt, compute_leaves=True), calendar.plan_hours(hours, dt, compute_leaves=True))
+            for days in [1, 2, 6]:
+                self.assertEqual(index.plan_days(days, dt, compute_leaves=True), calendar.plan_days(days, dt, compute_leaves=True))
+            end_dt = dt + relativedelta(days=9, hours=5)
+            self.assertAlmostEqual(index.get_work_hours(dt, end_dt), calendar.get_work_hours_count(dt, end_dt))
+
+        # adding a public holiday builds a new index
+        self.env['resource.calendar.leaves'].create({
+            'name': 'Holiday',
+            'calendar_id': calendar.id,
+            'date_from': NOW + relativedelta(days=1, hour=0),
+            'date_to': NOW + relativedelta(days=1, hour=23, minute=59),
+        })
+        index = calendar._get_working_time_index()
+        self.assertEqual(index.plan_days(2, NOW, compute_leaves=True), calendar.plan_days(2, NOW, compute_leaves=True))
+        self.assertAlmostEqual(index.get_work_hours(NOW, NOW + relativedelta(days=3)), calendar.get_work_hours_count(NOW, NOW + relativedelta(days=3)))
+
+    def test_working_time_window_invalidation(self):
+        calendar = self.test_team_reached.resource_calendar_id
+        date_from = datetime(NOW.year, NOW.month, 1, tzinfo=utc)
+        window = calendar._get_working_time_window(True, date_from)
+        self.assertIs(calendar._get_working_time_window(True, date_from), window)
+
+        # the time off of a single resource is not part of the windows
+        self.env['resource.calendar.leaves'].create({
+            'name': 'Time Off',
+            'calendar_id': calendar.id,
+            'resource_id': self.env['resource.resource'].create({'name': 'Resource', 'calendar_id': calendar.id}).id,
+            'date_from': NOW + relativedelta(days=1, hour=0),
+            'date_to': NOW + relativedelta(days=1, hour=23, minute=59),
+        })
+        self.assertIs(calendar._get_working_time_window(True, date_from), window)
+
+        calendar.attendance_ids[0].hour_to -= 1
+        self.assertIsNot(calendar._get_working_time_window(True, date_from), window)
+        dt = NOW + relativedelta(days=3, hour=12, minute=30)
+        self.assertEqual(calendar._get_working_time_index().plan_hours(8, dt), calendar.plan_hours(8, dt))
@@ -0,0 +1,44 @@
+# -*- coding: utf-8 -*-
+# Part of Odoo. See LICENSE file for full copyright and licensing details.
+
+from odoo import api, models
+
+# fields of the time off changing the work intervals of the team members
+WORKING_TIME_LEAVE_FIELDS = {'active', 'date_from', 'date_to', 'employee_id', 'state'}
+
+
+class HrLeave(models.Model):
+    _inherit = 'hr.leave'
+
+    def _affects_helpdesk_working_intervals(self):
+        """ The non validated time off of the next days is part of the cached work intervals
+            of the team members, see helpdesk.team._get_working_user_interval. The validated
+            one is part of them through its resource.calendar.leaves.
+        """
+        date_from, date_to = self.env['helpdesk.team']._get_cached_working_intervals_range()
+        leaves = self.filtered(lambda leave:
+            leave.active and leave.state in ('confirm', 'validate1') and leave.date_from < date_to and leave.date_to > date_from)
+        return self.env['helpdesk.team']._has_assigned_members(leaves.employee_id.user_id)
+
+    @api.model_create_multi
+    def create(self, vals_list):
+        leaves = super().create(vals_list)
+        if leaves._affects_helpdesk_working_intervals():
+            self.env.registry.clear_cache()
+        return leaves
+
+    def write(self, vals):
+        if not WORKING_TIME_LEAVE_FIELDS & vals.keys():
+            return super().write(vals)
+        clear_cache = self._affects_helpdesk_working_intervals()
+        res = super().write(vals)
+        if clear_cache or self._affects_helpdesk_working_intervals():
+            self.env.registry.clear_cache()
+        return res
+
+    def unlink(self):
+        clear_cache = self._affects_helpdesk_working_intervals()
+        res = super().unlink()
+        if clear_cache:
+            self.env.registry.clear_cache()
+        return res
@@ -10,6 +10,7 @@ from . import hr_payroll_structure_type
 from . import hr_salary_rule
 from . import hr_salary_rule_category
 from . import hr_payslip
+from . import hr_payslip_aggregate
 from . import hr_payslip_line
 from . import hr_payslip_worked_days
 from . import hr_payslip_input
@@ -2,6 +2,7 @@
 # Part of Odoo. See LICENSE file for full copyright and licensing details.
 
 import logging
+import time
 
 from collections import defaultdict
 
@@ -74,23 +75,39 @@ class HrPayrollEmployeeDeclaration(models.Model):
             if pdf_files:
                 sheet._process_files(pdf_files)
 
+    @api.model
+    def _cron_generate_pdf(self, batch_size=False):
+        lines = self.search([('pdf_to_generate', '=', True)])
+        if lines:
+            BATCH_SIZE = batch_size or 30
+            lines_batch = lines[:BATCH_SIZE]
+            start_time = time.time()
+            lines_batch._generate_pdf()
+            lines_batch.write({'pdf_to_generate': False})
+            _logger.info("Generated %s declaration pdfs in %.2fs", len(lines_batch), time.time() - start_time)
+            # if necessary, retrigger the cron to generate more pdfs
+            if len(lines) > BATCH_SIZE:
+                self.env.ref('hr_payroll.ir_cron_generate_declaration_pdfs')._trigger()
+                return True
+        return False
+
     @api.model_create_multi
     def create(self, vals_list):
         declarations = super().create(vals_list)
         if any(declaration.pdf_to_generate for declaration in declarations):
-            self.env.ref('hr_payroll.ir_cron_generate_payslip_pdfs')._trigger()
+            self.env.ref('hr_payroll.ir_cron_generate_declaration_pdfs')._trigger()
         return declarations
 
     def write(self, vals):
         res = super().write(vals)
         if vals.get('pdf_to_generate'):
-            self.env.ref('hr_payroll.ir_cron_generate_payslip_pdfs')._trigger()
+            self.env.ref('hr_payroll.ir_cron_generate_declaration_pdfs')._trigger()
         return res
 
     def action_generate_pdf(self):
         if self:
             self.write({'pdf_to_generate': True})
-            self.env.ref('hr_payroll.ir_cron_generate_payslip_pdfs')._trigger()
+            self.env.ref('hr_payroll.ir_cron_generate_declaration_pdfs')._trigger()
             message = _("PDF generation started. It will be available shortly.")
         else:
             message = _("Please select the declarations for which you want to generate a PDF.")
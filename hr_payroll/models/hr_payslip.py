@@ -5,18 +5,22 @@ import logging
 import random
 import math
 import pytz
+import threading
 
 from collections import defaultdict, Counter
 from datetime import date, datetime, time
 from dateutil.relativedelta import relativedelta
+from time import perf_counter
+from markupsafe import Markup
 
 from odoo import api, Command, fields, models, _
 from odoo.exceptions import UserError, ValidationError
 from odoo.osv.expression import AND
-from odoo.tools import float_round, date_utils, convert_file, format_amount
+from odoo.tools import config, float_round, date_utils, convert_file, format_amount
 from odoo.tools.float_utils import float_compare
 from odoo.tools.misc import format_date
 from odoo.tools.safe_eval import safe_eval
+from odoo.addons.hr_payroll.models.hr_payslip_aggregate import AGGREGATE_PAYSLIP_FIELDS
 
 _logger = logging.getLogger(__name__)
 
@@ -121,6 +125,8 @@ class HrPayslip(models.Model):
     is_superuser = fields.Boolean(compute="_compute_is_superuser")
     edited = fields.Boolean()
     queued_for_pdf = fields.Boolean(default=False)
+    queued_for_compute = fields.Boolean(default=False, copy=False, index=True)
+    compute_error = fields.Text(readonly=True, copy=False, help="Error raised by the last computation of the payslip in a batch")
 
     salary_attachment_ids = fields.Many2many(
         'hr.salary.attachment',
@@ -381,9 +387,34 @@ class HrPayslip(models.Model):
         if any(payslip.date_from > payslip.date_to for payslip in self):
             raise ValidationError(_("Payslip 'Date From' must be earlier than 'Date To'."))
 
+    def _get_aggregate_keys(self):
+        """ Keys of the aggregates the done and paid payslips count in, by payslip. """
+        return {
+            payslip.id: (payslip.employee_id.id, payslip.date_from, payslip.date_to)
+            for payslip in self
+            if payslip.state in ['done', 'paid']
+        }
+
+    def _refresh_payslip_aggregates(self):
+        self.env['hr.payslip.aggregate']._refresh_aggregates(list(set(self._get_aggregate_keys().values())))
+
+    @api.model_create_multi
+    def create(self, vals_list):
+        payslips = super().create(vals_list)
+        # payslips may be created directly in the done or paid states, e.g. when imported
+        payslips._refresh_payslip_aggregates()
+        return payslips
+
     def write(self, vals):
+        previous_keys = self._get_aggregate_keys() if AGGREGATE_PAYSLIP_FIELDS & vals.keys() else None
         res = super().write(vals)
 
+        if previous_keys is not None:
+            # only the payslips entering or leaving the done/paid states, or moved to another
+            # employee or period, change the aggregates: the old and the new keys are refreshed
+            changed_keys = previous_keys.items() ^ self._get_aggregate_keys().items()
+            self.env['hr.payslip.aggregate']._refresh_aggregates(list({key for dummy, key in changed_keys}))
+
         if 'state' in vals and vals['state'] == 'paid':
             # Register payment in Salary Attachments
             # NOTE: Since we combine multiple attachments on one input line, it's not possible to compute
@@ -422,28 +453,65 @@ class HrPayslip(models.Model):
             'hr_payroll.mail_template_new_payslip', raise_if_not_found=False
         )
 
+    def _get_pdf_contents_from_streams(self, streams):
+        """
+        Splits the streams prepared for all the payslips in self by
+        _render_qweb_pdf_prepare_streams, and closes them. Returns a dict
+        {payslip id: pdf content}, or None when the document could not be split
+        per payslip, in which case the payslips have no stream of their own.
+        """
+        pdf_contents = {}
+        for res_id, stream_data in streams.items():
+            if not stream_data['stream']:
+                continue
+            if res_id in self.ids:
+                pdf_contents[res_id] = stream_data['stream'].getvalue()
+            stream_data['stream'].close()
+        return pdf_contents if set(pdf_contents) == set(self.ids) else None
+
+    def _render_pdfs(self, report):
+        """
+        Renders the payslips with the given report in a single wkhtmltopdf pass,
+        the resulting document being split afterwards on its outlines. Falls back
+        on one rendering per payslip when the document cannot be split.
+        Returns a dict {payslip id: pdf content}.
+        """
+        report_sudo = self.env['ir.actions.report'].sudo()
+        # In test mode, _render_qweb_pdf only renders the html
+        test_mode = (config['test_enable'] or config['test_file']) and not self.env.context.get('force_report_rendering')
+        if len(self) > 1 and not test_mode:
+            streams = report_sudo._render_qweb_pdf_prepare_streams(report, {}, res_ids=self.ids)
+            pdf_contents = self._get_pdf_contents_from_streams(streams)
+            if pdf_contents is not None:
+                return pdf_contents
+        return {
+            payslip.id: report_sudo._render_qweb_pdf(report, payslip.id)[0]
+            for payslip in self
+        }
+
     def _generate_pdf(self):
         mapped_reports = self._get_pdf_reports()
         attachments_vals_list = []
         generic_name = _("Payslip")
         template = self._get_email_template()
         for report, payslips in mapped_reports.items():
-            for payslip in payslips:
-                pdf_content, dummy = self.env['ir.actions.report'].sudo().with_context(lang=payslip.employee_id.lang)._render_qweb_pdf(report, payslip.id)
-                if report.print_report_name:
-                    pdf_name = safe_eval(report.print_report_name, {'object': payslip})
-                else:
-                    pdf_name = generic_name
-                attachments_vals_list.append({
-                    'name': pdf_name,
-                    'type': 'binary',
-                    'raw': pdf_content,
-                    'res_model': payslip._name,
-                    'res_id': payslip.id
-                })
-                # Send email to employees
-                if template:
-                    template.send_mail(payslip.id, email_layout_xmlid='mail.mail_notification_light')
+            for lang, lang_payslips in payslips.grouped(lambda p: p.employee_id.lang).items():
+                pdf_contents = lang_payslips.with_context(lang=lang)._render_pdfs(report)
+                for payslip in lang_payslips:
+                    if report.print_report_name:
+                        pdf_name = safe_eval(report.print_report_name, {'object': payslip})
+                    else:
+                        pdf_name = generic_name
+                    attachments_vals_list.append({
+                        'name': pdf_name,
+                        'type': 'binary',
+                        'raw': pdf_contents[payslip.id],
+                        'res_model': payslip._name,
+                        'res_id': payslip.id
+                    })
+                    # Send email to employees
+                    if template:
+                        template.send_mail(payslip.id, email_layout_xmlid='mail.mail_notification_light')
         self.env['ir.attachment'].sudo().create(attachments_vals_list)
 
     def action_payslip_done(self):
@@ -556,7 +624,8 @@ class HrPayslip(models.Model):
             payslip.write({
                 'number': number,
                 'state': 'verify',
-                'compute_date': today
+                'compute_date': today,
+                'compute_error': False,
             })
         self.env['hr.payslip.line'].create(payslips._get_payslip_lines())
         return True
@@ -685,66 +754,65 @@ class HrPayslip(models.Model):
         self.ensure_one()
         return self.env['hr.rule.parameter']._get_parameter_from_code(code, self.date_to)
 
-    def _sum(self, code, from_date, to_date=None):
-        if to_date is None:
-            to_date = fields.Date.today()
+    def _prefetch_payslip_aggregates(self):
+        """
+        Loads the aggregates of the employees of the payslips, from the
+        beginning of the year before the earliest payslip. The result is given
+        in the payslip_aggregates context key, so that the _sum helpers called
+        by the salary rules are answered without any query.
+        """
+        if not self:
+            return None
+        date_from = min(self.mapped('date_from')) + relativedelta(years=-1, month=1, day=1)
+        aggregates = {
+            'date_from': date_from,
+            'employee_ids': set(self.employee_id.ids),
+            'values': defaultdict(list),
+        }
+        self.env['hr.payslip.aggregate'].flush_model()
         self.env.cr.execute("""
-            SELECT sum(pl.total)
-            FROM hr_payslip as hp, hr_payslip_line as pl
-            WHERE hp.employee_id = %s
-            AND hp.state in ('done', 'paid')
-            AND hp.date_from >= %s
-            AND hp.date_to <= %s
-            AND hp.id = pl.slip_id
-            AND pl.code = %s""", (self.employee_id.id, from_date, to_date, code))
-        res = self.env.cr.fetchone()
-        return res and res[0] or 0.0
-
-    def _sum_category(self, code, from_date, to_date=None):
+            SELECT employee_id, aggregate_type, code, date_from, date_to, total
+              FROM hr_payslip_aggregate
+             WHERE employee_id IN %s
+               AND date_from >= %s
+        """, (tuple(aggregates['employee_ids']), date_from))
+        for employee_id, aggregate_type, code, slip_date_from, slip_date_to, total in self.env.cr.fetchall():
+            aggregates['values'][(employee_id, aggregate_type, code)].append((slip_date_from, slip_date_to, total))
+        return aggregates
+
+    def _get_aggregate(self, aggregate_type, code, from_date, to_date=None):
         self.ensure_one()
-        if to_date is None:
-            to_date = fields.Date.today()
-
-        self.env['hr.payslip'].flush_model(['employee_id', 'state', 'date_from', 'date_to'])
-        self.env['hr.payslip.line'].flush_model(['total', 'slip_id', 'category_id'])
-        self.env['hr.salary.rule.category'].flush_model(['code'])
+        from_date = fields.Date.to_date(from_date)
+        to_date = fields.Date.to_date(to_date) if to_date is not None else fields.Date.today()
+
+        aggregates = self.env.context.get('payslip_aggregates')
+        if aggregates and self.employee_id.id in aggregates['employee_ids'] and from_date >= aggregates['date_from']:
+            return sum(
+                total
+                for slip_date_from, slip_date_to, total in aggregates['values'].get((self.employee_id.id, aggregate_type, code), [])
+                if slip_date_from >= from_date and slip_date_to <= to_date
+            )
 
+        self.env['hr.payslip.aggregate'].flush_model()
         self.env.cr.execute("""
-            SELECT sum(pl.total)
-            FROM hr_payslip as hp, hr_payslip_line as pl, hr_salary_rule_category as rc
-            WHERE hp.employee_id = %s
-            AND hp.state in ('done', 'paid')
-            AND hp.date_from >= %s
-            AND hp.date_to <= %s
-            AND hp.id = pl.slip_id
-            AND rc.id = pl.category_id
-            AND rc.code = %s""", (self.employee_id.id, from_date, to_date, code))
+            SELECT sum(total)
+              FROM hr_payslip_aggregate
+             WHERE employee_id = %s
+               AND aggregate_type = %s
+               AND code = %s
+               AND date_from >= %s
+               AND date_to <= %s""", (self.employee_id.id, aggregate_type, code, from_date, to_date))
         res = self.env.cr.fetchone()
         return res and res[0] or 0.0
 
+    def _sum(self, code, from_date, to_date=None):
+        return self._get_aggregate('rule', code, from_date, to_date)
+
+    def _sum_category(self, code, from_date, to_date=None):
+        return self._get_aggregate('category', code, from_date, to_date)
+
     def _sum_worked_days(self, code, from_date, to_date=None):
-        self.ensure_one()
-        if to_date is None:
-            to_date = fields.Date.today()
-
-        query = """
-            SELECT sum(hwd.amount)
-            FROM hr_payslip hp, hr_payslip_worked_days hwd, hr_work_entry_type hwet
-            WHERE hp.state in ('done', 'paid')
-            AND hp.id = hwd.payslip_id
-            AND hwet.id = hwd.work_entry_type_id
-            AND hp.employee_id = %(employee)s
-            AND hp.date_to <= %(stop)s
-            AND hwet.code = %(code)s
-            AND hp.date_from >= %(start)s"""
-
-        self.env.cr.execute(query, {
-            'employee': self.employee_id.id,
-            'code': code,
-            'start': from_date,
-            'stop': to_date})
-        res = self.env.cr.fetchone()
-        return res[0] if res else 0.0
+        return self._get_aggregate('worked_days', code, from_date, to_date)
 
     def _get_base_local_dict(self):
         return {
@@ -809,6 +877,8 @@ class HrPayslip(models.Model):
 
     def _get_payslip_lines(self):
         line_vals = []
+        if 'payslip_aggregates' not in self.env.context:
+            self = self.with_context(payslip_aggregates=self._prefetch_payslip_aggregates())
         for payslip in self:
             if not payslip.contract_id:
                 raise UserError(_("There's no contract set on payslip %s for %s. Check that there is at least a contract set on the employee form.", payslip.name, payslip.employee_id.name))
@@ -1240,32 +1310,83 @@ class HrPayslip(models.Model):
             'res_id': wizard.id
         }
 
+    def _queue_compute_sheet(self):
+        """ Computes the payslips in the background, see _cron_compute_sheet. """
+        self.write({'queued_for_compute': True, 'compute_error': False})
+        self.env.ref('hr_payroll.ir_cron_compute_payslips')._trigger()
+
+    def _compute_sheet_isolated(self):
+        """
+        Computes the payslips one by one, so that a failing payslip does not
+        prevent the others from being computed. The errors are kept on the
+        payslips and reported on their batch.
+        """
+        errors = {}
+        for payslip in self:
+            try:
+                with self.env.cr.savepoint():
+                    payslip.compute_sheet()
+            except Exception as e:
+                errors[payslip] = str(e)
+        self.write({'queued_for_compute': False, 'compute_error': False})
+        for payslip, error in errors.items():
+            payslip.compute_error = error
+
+        failed_payslips = self.browse([payslip.id for payslip in errors])
+        for payslip_run in failed_payslips.payslip_run_id:
+            run_errors = Markup().join(
+                Markup('<li>%s: %s</li>') % (payslip.name, errors[payslip])
+                for payslip in failed_payslips if payslip.payslip_run_id == payslip_run
+            )
+            payslip_run.message_post(body=Markup('%s<ul>%s</ul>') % (
+                _('The following payslips could not be computed:'), run_errors))
+        return failed_payslips
+
     @api.model
-    def _cron_generate_pdf(self, batch_size=False):
-        payslips = self.search([
-            ('state', 'in', ['done', 'paid']),
-            ('queued_for_pdf', '=', True),
-        ])
-        if payslips:
-            BATCH_SIZE = batch_size or 50
-            payslips_batch = payslips[:BATCH_SIZE]
-            payslips_batch._generate_pdf()
-            payslips_batch.write({'queued_for_pdf': False})
-            # if necessary, retrigger the cron to generate more pdfs
-            if len(payslips) > BATCH_SIZE:
-                self.env.ref('hr_payroll.ir_cron_generate_payslip_pdfs')._trigger()
-                return True
-
-        lines = self.env['hr.payroll.employee.declaration'].search([('pdf_to_generate', '=', True)])
-        if lines:
-            BATCH_SIZE = batch_size or 30
-            lines_batch = lines[:BATCH_SIZE]
-            lines_batch._generate_pdf()
-            lines_batch.write({'pdf_to_generate': False})
-            # if necessary, retrigger the cron to generate more pdfs
-            if len(lines) > BATCH_SIZE:
-                self.env.ref('hr_payroll.ir_cron_generate_payslip_pdfs')._trigger()
-                return True
+    def _cron_compute_sheet(self, batch_size=False):
+        """
+        Computes a chunk of batch_size queued payslips, the cron is triggered
+        again for the remaining ones, so that a run does not hold the cron too
+        long.
+        """
+        batch_size = batch_size or 50
+        payslips = self.search([('queued_for_compute', '=', True)], limit=batch_size, order='id')
+        payslips._compute_sheet_isolated()
+        if self.search_count([('queued_for_compute', '=', True)], limit=1):
+            self.env.ref('hr_payroll.ir_cron_compute_payslips')._trigger()
+
+    @api.model
+    def _cron_generate_pdf(self, batch_size=False, limit=False):
+        """
+        Generates the pdfs of at most limit queued payslips, by chunks of
+        batch_size committed one after the other. The cron is triggered again
+        for the remaining payslips, so that a run does not hold the cron too
+        long.
+        """
+        batch_size = batch_size or 100
+        limit = limit or 10 * batch_size
+        auto_commit = not getattr(threading.current_thread(), 'testing', False)
+        start_time = perf_counter()
+        generated_count = 0
+        while generated_count < limit:
+            payslips = self.search([
+                ('queued_for_pdf', '=', True),
+                ('state', 'in', ['done', 'paid']),
+            ], limit=min(batch_size, limit - generated_count), order='id')
+            if not payslips:
+                break
+            payslips._generate_pdf()
+            payslips.write({'queued_for_pdf': False})
+            generated_count += len(payslips)
+            if auto_commit:
+                self.env.cr.commit()
+        if generated_count:
+            elapsed_time = perf_counter() - start_time
+            _logger.info(
+                "Generated %s payslip pdfs in %.2fs (%.2f pdfs/s)",
+                generated_count, elapsed_time, generated_count / (elapsed_time or 1))
+        if self.search_count([('queued_for_pdf', '=', True), ('state', 'in', ['done', 'paid'])], limit=1):
+            self.env.ref('hr_payroll.ir_cron_generate_payslip_pdfs')._trigger()
         return False
 
     # Payroll Dashboard
@@ -0,0 +1,90 @@
+# -*- coding:utf-8 -*-
+# Part of Odoo. See LICENSE file for full copyright and licensing details.
+
+from odoo import fields, models
+
+# fields of the payslips, payslip lines and worked days changing the aggregates of the done and paid payslips
+AGGREGATE_PAYSLIP_FIELDS = {'state', 'employee_id', 'date_from', 'date_to'}
+AGGREGATE_LINE_FIELDS = {'amount', 'quantity', 'rate', 'code', 'salary_rule_id', 'slip_id'}
+AGGREGATE_WORKED_DAYS_FIELDS = {'amount', 'work_entry_type_id', 'payslip_id'}
+
+class HrPayslipAggregate(models.Model):
+    _name = 'hr.payslip.aggregate'
+    _description = 'Payslip Aggregate'
+    _log_access = False
+
+    # Totals of the done and paid payslips, for each employee, period and code.
+    # They are maintained when payslips are created, confirmed, cancelled or
+    # moved, and when the lines of counted payslips change, and used to
+    # answer the _sum, _sum_category and _sum_worked_days payslip helpers.
+    employee_id = fields.Many2one('hr.employee', required=True, readonly=True, ondelete='cascade')
+    aggregate_type = fields.Selection([
+        ('rule', 'Salary Rule'),
+        ('category', 'Salary Rule Category'),
+        ('worked_days', 'Worked Days'),
+    ], required=True, readonly=True)
+    code = fields.Char(required=True, readonly=True)
+    date_from = fields.Date(required=True, readonly=True)
+    date_to = fields.Date(required=True, readonly=True)
+    total = fields.Float(readonly=True)
+
+    _sql_constraints = [
+        ('aggregate_key_unique', 'unique(employee_id, aggregate_type, code, date_from, date_to)',
+         'There can only be one aggregate per employee, type, code and period.'),
+    ]
+
+    def init(self):
+        super().init()
+        self.env.cr.execute("SELECT 1 FROM hr_payslip_aggregate LIMIT 1")
+        if not self.env.cr.fetchone():
+            self._refresh_aggregates()
+
+    def _refresh_aggregates(self, keys=None):
+        """
+        Recomputes the aggregates from the payslips.
+
+        :param keys: list of (employee_id, date_from, date_to) to recompute,
+            all the aggregates are recomputed if not given
+        """
+        if keys is not None and not keys:
+            return
+        self.env.flush_all()
+        where_keys = "(hp.employee_id, hp.date_from, hp.date_to) IN %(keys)s" if keys else "TRUE"
+        params = {'keys': tuple(keys or [])}
+        if keys:
+            self.env.cr.execute("""
+                DELETE FROM hr_payslip_aggregate
+                      WHERE (employee_id, date_from, date_to) IN %(keys)s
+            """, params)
+        else:
+            self.env.cr.execute("DELETE FROM hr_payslip_aggregate")
+        self.env.cr.execute(f"""
+            INSERT INTO hr_payslip_aggregate (employee_id, aggregate_type, code, date_from, date_to, total)
+                 SELECT hp.employee_id, 'rule', pl.code, hp.date_from, hp.date_to, SUM(pl.total)
+                   FROM hr_payslip hp
+                   JOIN hr_payslip_line pl ON pl.slip_id = hp.id
+                  WHERE hp.state IN ('done', 'paid')
+                    AND {where_keys}
+               GROUP BY hp.employee_id, pl.code, hp.date_from, hp.date_to
+              UNION ALL
+                 SELECT hp.employee_id, 'category', rc.code, hp.date_from, hp.date_to, SUM(pl.total)
+                   FROM hr_payslip hp
+                   JOIN hr_payslip_line pl ON pl.slip_id = hp.id
+                   JOIN hr_salary_rule_category rc ON rc.id = pl.category_id
+                  WHERE hp.state IN ('done', 'paid')
+                    AND {where_keys}
+               GROUP BY hp.employee_id, rc.code, hp.date_from, hp.date_to
+              UNION ALL
+                 SELECT hp.employee_id, 'worked_days', hwet.code, hp.date_from, hp.date_to, SUM(hwd.amount)
+                   FROM hr_payslip hp
+                   JOIN hr_payslip_worked_days hwd ON hwd.payslip_id = hp.id
+                   JOIN hr_work_entry_type hwet ON hwet.id = hwd.work_entry_type_id
+                  WHERE hp.state IN ('done', 'paid')
+                    AND hwet.code IS NOT NULL
+                    AND {where_keys}
+               GROUP BY hp.employee_id, hwet.code, hp.date_from, hp.date_to
+            -- a concurrent refresh of the same keys may have inserted them since they were deleted
+            ON CONFLICT (employee_id, aggregate_type, code, date_from, date_to)
+            DO UPDATE SET total = EXCLUDED.total
+        """, params)
+        self.invalidate_model()
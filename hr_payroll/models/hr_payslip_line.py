@@ -3,6 +3,7 @@
 
 from odoo import api, fields, models, _
 from odoo.exceptions import UserError
+from odoo.addons.hr_payroll.models.hr_payslip_aggregate import AGGREGATE_LINE_FIELDS
 
 
 class HrPayslipLine(models.Model):
@@ -51,7 +52,22 @@ class HrPayslipLine(models.Model):
                 values['contract_id'] = values.get('contract_id') or payslip.contract_id and payslip.contract_id.id
                 if not values['contract_id']:
                     raise UserError(_('You must set a contract to create a payslip line.'))
-        return super(HrPayslipLine, self).create(vals_list)
+        lines = super(HrPayslipLine, self).create(vals_list)
+        lines.slip_id._refresh_payslip_aggregates()
+        return lines
+
+    def write(self, vals):
+        payslips = self.slip_id if AGGREGATE_LINE_FIELDS & vals.keys() else None
+        res = super().write(vals)
+        if payslips is not None:
+            (payslips | self.slip_id)._refresh_payslip_aggregates()
+        return res
+
+    def unlink(self):
+        payslips = self.slip_id
+        res = super().unlink()
+        payslips.exists()._refresh_payslip_aggregates()
+        return res
 
     def get_payslip_styling_dict(self):
         return {
@@ -26,6 +26,8 @@ class HrPayslipRun(models.Model):
     date_end = fields.Date(string='Date To', required=True,
         default=lambda self: fields.Date.to_string((datetime.now() + relativedelta(months=+1, day=1, days=-1)).date()))
     payslip_count = fields.Integer(compute='_compute_payslip_count')
+    payslip_to_compute_count = fields.Integer(compute='_compute_payslip_compute_progress')
+    payslip_compute_error_count = fields.Integer(compute='_compute_payslip_compute_progress')
     company_id = fields.Many2one('res.company', string='Company', readonly=True, required=True,
         default=lambda self: self.env.company)
     country_id = fields.Many2one(
@@ -39,6 +41,17 @@ class HrPayslipRun(models.Model):
         for payslip_run in self:
             payslip_run.payslip_count = len(payslip_run.slip_ids)
 
+    def _compute_payslip_compute_progress(self):
+        to_compute = dict(self.env['hr.payslip']._read_group(
+            [('payslip_run_id', 'in', self.ids), ('queued_for_compute', '=', True)],
+            ['payslip_run_id'], ['__count']))
+        in_error = dict(self.env['hr.payslip']._read_group(
+            [('payslip_run_id', 'in', self.ids), ('compute_error', '!=', False)],
+            ['payslip_run_id'], ['__count']))
+        for payslip_run in self:
+            payslip_run.payslip_to_compute_count = to_compute.get(payslip_run, 0)
+            payslip_run.payslip_compute_error_count = in_error.get(payslip_run, 0)
+
     @api.depends('slip_ids', 'state')
     def _compute_state_change(self):
         for payslip_run in self:
@@ -62,7 +75,17 @@ class HrPayslipRun(models.Model):
         self.mapped('slip_ids').action_payslip_paid()
         self.write({'state': 'paid'})
 
+    def action_compute_sheet(self):
+        self.slip_ids.filtered(lambda slip: slip.state in ['draft', 'verify'])._queue_compute_sheet()
+
+    def action_open_payslips_in_error(self):
+        action = self.action_open_payslips()
+        action['domain'] = [('id', 'in', self.slip_ids.filtered('compute_error').ids)]
+        return action
+
     def action_validate(self):
+        if any(self.mapped('payslip_to_compute_count')):
+            raise UserError(_('You cannot validate a batch while its payslips are being computed.'))
         payslip_done_result = self.mapped('slip_ids').filtered(lambda slip: slip.state not in ['draft', 'cancel']).action_payslip_done()
         self.action_close()
         return payslip_done_result
@@ -3,6 +3,7 @@
 
 from odoo import api, fields, models, _
 from odoo.tools import float_round
+from odoo.addons.hr_payroll.models.hr_payslip_aggregate import AGGREGATE_WORKED_DAYS_FIELDS
 
 
 class HrPayslipWorkedDays(models.Model):
@@ -79,3 +80,22 @@ class HrPayslipWorkedDays(models.Model):
             else:
                 name = worked_days.work_entry_type_id.name
             worked_days.name = name + (_(' (Half-Day)') if half_day else '')
+
+    @api.model_create_multi
+    def create(self, vals_list):
+        worked_days = super().create(vals_list)
+        worked_days.payslip_id._refresh_payslip_aggregates()
+        return worked_days
+
+    def write(self, vals):
+        payslips = self.payslip_id if AGGREGATE_WORKED_DAYS_FIELDS & vals.keys() else None
+        res = super().write(vals)
+        if payslips is not None:
+            (payslips | self.payslip_id)._refresh_payslip_aggregates()
+        return res
+
+    def unlink(self):
+        payslips = self.payslip_id
+        res = super().unlink()
+        payslips.exists()._refresh_payslip_aggregates()
+        return res
@@ -2,6 +2,7 @@
 # Part of Odoo. See LICENSE file for full copyright and licensing details.
 
 import ast
+import bisect
 
 from odoo import api, fields, models, _
 from odoo.tools import ormcache
@@ -24,6 +25,23 @@ class HrSalaryRuleParameterValue(models.Model):
         ('_unique', 'unique (rule_parameter_id, date_from)', "Two rules with the same code cannot start the same day"),
     ]
 
+    @api.model_create_multi
+    def create(self, vals_list):
+        res = super().create(vals_list)
+        self.env.registry.clear_cache()
+        return res
+
+    def write(self, vals):
+        res = super().write(vals)
+        if {'rule_parameter_id', 'date_from', 'parameter_value'} & vals.keys():
+            self.env.registry.clear_cache()
+        return res
+
+    def unlink(self):
+        res = super().unlink()
+        self.env.registry.clear_cache()
+        return res
+
 
 class HrSalaryRuleParameter(models.Model):
     _name = 'hr.rule.parameter'
@@ -39,18 +57,42 @@ class HrSalaryRuleParameter(models.Model):
         ('_unique', 'unique (code)', "Two rule parameters cannot have the same code."),
     ]
 
+    def write(self, vals):
+        res = super().write(vals)
+        if {'code', 'country_id'} & vals.keys():
+            self.env.registry.clear_cache()
+        return res
+
+    def unlink(self):
+        res = super().unlink()
+        self.env.registry.clear_cache()
+        return res
+
+    @api.model
+    @ormcache('code', 'self.env.su', 'tuple(self.env.context.get("allowed_company_ids", []))')
+    def _get_parameter_versions(self, code):
+        """ Return all the versions of the parameter ``code`` visible to the current
+        companies, as a tuple of dates sorted ascending and the tuple of the matching
+        parsed values. The result is cached: the values are shared between callers and
+        must not be modified in place. Any change on the versions clears the cache of
+        every worker.
+        """
+        parameter_values = self.env['hr.rule.parameter.value'].search_read(
+            [('code', '=', code)], ['date_from', 'parameter_value'], order='date_from')
+        return (
+            tuple(pv['date_from'] for pv in parameter_values),
+            tuple(ast.literal_eval(pv['parameter_value']) for pv in parameter_values),
+        )
+
     @api.model
-    @ormcache('code', 'date', 'tuple(self.env.context.get("allowed_company_ids", []))')
     def _get_parameter_from_code(self, code, date=None, raise_if_not_found=True):
         if not date:
             date = fields.Date.today()
-        # This should be quite fast as it uses a limit and fields are indexed
-        # moreover the method is cached
-        rule_parameter = self.env['hr.rule.parameter.value'].search([
-            ('code', '=', code),
-            ('date_from', '<=', date)], limit=1)
-        if rule_parameter:
-            return ast.literal_eval(rule_parameter.parameter_value)
+        date = fields.Date.to_date(date)
+        dates, values = self._get_parameter_versions(code)
+        index = bisect.bisect_right(dates, date)
+        if index:
+            return values[index - 1]
         if raise_if_not_found:
             raise UserError(_("No rule parameter with code %r was found for %s ", code, date))
         else:
@@ -3,7 +3,29 @@
 
 from odoo import api, fields, models, _
 from odoo.exceptions import UserError
-from odoo.tools.safe_eval import safe_eval
+from odoo.tools import ormcache
+from odoo.tools.safe_eval import _BUILTINS, check_values, test_python_expr, unsafe_eval
+
+# fields holding the python expressions of the rules, compiled once by _get_compiled_code
+RULE_CODE_FIELDS = {'amount_percentage_base', 'amount_python_compute', 'condition_python', 'condition_range', 'quantity'}
+
+
+def _compile_safe_code(source, mode):
+    """
+    Compiles ``source`` once it passed the checks of safe_eval, so that it can
+    be run by _run_safe_code as safe_eval would, without being compiled again.
+    """
+    error = test_python_expr(source, mode=mode)
+    if error:
+        raise ValueError(error)
+    return compile(source, '', mode)
+
+
+def _run_safe_code(code, globals_dict):
+    check_values(globals_dict)
+    # the builtins safe_eval gives to the code it runs
+    globals_dict['__builtins__'] = dict(_BUILTINS)
+    return unsafe_eval(code, globals_dict)
 
 
 class HrSalaryRule(models.Model):
@@ -101,6 +123,27 @@ result = contract.wage * 0.10''')
             self.code,
             e))
 
+    @ormcache('self.id', 'field_name', 'mode')
+    def _get_compiled_code(self, field_name, mode):
+        """
+        Validates and compiles an expression of the rule. The compiled code is
+        cached until the expressions of the rules are written, so that
+        computing a batch of payslips does not parse the same source for every
+        payslip.
+        """
+        self.ensure_one()
+        return _compile_safe_code(self[field_name] or '', mode)
+
+    def _eval_code(self, field_name, localdict, mode='eval'):
+        """
+        Same as safe_eval, but on the cached code of the rule expression. Like
+        safe_eval, the local dict is copied unless the code is executed.
+        """
+        self.ensure_one()
+        code = self._get_compiled_code(field_name, mode)
+        globals_dict = localdict if mode == 'exec' else dict(localdict)
+        return _run_safe_code(code, globals_dict)
+
     def _compute_rule(self, localdict):
 
         """
@@ -112,19 +155,19 @@ result = contract.wage * 0.10''')
         localdict['localdict'] = localdict
         if self.amount_select == 'fix':
             try:
-                return self.amount_fix or 0.0, float(safe_eval(self.quantity, localdict)), 100.0
+                return self.amount_fix or 0.0, float(self._eval_code('quantity', localdict)), 100.0
             except Exception as e:
                 self._raise_error(localdict, _("Wrong quantity defined for:"), e)
         if self.amount_select == 'percentage':
             try:
-                return (float(safe_eval(self.amount_percentage_base, localdict)),
-                        float(safe_eval(self.quantity, localdict)),
+                return (float(self._eval_code('amount_percentage_base', localdict)),
+                        float(self._eval_code('quantity', localdict)),
                         self.amount_percentage or 0.0)
             except Exception as e:
                 self._raise_error(localdict, _("Wrong percentage base or quantity defined for:"), e)
         else:  # python code
             try:
-                safe_eval(self.amount_python_compute or 0.0, localdict, mode='exec', nocopy=True)
+                self._eval_code('amount_python_compute', localdict, mode='exec')
                 return float(localdict['result']), localdict.get('result_qty', 1.0), localdict.get('result_rate', 100.0)
             except Exception as e:
                 self._raise_error(localdict, _("Wrong python code defined for:"), e)
@@ -136,13 +179,13 @@ result = contract.wage * 0.10''')
             return True
         if self.condition_select == 'range':
             try:
-                result = safe_eval(self.condition_range, localdict)
+                result = self._eval_code('condition_range', localdict)
                 return self.condition_range_min <= result <= self.condition_range_max
             except Exception as e:
                 self._raise_error(localdict, _("Wrong range condition defined for:"), e)
         else:  # python code
             try:
-                safe_eval(self.condition_python, localdict, mode='exec', nocopy=True)
+                self._eval_code('condition_python', localdict, mode='exec')
                 return localdict.get('result', False)
             except Exception as e:
                 self._raise_error(localdict, _("Wrong python condition defined for:"), e)
@@ -196,7 +239,15 @@ result = contract.wage * 0.10''')
         return rules
 
     def write(self, vals):
+        # only the expressions actually changed discard the compiled code
+        clear_cache = any(
+            rule[field_name] != vals[field_name]
+            for rule in self
+            for field_name in RULE_CODE_FIELDS & vals.keys()
+        )
         res = super().write(vals)
+        if clear_cache:
+            self.env.registry.clear_cache()
         if 'appears_on_payroll_report' in vals:
             if vals['appears_on_payroll_report']:
                 self._generate_payroll_report_fields()
@@ -1,9 +1,13 @@
 # # -*- coding: utf-8 -*-
 # Part of Odoo. See LICENSE file for full copyright and licensing details.
 
+import io
+from unittest.mock import patch
+
 from dateutil.rrule import rrule, DAILY
 from datetime import datetime, date, timedelta
 from dateutil.relativedelta import relativedelta
+from odoo import Command
 from odoo.fields import Date
 from odoo.tests import tagged
 from odoo.addons.hr_payroll.tests.common import TestPayslipContractBase
@@ -216,6 +220,62 @@ class TestPayslipComputation(TestPayslipContractBase):
         self.richard_payslip2.compute_sheet()
         self.assertEqual(3010.13, self.richard_payslip2.line_ids.filtered(lambda x: x.code == 'SUMALW').total)
 
+    def test_sum_follows_payslip_state(self):
+        self.richard_payslip.compute_sheet()
+        alw_total = sum(self.richard_payslip.line_ids.filtered(lambda l: l.category_id.code == 'ALW').mapped('total'))
+        ca_total = self.richard_payslip.line_ids.filtered(lambda l: l.code == 'CA').total
+        date_from, date_to = self.richard_payslip.date_from, self.richard_payslip.date_to
+        self.assertEqual(self.richard_payslip._sum_category('ALW', date_from, date_to), 0)
+
+        self.richard_payslip.action_payslip_done()
+        self.assertAlmostEqual(self.richard_payslip._sum_category('ALW', date_from, date_to), alw_total, places=2)
+        self.assertAlmostEqual(self.richard_payslip._sum('CA', date_from, date_to), ca_total, places=2)
+        self.assertEqual(self.richard_payslip._sum('CA', date_from + relativedelta(days=1), date_to), 0)
+
+        # the prefetched aggregates give the same results
+        aggregates = self.richard_payslip._prefetch_payslip_aggregates()
+        prefetched_payslip = self.richard_payslip.with_context(payslip_aggregates=aggregates)
+        with self.assertQueryCount(0):
+            self.assertAlmostEqual(prefetched_payslip._sum_category('ALW', date_from, date_to), alw_total, places=2)
+            self.assertAlmostEqual(prefetched_payslip._sum('CA', date_from, date_to), ca_total, places=2)
+
+        self.richard_payslip.action_payslip_cancel()
+        self.assertEqual(self.richard_payslip._sum_category('ALW', date_from, date_to), 0)
+
+    def test_sum_follows_counted_payslip_changes(self):
+        self.richard_payslip.compute_sheet()
+        self.richard_payslip.action_payslip_done()
+        date_from, date_to = self.richard_payslip.date_from, self.richard_payslip.date_to
+        ca_line = self.richard_payslip.line_ids.filtered(lambda l: l.code == 'CA')
+
+        # lines of a counted payslip
+        ca_line.amount += 100
+        self.assertAlmostEqual(self.richard_payslip._sum('CA', date_from, date_to), ca_line.total, places=2)
+
+        # payslip moved to another period
+        next_date_from, next_date_to = date_from + relativedelta(months=1), date_to + relativedelta(months=1)
+        self.richard_payslip.write({'date_from': next_date_from, 'date_to': next_date_to})
+        self.assertEqual(self.richard_payslip._sum('CA', date_from, date_to), 0)
+        self.assertAlmostEqual(self.richard_payslip._sum('CA', next_date_from, next_date_to), ca_line.total, places=2)
+
+        # payslip created as done, e.g. imported from another software
+        self.env['hr.payslip'].create({
+            'name': 'Imported Payslip of Richard',
+            'employee_id': self.richard_emp.id,
+            'contract_id': self.contract_cdi.id,
+            'struct_id': self.developer_pay_structure.id,
+            'date_from': date_from,
+            'date_to': date_to,
+            'state': 'done',
+            'line_ids': [Command.create({
+                'name': ca_line.name,
+                'code': ca_line.code,
+                'salary_rule_id': ca_line.salary_rule_id.id,
+                'amount': 250,
+            })],
+        })
+        self.assertAlmostEqual(self.richard_payslip._sum('CA', date_from, date_to), 250, places=2)
+
     def test_payslip_generation_with_extra_work(self):
         # /!\ this is in the weekend (Sunday) => no calendar attendance at this time
         start = datetime(2015, 11, 1, 10, 0, 0)
@@ -365,3 +425,132 @@ class TestPayslipComputation(TestPayslipContractBase):
         payslip.compute_sheet()
         lines = payslip.line_ids
         self.assertEqual(len(lines.filtered(lambda r: r.code == 'BASIC')), 1)
+
+    def test_batch_computation_isolates_failures(self):
+        payslip_run = self.env['hr.payslip.run'].create({
+            'name': 'January 2016',
+            'date_start': date(2016, 1, 1),
+            'date_end': date(2016, 1, 31),
+        })
+        broken_payslip = self.env['hr.payslip'].create({
+            'name': 'Broken Payslip',
+            'employee_id': self.richard_emp.id,
+            'contract_id': self.contract_cdi.id,
+            'struct_id': self.developer_pay_structure.id,
+            'payslip_run_id': payslip_run.id,
+            'date_from': date(2016, 1, 1),
+            'date_to': date(2016, 1, 31),
+        })
+        self.richard_payslip.payslip_run_id = payslip_run
+        self.env['hr.salary.rule'].create({
+            'name': 'Broken Rule',
+            'sequence': 1,
+            'amount_select': 'code',
+            'amount_python_compute': "result = 1 / 0 if payslip.name == 'Broken Payslip' else 1",
+            'code': 'BROKEN',
+            'category_id': self.env.ref('hr_payroll.ALW').id,
+            'struct_id': self.developer_pay_structure.id,
+        })
+
+        payslip_run.action_compute_sheet()
+        self.assertEqual(payslip_run.payslip_to_compute_count, 2)
+        self.env['hr.payslip']._cron_compute_sheet()
+        payslip_run.invalidate_recordset(['payslip_to_compute_count', 'payslip_compute_error_count'])
+
+        self.assertEqual(payslip_run.payslip_to_compute_count, 0)
+        self.assertEqual(payslip_run.payslip_compute_error_count, 1)
+        self.assertTrue(self.richard_payslip.line_ids, "The valid payslip should be computed")
+        self.assertFalse(self.richard_payslip.compute_error)
+        self.assertFalse(broken_payslip.line_ids, "The failing payslip should not be computed")
+        self.assertTrue(broken_payslip.compute_error)
+        self.assertIn('Broken Payslip', payslip_run.message_ids[0].body)
+
+    def test_queued_compute_is_chunked(self):
+        payslips = self.richard_payslip + self.richard_payslip.copy({
+            'date_from': date(2016, 2, 1),
+            'date_to': date(2016, 2, 29),
+        })
+        payslips._queue_compute_sheet()
+        cron = self.env.ref('hr_payroll.ir_cron_compute_payslips')
+        trigger_domain = [('cron_id', '=', cron.id)]
+        trigger_count = self.env['ir.cron.trigger'].search_count(trigger_domain)
+
+        self.env['hr.payslip']._cron_compute_sheet(batch_size=1)
+        self.assertEqual(payslips.mapped('queued_for_compute'), [False, True])
+        self.assertEqual(self.env['ir.cron.trigger'].search_count(trigger_domain), trigger_count + 1)
+
+        self.env['hr.payslip']._cron_compute_sheet(batch_size=1)
+        self.assertFalse(any(payslips.mapped('queued_for_compute')))
+        self.assertTrue(all(payslip.line_ids for payslip in payslips))
+        self.assertEqual(self.env['ir.cron.trigger'].search_count(trigger_domain), trigger_count + 1)
+
+    def test_queued_pdf_generation(self):
+        self.richard_payslip.compute_sheet()
+        self.richard_payslip.with_context(payslip_generate_pdf=True).action_payslip_done()
+        self.assertTrue(self.richard_payslip.queued_for_pdf)
+
+        self.env['hr.payslip']._cron_generate_pdf()
+        self.assertFalse(self.richard_payslip.queued_for_pdf)
+        attachments = self.env['ir.attachment'].search([
+            ('res_model', '=', 'hr.payslip'),
+            ('res_id', '=', self.richard_payslip.id),
+        ])
+        self.assertEqual(len(attachments), 1)
+
+    def test_queued_pdf_generation_is_capped(self):
+        payslips = self.richard_payslip + self.richard_payslip.copy({
+            'date_from': date(2016, 2, 1),
+            'date_to': date(2016, 2, 29),
+        })
+        payslips.compute_sheet()
+        payslips.with_context(payslip_generate_pdf=True).action_payslip_done()
+        cron = self.env.ref('hr_payroll.ir_cron_generate_payslip_pdfs')
+        trigger_domain = [('cron_id', '=', cron.id)]
+        trigger_count = self.env['ir.cron.trigger'].search_count(trigger_domain)
+
+        self.env['hr.payslip']._cron_generate_pdf(batch_size=1, limit=1)
+        self.assertEqual(payslips.mapped('queued_for_pdf'), [False, True])
+        self.assertEqual(self.env['ir.cron.trigger'].search_count(trigger_domain), trigger_count + 1)
+
+        self.env['hr.payslip']._cron_generate_pdf(batch_size=1, limit=1)
+        self.assertFalse(any(payslips.mapped('queued_for_pdf')))
+        self.assertEqual(self.env['ir.cron.trigger'].search_count(trigger_domain), trigger_count + 1)
+
+    def test_pdf_contents_from_streams(self):
+        payslips = self.richard_payslip + self.richard_payslip.copy()
+        streams = {
+            payslip.id: {'stream': io.BytesIO(b'pdf %s' % str(payslip.id).encode()), 'attachment': None}
+            for payslip in payslips
+        }
+        pdf_contents = payslips._get_pdf_contents_from_streams(streams)
+        self.assertEqual(pdf_contents, {
+            payslip.id: b'pdf %s' % str(payslip.id).encode()
+            for payslip in payslips
+        })
+        self.assertTrue(all(stream_data['stream'].closed for stream_data in streams.values()))
+
+        # the document could not be split on its outlines
+        full_stream = io.BytesIO(b'pdf')
+        streams = {
+            False: {'stream': full_stream, 'attachment': None},
+            **{payslip.id: {'stream': None, 'attachment': None} for payslip in payslips},
+        }
+        self.assertIsNone(payslips._get_pdf_contents_from_streams(streams))
+        self.assertTrue(full_stream.closed)
+
+    def test_render_pdfs_falls_back_on_unsplit_document(self):
+        payslips = self.richard_payslip + self.richard_payslip.copy()
+        report = self.env.ref('hr_payroll.action_report_payslip')
+        streams = {
+            False: {'stream': io.BytesIO(b'pdf'), 'attachment': None},
+            **{payslip.id: {'stream': None, 'attachment': None} for payslip in payslips},
+        }
+        IrActionsReport = type(self.env['ir.actions.report'])
+        with patch.object(IrActionsReport, '_render_qweb_pdf_prepare_streams', return_value=streams), \
+                patch.object(IrActionsReport, '_render_qweb_pdf', side_effect=lambda report, res_id: (b'pdf %s' % str(res_id).encode(), 'pdf')) as render:
+            pdf_contents = payslips.with_context(force_report_rendering=True)._render_pdfs(report)
+        self.assertEqual(render.call_count, 2)
+        self.assertEqual(pdf_contents, {
+            payslip.id: b'pdf %s' % str(payslip.id).encode()
+            for payslip in payslips
+        })
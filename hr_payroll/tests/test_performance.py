@@ -1,10 +1,16 @@
 # -*- coding: utf-8 -*-
 # Part of Odoo. See LICENSE file for full copyright and licensing details.
+import logging
+import time
 from datetime import date, datetime
+from unittest.mock import patch
 
+from odoo.addons.hr_payroll.models import hr_salary_rule
 from odoo.addons.hr_payroll.tests.common import TestPayslipBase
 from odoo.tests.common import users, warmup, tagged
 
+_logger = logging.getLogger(__name__)
+
 
 @tagged('payslip_perf')
 class TestPayrollPerformance(TestPayslipBase):
@@ -85,3 +91,52 @@ class TestPayrollPerformance(TestPayslipBase):
         with self.assertQueryCount(__system__=0, admin=0):  # already cached from warmup
             self.env['hr.rule.parameter']._get_parameter_from_code('test_parameter_cache')
         parameter.unlink()
+
+    def test_salary_rule_compiled_once(self):
+        payslips = self.env['hr.payslip'].create([{
+            'name': 'Payslip of %s' % employee.name,
+            'employee_id': employee.id,
+            'contract_id': employee.contract_id.id,
+            'struct_id': self.developer_pay_structure.id,
+            'date_from': date(2018, 1, 1),
+            'date_to': date(2018, 1, 31),
+        } for employee in self.employees])
+        self.env.registry.clear_cache()
+
+        with patch.object(hr_salary_rule, '_compile_safe_code', wraps=hr_salary_rule._compile_safe_code) as compile_mock:
+            payslips[0].compute_sheet()
+            compile_count = compile_mock.call_count
+            payslips[1].compute_sheet()
+            self.assertEqual(compile_mock.call_count, compile_count, "Rules should only be compiled once")
+
+            # written in the same transaction as the rule creation, the new expression must be used anyway
+            self.mv_rule.quantity = '2.0'
+            payslips[1].compute_sheet()
+            self.assertGreater(compile_mock.call_count, compile_count, "Written rules should be compiled again")
+            self.assertIn(('2.0', 'eval'), [call.args for call in compile_mock.call_args_list])
+
+            compile_count = compile_mock.call_count
+            self.mv_rule.write({'quantity': '2.0', 'sequence': self.mv_rule.sequence + 1})
+            payslips[1].compute_sheet()
+            self.assertEqual(compile_mock.call_count, compile_count, "Unchanged expressions should not be compiled again")
+        self.assertEqual(payslips[1].line_ids.filtered(lambda l: l.code == 'MA').quantity, 2.0)
+
+    def test_performance_salary_rules_per_second(self):
+        """ Rules computed per second, for each structure """
+        payslips = self.env['hr.payslip'].create([{
+            'name': 'Payslip of %s' % employee.name,
+            'employee_id': employee.id,
+            'contract_id': employee.contract_id.id,
+            'struct_id': self.developer_pay_structure.id,
+            'date_from': date(2018, 1, 1),
+            'date_to': date(2018, 1, 31),
+        } for employee in self.employees for dummy in range(25)])
+
+        for structure in payslips.struct_id:
+            structure_payslips = payslips.filtered(lambda p: p.struct_id == structure)
+            start = time.time()
+            lines = structure_payslips._get_payslip_lines()
+            elapsed = time.time() - start
+            rule_count = len(structure.rule_ids) * len(structure_payslips)
+            _logger.info("Structure %s: %s rules in %.3fs (%.0f rules/s, %s lines)",
+                structure.name, rule_count, elapsed, rule_count / (elapsed or 1e-6), len(lines))
@@ -80,3 +80,20 @@ class TestRuleParameter(TransactionCase):
             # Read a BE parameter from FR company
             # Value should not come from cache, access rights should be checked
             self.env['hr.rule.parameter'].with_user(user).with_company(company_2)._get_parameter_from_code('test_parameter')
+
+    def test_cache_follows_versions(self):
+        RuleParameter = self.env['hr.rule.parameter']
+        self.assertEqual(RuleParameter._get_parameter_from_code('test_param', date=date(2016, 6, 1)), 2016)
+        with self.assertQueryCount(0):
+            self.assertEqual(RuleParameter._get_parameter_from_code('test_param', date=date(2018, 6, 1)), 2018)
+            self.assertEqual(RuleParameter._get_parameter_from_code('test_param', date=date(2020, 1, 1)), 2020)
+
+        self.rule_parameter.parameter_version_ids.filtered(lambda v: v.date_from == date(2018, 1, 1)).parameter_value = '[2018]'
+        self.assertEqual(RuleParameter._get_parameter_from_code('test_param', date=date(2018, 6, 1)), [2018])
+
+        self.env['hr.rule.parameter.value'].create({
+            'rule_parameter_id': self.rule_parameter.id,
+            'parameter_value': '2019',
+            'date_from': date(2019, 1, 1),
+        })
+        self.assertEqual(RuleParameter._get_parameter_from_code('test_param', date=date(2019, 6, 1)), 2019)
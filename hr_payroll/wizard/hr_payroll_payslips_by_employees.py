@@ -144,7 +144,12 @@ class HrPayslipEmployees(models.TransientModel):
             payslips_vals.append(values)
         payslips = Payslip.with_context(tracking_disable=True).create(payslips_vals)
         payslips._compute_name()
-        payslips.compute_sheet()
+        # large batches are computed in the background, by chunks committed separately
+        background_threshold = int(self.env['ir.config_parameter'].sudo().get_param('hr_payroll.payslip_compute_background_threshold', 500))
+        if len(payslips) > background_threshold:
+            payslips._queue_compute_sheet()
+        else:
+            payslips.compute_sheet()
         payslip_run.state = 'verify'
 
         return success_result
@@ -39,6 +39,10 @@ class MarketingActivity(models.Model):
     server_action_id = fields.Many2one(
         'ir.actions.server', string='Server Action', compute='_compute_server_action_id',
         readonly=False, store=True)
+    server_action_batch = fields.Boolean(
+        'Run in Batch',
+        help='Run the server action once on all the records of a batch instead of once per record. '
+             'Only enable it if the action handles several records, e.g. a code action looping on "records".')
     campaign_id = fields.Many2one(
         'marketing.campaign', string='Campaign',
         index=True, ondelete='cascade', required=True)
@@ -356,11 +360,14 @@ class MarketingActivity(models.Model):
             rec_domain = literal_eval(self.campaign_id.domain or '[]')
         if rec_domain:
             user_id = self.campaign_id.user_id or self.env.user
-            rec_valid = self.env[self.model_name].with_context(lang=user_id.lang).search(rec_domain)
-            rec_ids_domain = rec_valid.ids
+            # only evaluate the filter on the records of the batch
+            rec_valid = self.env[self.model_name].with_context(lang=user_id.lang).search(
+                expression.AND([rec_domain, [('id', 'in', list(set(traces.mapped('res_id'))))]])
+            )
+            rec_ids_domain = set(rec_valid.ids)
 
             traces_allowed = traces.filtered(lambda trace: trace.res_id in rec_ids_domain)
-            traces_rejected = traces.filtered(lambda trace: trace.res_id not in rec_ids_domain)  # either rejected, either deleted record
+            traces_rejected = traces - traces_allowed  # either rejected, either deleted record
         else:
             traces_allowed = traces
             traces_rejected = self.env['marketing.trace']
@@ -384,6 +391,39 @@ class MarketingActivity(models.Model):
         if not self.server_action_id:
             return False
 
+        if self.server_action_batch:
+            # Run the server action once on all the records of the batch. If it
+            # fails, run it again for each trace separately so that a single
+            # faulty record does not prevent the other ones from being processed.
+            try:
+                with self.env.cr.savepoint():
+                    self.server_action_id.with_context(
+                        active_model=self.model_name,
+                        active_ids=list(dict.fromkeys(traces.mapped('res_id'))),
+                        active_id=traces[:1].res_id,
+                    ).run()
+            except Exception as e:
+                _logger.info('Marketing Automation: activity <%s> server action failed on a batch of %s traces, running it trace by trace: %s',
+                             self.id, len(traces), e)
+                traces_ok = self._execute_action_per_trace(traces)
+            else:
+                traces_ok = traces
+        else:
+            traces_ok = self._execute_action_per_trace(traces)
+
+        # Update status
+        traces_ok.write({
+            'state': 'processed',
+            'schedule_date': Datetime.now(),
+        })
+        return True
+
+    def _execute_action_per_trace(self, traces):
+        """ Run the server action separately for each trace, storing errors on
+        the failing ones.
+
+        :return: traces on which the server action succeeded
+        """
         # Do a loop here because we have to try / catch each execution separately to ensure other traces are executed
         # and proper state message stored
         traces_ok = self.env['marketing.trace']
@@ -394,7 +434,8 @@ class MarketingActivity(models.Model):
                 active_id=trace.res_id,
             )
             try:
-                action.run()
+                with self.env.cr.savepoint():
+                    action.run()
             except Exception as e:
                 _logger.warning('Marketing Automation: activity <%s> encountered server action issue %s', self.id, str(e), exc_info=True)
                 trace.write({
@@ -404,13 +445,7 @@ class MarketingActivity(models.Model):
                 })
             else:
                 traces_ok += trace
-
-        # Update status
-        traces_ok.write({
-            'state': 'processed',
-            'schedule_date': Datetime.now(),
-        })
-        return True
+        return traces_ok
 
     def _execute_email(self, traces):
         # we only allow to continue if the user has sufficient rights, as a sudo() follows
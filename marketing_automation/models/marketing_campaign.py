@@ -10,7 +10,7 @@ from dateutil.relativedelta import relativedelta
 from odoo import api, fields, models, tools, _
 from odoo.fields import Datetime
 from odoo.exceptions import ValidationError
-from odoo.tools import convert
+from odoo.tools import SQL, convert
 
 
 class MarketingCampaign(models.Model):
@@ -331,11 +331,9 @@ class MarketingCampaign(models.Model):
 
     def sync_participants(self):
         """ Creates new participants, taking into account already-existing ones
-        as well as campaign filter and unique field. """
-        def _uniquify_list(seq):
-            seen = set()
-            return [x for x in seq if x not in seen and not seen.add(x)]
-
+        as well as campaign filter and unique field. Records to add and
+        participants to remove are found with anti-joins in SQL, so that the
+        cost does not grow with the square of the campaign size. """
         participants = self.env['marketing.participant']
         now = self.env.cr.now()
         # auto-commit except in testing mode
@@ -346,58 +344,114 @@ class MarketingCampaign(models.Model):
 
             user_id = campaign.user_id or self.env.user
             RecordModel = self.env[campaign.model_name].with_context(lang=user_id.lang)
-
-            # Fetch existing participants
-            participants_data = participants.search_read([('campaign_id', '=', campaign.id)], ['res_id'])
-            existing_rec_ids = _uniquify_list([live_participant['res_id'] for live_participant in participants_data])
-
             record_domain = literal_eval(campaign.domain or "[]")
-            db_rec_ids = _uniquify_list(RecordModel.search(record_domain).ids)
-            to_create = [rid for rid in db_rec_ids if rid not in existing_rec_ids]  # keep ordered IDs
-            to_remove = set(existing_rec_ids) - set(db_rec_ids)
-            unique_field = campaign.unique_field_id.sudo()
-            if unique_field.name != 'id':
-                without_duplicates = []
-                existing_records = RecordModel.with_context(prefetch_fields=False).browse(existing_rec_ids).exists()
-                # Split the read in batch of 1000 to avoid the prefetch
-                # crawling the cache for the next 1000 records to fetch
-                unique_field_vals = {rec[unique_field.name]
-                                        for index in range(0, len(existing_records), 1000)
-                                        for rec in existing_records[index:index+1000]}
-
-                for rec in RecordModel.with_context(prefetch_fields=False).browse(to_create):
-                    field_val = rec[unique_field.name]
-                    # we exclude the empty recordset with the first condition
-                    if (not unique_field.relation or field_val) and field_val not in unique_field_vals:
-                        without_duplicates.append(rec.id)
-                        unique_field_vals.add(field_val)
-                to_create = without_duplicates
-
-            BATCH_SIZE = 100
+            records_query = RecordModel._search(record_domain)
+
+            BATCH_SIZE = 1000
+            to_create = campaign._get_sync_res_ids_to_create(RecordModel, records_query)
             for to_create_batch in tools.split_every(BATCH_SIZE, to_create, piece_maker=list):
-                participants += participants.create([{
-                    'campaign_id': campaign.id,
-                    'res_id': rec_id,
-                } for rec_id in to_create_batch])
+                participants += participants._create_for_campaign(campaign, to_create_batch)
 
                 if auto_commit:
                     self.env.cr.commit()
 
-            if to_remove:
-                participants_to_unlink = participants.search([
-                    ('res_id', 'in', list(to_remove)),
-                    ('campaign_id', '=', campaign.id),
-                    ('state', '!=', 'unlinked'),
-                ])
-                for index in range(0, len(participants_to_unlink), 1000):
-                    participants_to_unlink[index:index+1000].action_set_unlink()
-                    # Commit only every 100 operation to avoid committing to often
-                    # this mean every 10k record. It should be ok, it takes 1sec second to process 10k
-                    if not index % (BATCH_SIZE * 100):
-                        self.env.cr.commit()
+            self.env.flush_all()
+            self.env.cr.execute(SQL(
+                """SELECT participant.id
+                     FROM marketing_participant participant
+                    WHERE participant.campaign_id = %s
+                      AND participant.state != 'unlinked'
+                      AND NOT EXISTS (SELECT FROM %s AS record(id) WHERE record.id = participant.res_id)
+                 ORDER BY participant.id""",
+                campaign.id, records_query.subselect(),
+            ))
+            participants_to_unlink = participants.browse([row[0] for row in self.env.cr.fetchall()])
+            for index in range(0, len(participants_to_unlink), BATCH_SIZE):
+                participants_to_unlink[index:index + BATCH_SIZE].action_set_unlink()
+                # Commit only every 10 operations to avoid committing to often
+                # this mean every 10k record. It should be ok, it takes 1sec second to process 10k
+                if auto_commit and not index % (BATCH_SIZE * 10):
+                    self.env.cr.commit()
 
         return participants
 
+    def _get_sync_res_ids_to_create(self, RecordModel, records_query):
+        """ IDs of the records matching the campaign filter that are not yet
+        participating, ordered by ID. Records having the same value of the
+        unique field than another participant, or than a record with a lower
+        ID, are skipped. Stored fields are deduplicated in SQL with DISTINCT ON,
+        other fields are read in batches.
+
+        :param RecordModel: model of the campaign, in the language of its responsible;
+        :param records_query: Query of the records matching the campaign filter;
+        :return list: IDs of the records to add as participants
+        """
+        self.ensure_one()
+        self.env.flush_all()
+        table = SQL.identifier(RecordModel._table)
+        conditions = [
+            SQL("record.id IN %s", records_query.subselect()),
+            SQL("""NOT EXISTS (SELECT FROM marketing_participant participant
+                                WHERE participant.campaign_id = %s AND participant.res_id = record.id)""", self.id),
+        ]
+        unique_field = self.unique_field_id.sudo()
+        field = RecordModel._fields.get(unique_field.name) if unique_field.name != 'id' else None
+        if not field or not (field.store and field.column_type) or field.translate:
+            self.env.cr.execute(SQL(
+                "SELECT record.id FROM %s record WHERE %s ORDER BY record.id",
+                table, SQL(" AND ".join(["%s"] * len(conditions)), *conditions),
+            ))
+            res_ids = [row[0] for row in self.env.cr.fetchall()]
+            return self._filter_sync_res_ids_unique(RecordModel, res_ids) if field else res_ids
+
+        column = SQL.identifier('record', field.name)
+        existing_column = SQL.identifier('existing', field.name)
+        existing_records = SQL(
+            """SELECT FROM marketing_participant participant
+                 JOIN %s existing ON existing.id = participant.res_id
+                WHERE participant.campaign_id = %s""",
+            table, self.id,
+        )
+        conditions.append(SQL("NOT EXISTS (%s AND %s = %s)", existing_records, existing_column, column))
+        if field.relational:
+            # empty relations are never considered as duplicates of each other
+            conditions.append(SQL("%s IS NOT NULL", column))
+        else:
+            conditions.append(SQL("(%s IS NOT NULL OR NOT EXISTS (%s AND %s IS NULL))", column, existing_records, existing_column))
+        self.env.cr.execute(SQL(
+            """SELECT unique_record.id
+                 FROM (SELECT DISTINCT ON (%s) record.id
+                         FROM %s record
+                        WHERE %s
+                     ORDER BY %s, record.id) AS unique_record
+             ORDER BY unique_record.id""",
+            column, table, SQL(" AND ".join(["%s"] * len(conditions)), *conditions), column,
+        ))
+        return [row[0] for row in self.env.cr.fetchall()]
+
+    def _filter_sync_res_ids_unique(self, RecordModel, res_ids):
+        """ Fallback of ``_get_sync_res_ids_to_create`` for unique fields that
+        have no column to compare in SQL. """
+        unique_field = self.unique_field_id.sudo()
+        existing_rec_ids = self.env['marketing.participant'].search([('campaign_id', '=', self.id)]).mapped('res_id')
+        existing_records = RecordModel.with_context(prefetch_fields=False).browse(set(existing_rec_ids)).exists()
+        # Split the read in batch of 1000 to avoid the prefetch
+        # crawling the cache for the next 1000 records to fetch
+        unique_field_vals = {rec[unique_field.name]
+                             for index in range(0, len(existing_records), 1000)
+                             for rec in existing_records[index:index+1000]}
+
+        without_duplicates = []
+        records = RecordModel.with_context(prefetch_fields=False).browse(res_ids)
+        for index in range(0, len(records), 1000):
+            for rec in records[index:index+1000]:
+                field_val = rec[unique_field.name]
+                # we exclude the empty recordset with the first condition
+                if (not unique_field.relation or field_val) and field_val not in unique_field_vals:
+                    without_duplicates.append(rec.id)
+                    unique_field_vals.add(field_val)
+        return without_duplicates
+
     def execute_activities(self):
         for campaign in self:
             campaign.marketing_activity_ids.execute()
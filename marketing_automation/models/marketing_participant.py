@@ -6,6 +6,7 @@ from dateutil.relativedelta import relativedelta
 from odoo import api, fields, models, _
 from odoo.fields import Datetime
 from odoo.osv.expression import NEGATIVE_TERM_OPERATORS
+from odoo.tools import SQL
 
 
 class MarketingParticipant(models.Model):
@@ -112,6 +113,63 @@ class MarketingParticipant(models.Model):
 
         return participants
 
+    @api.model
+    def _create_for_campaign(self, campaign, res_ids):
+        """ Bulk counterpart of ``create`` used to synchronize campaigns: insert
+        the participants of the given records, and the traces of the beginning
+        activities of the campaign, with one query per table instead of going
+        through the ORM record by record.
+
+        :param campaign: marketing.campaign the participants belong to;
+        :param list res_ids: IDs of the records to add, in creation order;
+        :return: the created participants
+        """
+        if not res_ids:
+            return self
+        self.check_access_rights('create')
+        self.env['marketing.participant'].flush_model()
+        self.env['marketing.trace'].flush_model()
+        create_date = self.env.cr.now()
+        self.env.cr.execute(SQL(
+            """INSERT INTO marketing_participant
+                          (campaign_id, model_id, model_name, res_id, state, is_test,
+                           create_uid, create_date, write_uid, write_date)
+                   SELECT %s, %s, %s, record.res_id, 'running', FALSE, %s, %s, %s, %s
+                     FROM unnest(%s) WITH ORDINALITY AS record(res_id, sequence)
+                 ORDER BY record.sequence
+                RETURNING id""",
+            campaign.id, campaign.model_id.id, campaign.model_name, self.env.uid, create_date,
+            self.env.uid, create_date, list(res_ids),
+        ))
+        participants = self.browse(sorted(row[0] for row in self.env.cr.fetchall()))
+
+        # prepare first traces related to begin activities
+        now = Datetime.now()
+        cron_trigger_dates = set()
+        for activity in campaign.marketing_activity_ids.filtered(lambda act: act.trigger_type == 'begin'):
+            schedule_date = now + relativedelta(**{activity.interval_type: activity.interval_number})
+            self.env.cr.execute(SQL(
+                """INSERT INTO marketing_trace
+                              (participant_id, res_id, is_test, activity_id, state, schedule_date,
+                               create_uid, create_date, write_uid, write_date)
+                       SELECT participant.id, participant.res_id, FALSE, %s, 'scheduled', %s, %s, %s, %s, %s
+                         FROM marketing_participant participant
+                        WHERE participant.id = ANY(%s)
+                     ORDER BY participant.id""",
+                activity.id, schedule_date, self.env.uid, create_date, self.env.uid, create_date, participants.ids,
+            ))
+            cron_trigger_dates.add(schedule_date)
+
+        # the caches of the campaign and its activities do not know the new rows
+        campaign.invalidate_recordset()
+        campaign.marketing_activity_ids.invalidate_recordset()
+
+        if cron_trigger_dates:
+            cron = self.env.ref('marketing_automation.ir_cron_campaign_execute_activities')
+            cron._trigger(cron_trigger_dates)
+
+        return participants
+
     def action_set_completed(self):
         ''' Manually mark as a completed and cancel every scheduled trace '''
         # TDE TODO: delegate set Canceled to trace record
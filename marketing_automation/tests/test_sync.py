@@ -305,6 +305,43 @@ class TestSyncing(SyncingCase):
         # should not generate traces for other activities
         self.assertActivityWoTrace(self.activity_2)
 
+    @users('user_marketing_automation')
+    def test_campaign_sync_participants_incremental(self):
+        """ Test that a new 'sync_participants' only adds the new records, skips
+        duplicates on the unique field and removes records leaving the filter. """
+        campaign = self.campaign.with_env(self.env)
+        campaign.unique_field_id = self.env['ir.model.fields'].sudo()._get('mailing.contact', 'email')
+        with self.mock_datetime_and_now(self.date_reference):
+            campaign.sync_participants()
+        self.assertEqual(campaign.participant_ids.mapped('res_id'), self.test_contacts.ids)
+
+        new_contacts = self.env['mailing.contact'].create([
+            {'email': 'ma.test.new.1@example.com', 'name': 'MATest_new_1'},
+            {'email': 'ma.test.new.1@example.com', 'name': 'MATest_new_1_dupe'},
+            {'email': self.test_contacts[0].email, 'name': 'MATest_new_2_dupe'},
+        ])
+        self.test_contacts[1].sudo().name = 'Left campaign'
+        with self.mock_datetime_and_now(self.date_reference + timedelta(hours=1)):
+            new_participants = campaign.sync_participants()
+
+        self.assertEqual(new_participants.mapped('res_id'), new_contacts[0].ids)
+        self.assertEqual(campaign.participant_ids.mapped('res_id'), (self.test_contacts + new_contacts[0]).ids)
+        self.assertEqual(
+            campaign.participant_ids.filtered(lambda p: p.state == 'unlinked').mapped('res_id'),
+            self.test_contacts[1].ids,
+        )
+        self.assertMarketAutoTraces(
+            [{
+                'records': (self.test_contacts - self.test_contacts[1]) + new_contacts[0],
+                'status': 'scheduled',
+            }, {
+                'records': self.test_contacts[1],
+                'status': 'canceled',
+            }],
+            self.activity_1,
+        )
+        self.assertEqual(new_participants.trace_ids.schedule_date, self.date_reference + timedelta(hours=2))
+
     @users('user_marketing_automation')
     def test_participants_creation_dupes(self):
         """ This test may fail randomly based on time if not launched with
@@ -684,6 +684,12 @@ class MrpProductionWorkcenterLine(models.Model):
             progress_bars[field] = self._web_gantt_progress_bar(field, res_ids[field], start_utc, stop_utc)
         return progress_bars
 
+    @api.model
+    def gantt_unavailability(self, start_date, end_date, scale, group_bys=None, rows=None):
+        # the unavailabilities of the workcenters are computed by mrp, let it share the cached ones of the calendars
+        return super(MrpProductionWorkcenterLine, self.with_context(gantt_unavailability_cache=True)).gantt_unavailability(
+            start_date, end_date, scale, group_bys=group_bys, rows=rows)
+
     def _get_fields_for_tablet(self):
         """ List of fields on the workorder object that are needed by the tablet
         client action. The purpose of this function is to be overridden in order
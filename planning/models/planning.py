@@ -1271,8 +1271,8 @@ class Planning(models.Model):
 
         tag_resource_rows(rows)
         resources = self.env['resource.resource'].browse(resource_ids).filtered('calendar_id')
-        leaves_mapping = resources._get_unavailable_intervals(start_datetime, end_datetime)
-        company_leaves = self.env.company.resource_calendar_id._unavailable_intervals(start_datetime.replace(tzinfo=pytz.utc), end_datetime.replace(tzinfo=pytz.utc))
+        leaves_mapping = resources._get_gantt_unavailable_intervals(start_datetime, end_datetime)
+        company_leaves = self.env.company.resource_calendar_id._get_gantt_unavailable_intervals(start_datetime, end_datetime)
 
         # function to recursively replace subrows with the ones returned by func
         def traverse(func, row):
@@ -43,6 +43,11 @@ class PosPreparationDisplay(models.Model):
         super()._send_load_orders_message()
         self._send_orders_to_customer_display()
 
+    def _send_orders_notification(self, notification_type, payload):
+        super()._send_orders_notification(notification_type, payload)
+        if notification_type in ("update_orders", "remove_orders"):
+            self._send_orders_to_customer_display()
+
     def open_customer_display(self):
         return {
             "type": "ir.actions.act_url",
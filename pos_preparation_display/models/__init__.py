@@ -3,5 +3,6 @@ from . import pos_session
 from . import preparation_display
 from . import preparation_display_order_stage
 from . import preparation_display_stage
+from . import preparation_display_stage_duration
 from . import preparation_display_order
 from . import preparation_display_orderline
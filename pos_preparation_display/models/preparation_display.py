@@ -14,6 +14,8 @@ class PosPreparationDisplay(models.Model):
     category_ids = fields.Many2many('pos.category', string="Product categories", help="Product categories that will be displayed on this screen.")
     order_count = fields.Integer("Order count", compute='_compute_order_count')
     average_time = fields.Integer("Order average time", compute='_compute_order_count', help="Average time of all order that not in a done stage.")
+    median_time = fields.Integer("Order median time", compute='_compute_order_count', help="Time within which half of today's orders were completed.")
+    percentile_95_time = fields.Integer("Order 95th percentile time", compute='_compute_order_count', help="Time within which 95% of today's orders were completed.")
     stage_ids = fields.One2many('pos_preparation_display.stage', 'preparation_display_id', string="Stages", default=[
         {'name': 'To prepare', 'color': '#6C757D', 'alert_timer': 10},
         {'name': 'Ready', 'color': '#4D89D1', 'alert_timer': 5},
@@ -43,7 +45,10 @@ class PosPreparationDisplay(models.Model):
         Returns whether the orderline should be included in the preparation
         display, based on the categories that are selected for the preparation
         """
-        return any(categ_id in self._get_pos_category_ids().ids for categ_id in orderline.product_id.pos_categ_ids.ids)
+        # no selected category means every category, avoid searching them all for each line
+        if not self.category_ids:
+            return bool(orderline.product_id.pos_categ_ids)
+        return bool(orderline.product_id.pos_categ_ids & self.category_ids)
 
     def get_pos_config_ids(self):
         self.ensure_one()
@@ -57,10 +62,23 @@ class PosPreparationDisplay(models.Model):
             'categories': self._get_pos_category_ids().read(['id', 'display_name', 'sequence']),
             'stages': self.stage_ids.read(),
             'orders': self.env["pos_preparation_display.order"].get_preparation_display_order(self.id),
+            'snapshot': self._get_bus_snapshot(),
             'attributes': self.env['product.attribute'].search([]).read(['id', 'name']),
             'attribute_values': self.env['product.template.attribute.value'].search([]).read(['id', 'name', 'attribute_id']),
         }
 
+    def get_orders_snapshot(self):
+        """
+        Returns all the open orders of the display along with the snapshot
+        they are read in, used by the screen to tell which notifications they
+        already include.
+        """
+        self.ensure_one()
+        return {
+            'orders': self.env["pos_preparation_display.order"].get_preparation_display_order(self.id),
+            'snapshot': self._get_bus_snapshot(),
+        }
+
     def open_reset_wizard(self):
         return {
             'name': _("Reset Preparation Display"),
@@ -109,37 +127,147 @@ class PosPreparationDisplay(models.Model):
             'preparation_display_id': self.id,
         })
 
+    @api.model
+    def _get_bus_snapshot(self):
+        """
+        Returns the database snapshot of the current transaction: the changes
+        of the transactions below xmin are visible, as well as the ones of the
+        transactions below xmax that are not listed in xip (still in progress
+        when the snapshot was taken). The orders are read in the same snapshot.
+        """
+        self.env.cr.execute("""
+            SELECT txid_snapshot_xmin(snapshot), txid_snapshot_xmax(snapshot), ARRAY(SELECT txid_snapshot_xip(snapshot))
+              FROM txid_current_snapshot() snapshot
+        """)
+        xmin, xmax, xip = self.env.cr.fetchone()
+        return {'xmin': xmin, 'xmax': xmax, 'xip': xip}
+
+    @api.model
+    def _get_bus_transaction_id(self):
+        self.env.cr.execute("SELECT txid_current()")
+        return self.env.cr.fetchone()[0]
+
+    def _send_orders_notification(self, notification_type, payload):
+        """
+        Pushes an incremental change to the screen instead of asking it to
+        reload every order. Notifications carry the id of the transaction that
+        sent them, so that the screen can tell from the snapshot of the orders
+        it loads whether they are already part of them, whatever the order in
+        which the transactions commit.
+        """
+        self.ensure_one()
+        self.env['bus.bus']._sendone(f'preparation_display-{self.access_token}', notification_type, {
+            **payload,
+            'preparation_display_id': self.id,
+            'transaction_id': self._get_bus_transaction_id(),
+        })
+
     @api.depends('stage_ids', 'pos_config_ids', 'category_ids')
     def _compute_order_count(self):
-        for preparation_display in self:
-            progress_order_count = 0
-            orders = preparation_display.env['pos_preparation_display.order'].search([
-                ('pos_config_id', 'in', preparation_display.get_pos_config_ids().ids),
-                ('create_date', '>=', fields.Date.today())
-            ])
+        today = fields.Date.today()
+        preparation_displays = self.filtered('id')
+        (self - preparation_displays).update({
+            'order_count': 0,
+            'average_time': 0,
+            'median_time': 0,
+            'percentile_95_time': 0,
+        })
+        if not preparation_displays:
+            return
 
-            for order in orders:
-                order_stage = order.order_stage_ids.filtered(lambda s: s.preparation_display_id.id == preparation_display.id)
-
-                if order_stage:
-                    order_stage_last = sorted(order_stage, key=lambda s: s.write_date, reverse=True)[0]
-                    if order_stage_last.stage_id.id == preparation_display.stage_ids[-1].id:
-                        continue
-
-                for orderline in order.preparation_display_order_line_ids:
-                    if preparation_display._should_include(orderline) and orderline.product_quantity > 0:
-                        progress_order_count += 1
-                        break
-
-            preparation_display.order_count = progress_order_count
-            order_stages = self.env['pos_preparation_display.order.stage'].search([
-                ('preparation_display_id', '=', preparation_display.id),
-                ('create_date', '>=', fields.Date.today()),
-                ('done', '=', True)
-            ])
-
-            completed_order_times = [(order_stage.write_date - order_stage.order_id.create_date).total_seconds() for order_stage in order_stages]
-            preparation_display.average_time = round(sum(completed_order_times) / len(completed_order_times) / 60) if completed_order_times else 0
+        # completion times of today's orders, aggregated by the database for all the displays at once
+        self.env.cr.execute("""
+            SELECT order_stage.preparation_display_id,
+                   AVG(EXTRACT(EPOCH FROM order_stage.write_date - preparation_order.create_date)),
+                   PERCENTILE_CONT(0.5) WITHIN GROUP (ORDER BY EXTRACT(EPOCH FROM order_stage.write_date - preparation_order.create_date)),
+                   PERCENTILE_CONT(0.95) WITHIN GROUP (ORDER BY EXTRACT(EPOCH FROM order_stage.write_date - preparation_order.create_date))
+              FROM pos_preparation_display_order_stage order_stage
+              JOIN pos_preparation_display_order preparation_order ON preparation_order.id = order_stage.order_id
+             WHERE order_stage.preparation_display_id IN %s
+               AND order_stage.create_date >= %s
+               AND order_stage.done
+          GROUP BY order_stage.preparation_display_id
+        """, [tuple(preparation_displays.ids), today])
+        completion_times = {display_id: times for display_id, *times in self.env.cr.fetchall()}
+        order_counts = preparation_displays._get_in_progress_order_counts(today)
+
+        for preparation_display in preparation_displays:
+            preparation_display.order_count = order_counts[preparation_display.id]
+            average, median, percentile_95 = completion_times.get(preparation_display.id, (0, 0, 0))
+            preparation_display.average_time = round(average / 60)
+            preparation_display.median_time = round(median / 60)
+            preparation_display.percentile_95_time = round(percentile_95 / 60)
+
+    def _get_in_progress_order_counts(self, date_from):
+        """
+        Counts, for each display, the orders created since date_from with at
+        least one product to prepare on the display, and whose current stage
+        on it is not its last one.
+        """
+        pos_configs_per_display = {display: display.get_pos_config_ids() for display in self}
+        pos_configs = self.env['pos.config'].union(*pos_configs_per_display.values())
+        # the products to prepare of the orders of all the displays at once
+        order_products = self.env['pos_preparation_display.orderline']._read_group([
+            ('preparation_display_order_id.pos_config_id', 'in', pos_configs.ids),
+            ('preparation_display_order_id.create_date', '>=', date_from),
+            ('product_quantity', '>', 0),
+            ('product_id.pos_categ_ids', '!=', False),
+        ], ['preparation_display_order_id', 'product_id'])
+        orders = self.env['pos_preparation_display.order'].union(*(order for order, _product in order_products))
+        if not orders:
+            return dict.fromkeys(self.ids, 0)
+
+        self.env['pos_preparation_display.order.stage'].flush_model()
+        self.env.cr.execute("""
+            SELECT DISTINCT ON (order_id, preparation_display_id) order_id, preparation_display_id, stage_id
+              FROM pos_preparation_display_order_stage
+             WHERE order_id IN %s
+               AND preparation_display_id IN %s
+          ORDER BY order_id, preparation_display_id, write_date DESC, id DESC
+        """, [tuple(orders.ids), tuple(self.ids)])
+        current_stage_ids = {(order_id, display_id): stage_id for order_id, display_id, stage_id in self.env.cr.fetchall()}
+
+        order_counts = {}
+        for display, display_pos_configs in pos_configs_per_display.items():
+            last_stage_id = display.stage_ids[-1].id
+            display_orders = {
+                order for order, product in order_products
+                if order.pos_config_id in display_pos_configs
+                and (not display.category_ids or product.pos_categ_ids & display.category_ids)
+            }
+            order_counts[display.id] = sum(
+                current_stage_ids.get((order.id, display.id)) != last_stage_id
+                for order in display_orders
+            )
+        return order_counts
+
+    def get_preparation_time_statistics(self, date_from=None):
+        """
+        Returns the time spent by the orders in each stage of the display since
+        date_from (today by default), overall and for each product category.
+        Durations are in seconds.
+        """
+        self.ensure_one()
+        self.env.cr.execute("""
+            SELECT stage_id,
+                   category_id,
+                   COUNT(*),
+                   AVG(duration),
+                   PERCENTILE_CONT(0.5) WITHIN GROUP (ORDER BY duration),
+                   PERCENTILE_CONT(0.95) WITHIN GROUP (ORDER BY duration)
+              FROM pos_preparation_display_stage_duration
+             WHERE preparation_display_id = %s
+               AND create_date >= %s
+          GROUP BY stage_id, category_id
+        """, [self.id, date_from or fields.Date.today()])
+        return [{
+            'stage_id': stage_id,
+            'category_id': category_id or False,
+            'count': count,
+            'average': round(average),
+            'p50': round(p50),
+            'p95': round(p95),
+        } for stage_id, category_id, count, average, p50, p95 in self.env.cr.fetchall()]
 
     @api.constrains('stage_ids')
     def _check_stage_ids(self):
@@ -39,6 +39,7 @@ class PosPreparationDisplayOrder(models.Model):
             else:
                 negative_orderlines.append(orderline)
 
+        cancelled_orderlines = self.env['pos_preparation_display.orderline']
         if negative_orderlines:
             for negative_orderline in negative_orderlines:
                 quantity_to_cancel = abs(negative_orderline['product_quantity'])
@@ -54,6 +55,7 @@ class PosPreparationDisplayOrder(models.Model):
                             if negative_orderline.get('attribute_value_ids') and set(negative_orderline.get('attribute_value_ids')) != set(orderline.attribute_value_ids.ids):
                                 continue
 
+                            cancelled_orderlines |= orderline
                             if orderline.product_quantity >= quantity_to_cancel:
                                 orderline.product_cancelled = quantity_to_cancel
                                 quantity_to_cancel = 0
@@ -64,19 +66,34 @@ class PosPreparationDisplayOrder(models.Model):
                     if quantity_to_cancel == 0:
                         break
 
+        new_order = self.browse()
         if positive_orderlines:
             order_to_create = self._get_preparation_order_values(preparation_display_order)
             order_to_create['preparation_display_order_line_ids'] = positive_orderlines
-            self.create(order_to_create)
+            new_order = self.create(order_to_create)
 
         if positive_orderlines or negative_orderlines:
-            preparation_displays = self.env['pos_preparation_display.display'].search([])
+            preparation_displays = self.env['pos_preparation_display.display'].search([
+                '|', ('pos_config_ids', '=', order.config_id.id), ('pos_config_ids', '=', False),
+            ])
+            preparation_displays = preparation_displays.filtered(lambda p_dis:
+                set(p_dis._get_pos_category_ids().ids).intersection(product_categories)
+            )
+            new_order._create_first_order_stages(preparation_displays)
+            updated_orders = new_order | cancelled_orderlines.preparation_display_order_id
 
             for p_dis in preparation_displays:
-                p_dis_categories = p_dis._get_pos_category_ids()
-
-                if len(set(p_dis_categories.ids).intersection(product_categories)) > 0:
-                    p_dis._send_load_orders_message()
+                orders_ui = [
+                    order_ui
+                    for order_ui in (
+                        updated_order._export_for_ui(p_dis)
+                        for updated_order in updated_orders
+                        if not updated_order._get_current_order_stage(p_dis).done
+                    )
+                    if order_ui
+                ]
+                if orders_ui:
+                    p_dis._send_orders_notification('update_orders', {'orders': orders_ui})
 
         order._update_last_order_changes()
         return order.last_order_preparation_change
@@ -92,6 +109,71 @@ class PosPreparationDisplayOrder(models.Model):
             'pos_order_id':  order['pos_order_id'],
         }
 
+    def _create_first_order_stages(self, preparation_displays):
+        """
+        Places the orders in the first stage of the given displays, in a single
+        create, so that reading the displays never has to write.
+        """
+        existing_stages = self.env['pos_preparation_display.order.stage'].search([
+            ('order_id', 'in', self.ids),
+            ('preparation_display_id', 'in', preparation_displays.ids),
+        ])
+        existing_keys = {(stage.order_id.id, stage.preparation_display_id.id) for stage in existing_stages}
+        self.env['pos_preparation_display.order.stage'].create([
+            {
+                'preparation_display_id': p_dis.id,
+                'stage_id': p_dis.stage_ids[0].id,
+                'order_id': order.id,
+                'done': False,
+            }
+            for p_dis in preparation_displays
+            for order in self
+            if (order.id, p_dis.id) not in existing_keys
+        ])
+
+    def _get_current_order_stage(self, preparation_display):
+        self.ensure_one()
+        filtered_stages = self.order_stage_ids.filtered(lambda stage: stage.preparation_display_id == preparation_display)
+        return filtered_stages[-1] if filtered_stages else self.env['pos_preparation_display.order.stage']
+
+    def _log_stage_durations(self, preparation_display):
+        """
+        Records the time spent by the orders in their current stage of the
+        display, for the whole order and for each prepared category, so that
+        latency statistics are simple aggregates.
+        """
+        now = fields.Datetime.now()
+        durations = []
+        for order in self:
+            current_order_stage = order._get_current_order_stage(preparation_display)
+            if current_order_stage.done:
+                continue
+
+            # orders without stage on the display are in its first stage since their creation
+            stage = current_order_stage.stage_id or preparation_display.stage_ids[0]
+            stage_start = current_order_stage.create_date or order.create_date
+            duration = max(int((now - stage_start).total_seconds()), 0)
+            orderlines = order.preparation_display_order_line_ids.filtered(preparation_display._should_include)
+            categories = orderlines.product_id.pos_categ_ids
+            if preparation_display.category_ids:
+                categories &= preparation_display.category_ids
+
+            for category_id in [False] + categories.ids:
+                durations.append({
+                    'preparation_display_id': preparation_display.id,
+                    'stage_id': stage.id,
+                    'category_id': category_id,
+                    'duration': duration,
+                })
+        self.env['pos_preparation_display.stage.duration'].create(durations)
+
+    @api.model
+    def _get_open_orders_domain(self, preparation_display):
+        return [
+            '|', ('pos_config_id', 'in', preparation_display.get_pos_config_ids().ids), ('pos_order_id', '=', False),
+            ('order_stage_ids', 'not any', [('preparation_display_id', '=', preparation_display.id), ('done', '=', True)]),
+        ]
+
     def change_order_stage(self, stage_id, preparation_display_id):
         self.ensure_one()
 
@@ -104,9 +186,8 @@ class PosPreparationDisplayOrder(models.Model):
         p_dis_categories = p_dis._get_pos_category_ids()
 
         if len(set(p_dis_categories.ids).intersection(categories)) > 0:
-            channel = f'preparation_display-{p_dis.access_token}'
-
             if stage_id in p_dis.stage_ids.ids:
+                self._log_stage_durations(p_dis)
                 current_stage = self.order_stage_ids.create({
                     'preparation_display_id': p_dis.id,
                     'stage_id': stage_id,
@@ -114,8 +195,7 @@ class PosPreparationDisplayOrder(models.Model):
                     'done': False
                 })
 
-                self.env['bus.bus']._sendone(channel, 'change_order_stage', {
-                    'preparation_display_id': p_dis.id,
+                p_dis._send_orders_notification('change_order_stage', {
                     'order_id': self.id,
                     'last_stage_change': current_stage.write_date,
                     'stage_id': stage_id
@@ -126,6 +206,7 @@ class PosPreparationDisplayOrder(models.Model):
     def done_orders_stage(self, preparation_display_id):
         preparation_display = self.env['pos_preparation_display.display'].browse(preparation_display_id)
         last_stage = preparation_display.stage_ids[-1]
+        done_order_ids = []
 
         for order in self:
             p_dis_order_stage_ids = order.order_stage_ids.filtered(lambda order_stage:
@@ -136,6 +217,7 @@ class PosPreparationDisplayOrder(models.Model):
             )
 
             if current_order_stage:
+                order._log_stage_durations(preparation_display)
                 p_dis_order_stage_ids.unlink()
                 order.order_stage_ids.create({
                     'preparation_display_id': preparation_display_id,
@@ -143,35 +225,21 @@ class PosPreparationDisplayOrder(models.Model):
                     'order_id': order.id,
                     'done': True
                 })
+                done_order_ids.append(order.id)
                 if len(order.order_stage_ids.filtered(lambda order_stage: not order_stage.done)) == 0:
                     order.unlink()
 
-        preparation_display._send_load_orders_message()
+        if done_order_ids:
+            preparation_display._send_orders_notification('remove_orders', {'order_ids': done_order_ids})
 
     def get_preparation_display_order(self, preparation_display_id):
         preparation_display = self.env['pos_preparation_display.display'].browse(preparation_display_id)
-        orders = self.env['pos_preparation_display.order'].search(['|', ('pos_config_id', 'in', preparation_display.get_pos_config_ids().ids), ('pos_order_id', '=', False)])
-        first_stage = preparation_display.stage_ids[0]
+        # orders done on this display are filtered out by the database, using the indexed done flag of their stages
+        # orders created before the display was configured have no stage on it, the screen shows them in the first one
+        orders = self.env['pos_preparation_display.order'].search(self._get_open_orders_domain(preparation_display))
 
         preparation_display_orders = []
         for order in orders:
-            current_order_stage = None
-
-            if order.order_stage_ids:
-                filtered_stages = order.order_stage_ids.filtered(lambda stage: stage.preparation_display_id.id == preparation_display.id)
-                if filtered_stages:
-                    current_order_stage = filtered_stages[-1]
-
-            if current_order_stage and current_order_stage.done:
-                continue
-            elif not current_order_stage:
-                order.order_stage_ids.create({
-                    'preparation_display_id': preparation_display_id,
-                    'stage_id': first_stage.id,
-                    'order_id': order.id,
-                    'done': False
-                })
-
             order_ui = order._export_for_ui(preparation_display)
             if order_ui:
                 preparation_display_orders.append(order_ui)
@@ -196,12 +264,7 @@ class PosPreparationDisplayOrder(models.Model):
                 })
 
         if preparation_display_orderlines:
-            current_order_stage = None
-
-            if self.order_stage_ids:
-                filtered_stages = self.order_stage_ids.filtered(lambda stage: stage.preparation_display_id.id == preparation_display.id)
-                if filtered_stages:
-                    current_order_stage = filtered_stages[-1]
+            current_order_stage = self._get_current_order_stage(preparation_display)
 
             return {
                 'id': self.id,
@@ -6,6 +6,6 @@ class PosPreparationDisplayOrderStage(models.Model):
     _description = "Stage of orders by preparation display"
 
     stage_id = fields.Many2one('pos_preparation_display.stage', ondelete='cascade')
-    preparation_display_id = fields.Many2one("pos_preparation_display.display", ondelete='cascade')
-    order_id = fields.Many2one('pos_preparation_display.order', ondelete='cascade')
-    done = fields.Boolean("Is the order done")
+    preparation_display_id = fields.Many2one("pos_preparation_display.display", ondelete='cascade', index=True)
+    order_id = fields.Many2one('pos_preparation_display.order', ondelete='cascade', index=True)
+    done = fields.Boolean("Is the order done", index=True)
@@ -0,0 +1,26 @@
+from dateutil.relativedelta import relativedelta
+
+from odoo import api, fields, models
+
+
+class PosPreparationDisplayStageDuration(models.Model):
+    _name = 'pos_preparation_display.stage.duration'
+    _description = "Time spent by orders in a preparation stage"
+    _order = 'id desc'
+
+    preparation_display_id = fields.Many2one('pos_preparation_display.display', required=True, index=True, ondelete='cascade')
+    stage_id = fields.Many2one('pos_preparation_display.stage', required=True, ondelete='cascade')
+    category_id = fields.Many2one('pos.category', ondelete='cascade', help="Category of the prepared products, empty for the whole order")
+    duration = fields.Integer("Duration (s)", help="Number of seconds the order spent in the stage")
+
+    @api.autovacuum
+    def _gc_stage_durations(self):
+        """Delete the durations logged more than 90 days ago (overridable with an
+        'ir.config_parameter'), the statistics are computed on recent orders.
+        """
+        retention_days = self.env['ir.config_parameter'].sudo().get_param(
+            'pos_preparation_display.stage_duration_retention_days',
+            '90'
+        )
+        date_threshold = fields.Datetime.now() - relativedelta(days=int(retention_days))
+        self.sudo().search([('create_date', '<', date_threshold)]).unlink()
@@ -28,6 +28,9 @@ export class PreparationDisplay extends Reactive {
         this.selectedCategories = new Set();
         this.selectedProducts = new Set();
         this.filteredOrders = [];
+        this.snapshot = data.snapshot;
+        this.syncingOrders = null;
+        this.pendingNotifications = [];
         this.rawData = {
             categories: data.categories,
             orders: data.orders,
@@ -185,14 +188,57 @@ export class PreparationDisplay extends Reactive {
     }
 
     async getOrders() {
-        this.rawData.orders = await this.orm.call(
-            "pos_preparation_display.order",
-            "get_preparation_display_order",
-            [[], this.id],
-            {}
-        );
+        if (!this.syncingOrders) {
+            this.syncingOrders = this.orm
+                .call("pos_preparation_display.display", "get_orders_snapshot", [[this.id]], {})
+                .then(({ orders, snapshot }) => {
+                    this.rawData.orders = orders;
+                    this.snapshot = snapshot;
+                    this.processOrders();
+                })
+                .finally(() => {
+                    this.syncingOrders = null;
+                    // changes committed after the orders were read are only known from their notification
+                    const pendingNotifications = this.pendingNotifications;
+                    this.pendingNotifications = [];
+                    for (const [type, payload] of pendingNotifications) {
+                        this.handleNotification(type, payload);
+                    }
+                });
+        }
+        return this.syncingOrders;
+    }
 
-        this.processOrders();
+    handleNotification(type, payload) {
+        if (this.syncingOrders) {
+            this.pendingNotifications.push([type, payload]);
+            return;
+        }
+
+        if (this.isIncludedInOrders(payload.transaction_id)) {
+            return;
+        }
+
+        switch (type) {
+            case "update_orders":
+                return this.wsUpdateOrders(payload.orders);
+            case "remove_orders":
+                return this.wsRemoveOrders(payload.order_ids);
+            case "change_order_stage":
+                return this.wsMoveToNextStage(
+                    payload.order_id,
+                    payload.stage_id,
+                    payload.last_stage_change
+                );
+            case "change_orderline_status":
+                return this.wsChangeLinesStatus(payload.status);
+        }
+    }
+
+    isIncludedInOrders(transactionId) {
+        // the changes of a transaction are part of the loaded orders when it had committed before they were read
+        const { xmin, xmax, xip } = this.snapshot;
+        return transactionId < xmin || (transactionId < xmax && !xip.includes(transactionId));
     }
 
     processCategories() {
@@ -217,36 +263,81 @@ export class PreparationDisplay extends Reactive {
             this.categories[index].orderlines = [];
         }
 
-        this.orders = this.rawData.orders.reduce((orders, order) => {
-            if (order.stage_id === null) {
-                order.stage_id = this.firstStage.id;
-            }
+        this.orders = {};
+        for (const order of this.rawData.orders) {
+            this.addOrder(order);
+        }
 
-            const orderObj = new Order(order);
+        this.filterOrders();
+        return this.orders;
+    }
 
-            orderObj.orderlines = order.orderlines.map((line) => {
-                const orderline = new Orderline(line, orderObj);
-                const product = new Product([orderline.productId, orderline.productName]);
+    addOrder(order) {
+        if (order.stage_id === null) {
+            order.stage_id = this.firstStage.id;
+        }
 
-                this.products[product.id] = product;
-                this.orderlines[orderline.id] = orderline;
-                orderline.productCategoryIds.forEach((categoryId) => {
-                    this.categories[categoryId]?.orderlines?.push(orderline);
-                    this.categories[categoryId]?.productIds?.add(orderline.productId);
-                });
+        const orderObj = new Order(order);
 
-                return orderline;
+        orderObj.orderlines = order.orderlines.map((line) => {
+            const orderline = new Orderline(line, orderObj);
+            const product = new Product([orderline.productId, orderline.productName]);
+
+            this.products[product.id] = product;
+            this.orderlines[orderline.id] = orderline;
+            orderline.productCategoryIds.forEach((categoryId) => {
+                this.categories[categoryId]?.orderlines?.push(orderline);
+                this.categories[categoryId]?.productIds?.add(orderline.productId);
             });
 
-            if (orderObj.orderlines.length > 0) {
-                orders[order.id] = orderObj;
-            }
+            return orderline;
+        });
+
+        if (orderObj.orderlines.length > 0) {
+            this.orders[order.id] = orderObj;
+        }
+
+        return orderObj;
+    }
+
+    removeOrder(orderId) {
+        const order = this.orders[orderId];
+        if (!order) {
+            return;
+        }
 
-            return orders;
-        }, {});
+        order.clearChangeTimeout();
+        for (const orderline of order.orderlines) {
+            delete this.orderlines[orderline.id];
+            orderline.productCategoryIds.forEach((categoryId) => {
+                const category = this.categories[categoryId];
+                if (category) {
+                    category.orderlines = category.orderlines.filter(
+                        (categoryOrderline) => categoryOrderline.id !== orderline.id
+                    );
+                }
+            });
+        }
+
+        delete this.orders[orderId];
+    }
+
+    wsUpdateOrders(orders) {
+        for (const order of orders) {
+            this.removeOrder(order.id);
+            this.addOrder(order);
+        }
 
         this.filterOrders();
-        return this.orders;
+    }
+
+    wsRemoveOrders(orderIds) {
+        for (const orderId of orderIds) {
+            this.removeOrder(orderId);
+        }
+
+        this.clearPreviousStageHistory(orderIds);
+        this.filterOrders();
     }
 
     wsChangeLinesStatus(linesStatus) {
@@ -261,6 +352,10 @@ export class PreparationDisplay extends Reactive {
 
     wsMoveToNextStage(orderId, stageId, lastStageChange) {
         const order = this.orders[orderId];
+        if (!order) {
+            return;
+        }
+
         clearTimeout(order.changeStageTimeout);
 
         order.stageId = stageId;
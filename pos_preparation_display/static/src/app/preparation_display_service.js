@@ -30,22 +30,16 @@ const preparationDisplayService = {
                     return false;
                 }
 
-                switch (detail.type) {
-                    case "load_orders":
-                        return preparationDisplayService.getOrders();
-                    case "change_order_stage":
-                        return preparationDisplayService.wsMoveToNextStage(
-                            datas.order_id,
-                            datas.stage_id,
-                            datas.last_stage_change
-                        );
-                    case "change_orderline_status":
-                        return preparationDisplayService.wsChangeLinesStatus(datas.status);
+                if (detail.type === "load_orders") {
+                    return preparationDisplayService.getOrders();
                 }
+                return preparationDisplayService.handleNotification(detail.type, datas);
             });
 
             await Promise.all(proms);
         });
+        // notifications may have been missed while the connection was lost
+        bus_service.addEventListener("reconnect", () => preparationDisplayService.getOrders());
 
         return preparationDisplayService;
     },
@@ -0,0 +1,189 @@
+# -*- coding: utf-8 -*-
+# Part of Odoo. See LICENSE file for full copyright and licensing details.
+
+import json
+
+from odoo import Command
+from odoo.sql_db import db_connect
+from odoo.tests.common import TransactionCase, tagged
+
+
+@tagged('post_install', '-at_install')
+class TestPreparationDisplay(TransactionCase):
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.category = cls.env['pos.category'].create({'name': 'Kitchen'})
+        cls.product = cls.env['product.product'].create({
+            'name': 'Burger',
+            'available_in_pos': True,
+            'pos_categ_ids': [Command.set(cls.category.ids)],
+        })
+        cls.pos_config = cls.env['pos.config'].create({'name': 'Kitchen Shop'})
+        cls.preparation_display = cls.env['pos_preparation_display.display'].create({
+            'name': 'Kitchen Display',
+            'category_ids': [Command.set(cls.category.ids)],
+        })
+
+    def _create_pos_order(self):
+        if not self.pos_config.current_session_id:
+            self.pos_config.open_ui()
+        return self.env['pos.order'].create({
+            'company_id': self.env.company.id,
+            'session_id': self.pos_config.current_session_id.id,
+            'amount_total': 0,
+            'amount_tax': 0,
+            'amount_paid': 0,
+            'amount_return': 0,
+        })
+
+    def _create_preparation_order(self, pos_order=None):
+        return self.env['pos_preparation_display.order'].create({
+            'displayed': True,
+            'pos_order_id': pos_order.id if pos_order else False,
+            'preparation_display_order_line_ids': [Command.create({
+                'todo': True,
+                'product_id': self.product.id,
+                'product_quantity': 1,
+            })],
+        })
+
+    def _get_last_notification(self):
+        bus = self.env['bus.bus'].search([
+            ('channel', 'like', f'preparation_display-{self.preparation_display.access_token}'),
+        ], order='id desc', limit=1)
+        return json.loads(bus.message)
+
+    def test_read_orders_creates_no_stage(self):
+        order = self._create_preparation_order()
+        OrderStage = self.env['pos_preparation_display.order.stage']
+
+        orders = order.get_preparation_display_order(self.preparation_display.id)
+        self.assertIn(order.id, [o['id'] for o in orders])
+        self.assertIsNone(orders[0]['stage_id'], "Orders without stage are shown in the first stage by the screen")
+        self.assertFalse(OrderStage.search_count([('order_id', '=', order.id)]), "Reading the display should not write")
+
+    def test_incremental_notifications(self):
+        order = self._create_preparation_order()
+        transaction_id = self.preparation_display._get_bus_transaction_id()
+
+        order.change_order_stage(self.preparation_display.stage_ids[-1].id, self.preparation_display.id)
+        message = self._get_last_notification()
+        self.assertEqual(message['type'], 'change_order_stage')
+        self.assertEqual(message['payload']['transaction_id'], transaction_id)
+
+        order.done_orders_stage(self.preparation_display.id)
+        message = self._get_last_notification()
+        self.assertEqual(message['type'], 'remove_orders')
+        self.assertEqual(message['payload']['order_ids'], [order.id])
+        self.assertEqual(message['payload']['transaction_id'], transaction_id)
+
+        snapshot = self.preparation_display.get_orders_snapshot()
+        self.assertNotIn(order.id, [o['id'] for o in snapshot['orders']], "Done orders should not be loaded anymore")
+
+    def test_snapshot_concurrent_transactions(self):
+        """ A transaction that commits after the orders are read has its notification applied by the screen, even
+            when a transaction started after it has already committed.
+        """
+        def is_included(snapshot, transaction_id):
+            # same check as the screen, see PreparationDisplay.isIncludedInOrders
+            return transaction_id < snapshot['xmin'] or (
+                transaction_id < snapshot['xmax'] and transaction_id not in snapshot['xip'])
+
+        Display = self.env['pos_preparation_display.display']
+        db = db_connect(self.env.cr.dbname)
+        with db.cursor() as slow_cr, db.cursor() as fast_cr, db.cursor() as screen_cr:
+            # the slow transaction takes its id first, then the fast one, which commits before the screen reads
+            slow_transaction_id = Display.with_env(self.env(cr=slow_cr))._get_bus_transaction_id()
+            fast_transaction_id = Display.with_env(self.env(cr=fast_cr))._get_bus_transaction_id()
+            fast_cr.commit()
+            snapshot = Display.with_env(self.env(cr=screen_cr))._get_bus_snapshot()
+            slow_cr.commit()
+            self.assertGreater(fast_transaction_id, slow_transaction_id)
+            self.assertTrue(is_included(snapshot, fast_transaction_id))
+            self.assertFalse(is_included(snapshot, slow_transaction_id), "The slow notification should not be dropped")
+
+            # a transaction started after the snapshot is not part of it either
+            late_transaction_id = Display.with_env(self.env(cr=fast_cr))._get_bus_transaction_id()
+            self.assertFalse(is_included(snapshot, late_transaction_id))
+
+            # once both have committed, a new snapshot includes them
+            screen_cr.commit()
+            fast_cr.commit()
+            snapshot = Display.with_env(self.env(cr=screen_cr))._get_bus_snapshot()
+            self.assertTrue(is_included(snapshot, slow_transaction_id))
+            self.assertTrue(is_included(snapshot, late_transaction_id))
+
+    def test_order_count_and_statistics(self):
+        first_stage, second_stage, last_stage = self.preparation_display.stage_ids
+        OrderStage = self.env['pos_preparation_display.order.stage']
+
+        # orders without point of sale are not counted, only those of the display's configs
+        self._create_preparation_order()
+        self.assertEqual(self.preparation_display.order_count, 0)
+
+        # in progress: in the first stage (without stage yet) and in the second stage
+        self._create_preparation_order(self._create_pos_order())
+        second_stage_order = self._create_preparation_order(self._create_pos_order())
+        second_stage_order.change_order_stage(second_stage.id, self.preparation_display.id)
+        # not in progress anymore: in the last stage, or done after 10, 20 and 60 minutes
+        last_stage_order = self._create_preparation_order(self._create_pos_order())
+        last_stage_order.change_order_stage(last_stage.id, self.preparation_display.id)
+        for minutes in (10, 20, 60):
+            done_order = self._create_preparation_order(self._create_pos_order())
+            OrderStage.create({
+                'preparation_display_id': self.preparation_display.id,
+                'stage_id': last_stage.id,
+                'order_id': done_order.id,
+                'done': True,
+            })
+            done_order.flush_recordset()
+            self.env.cr.execute(
+                "UPDATE pos_preparation_display_order SET create_date = now() at time zone 'UTC' - interval '1 minute' * %s WHERE id = %s",
+                [minutes, done_order.id],
+            )
+        self.env.invalidate_all()
+
+        self.assertEqual(self.preparation_display.order_count, 2)
+        self.assertEqual(self.preparation_display.average_time, 30)
+        self.assertEqual(self.preparation_display.median_time, 20)
+        # 20 + (60 - 20) * 0.9
+        self.assertEqual(self.preparation_display.percentile_95_time, 56)
+
+        statistics = self.preparation_display.get_preparation_time_statistics()
+        self.assertEqual(
+            {(s['stage_id'], s['category_id']) for s in statistics},
+            {(first_stage.id, False), (first_stage.id, self.category.id)},
+        )
+        self.assertTrue(all(s['count'] == 2 for s in statistics))
+
+    def test_order_count_several_displays(self):
+        bar_category = self.env['pos.category'].create({'name': 'Bar'})
+        bar_display = self.env['pos_preparation_display.display'].create({
+            'name': 'Bar Display',
+            'category_ids': [Command.set(bar_category.ids)],
+        })
+        displays = self.preparation_display | bar_display
+        self._create_preparation_order(self._create_pos_order())
+        self.env.invalidate_all()
+
+        # the orders of all the displays are counted at once, each display only counting its own products
+        self.assertEqual(displays.mapped('order_count'), [1, 0])
+
+    def test_gc_stage_durations(self):
+        StageDuration = self.env['pos_preparation_display.stage.duration']
+        old_duration, recent_duration = StageDuration.create([{
+            'preparation_display_id': self.preparation_display.id,
+            'stage_id': self.preparation_display.stage_ids[0].id,
+            'duration': duration,
+        } for duration in (60, 120)])
+        old_duration.flush_recordset()
+        self.env.cr.execute(
+            "UPDATE pos_preparation_display_stage_duration SET create_date = now() at time zone 'UTC' - interval '91 days' WHERE id = %s",
+            [old_duration.id],
+        )
+
+        StageDuration._gc_stage_durations()
+        self.assertFalse(old_duration.exists())
+        self.assertTrue(recent_duration.exists())
@@ -9,7 +9,7 @@ Bridge module for project and enterprise
     """,
     'category': 'Services/Project',
     'version': '1.0',
-    'depends': ['project', 'web_map', 'web_gantt', 'web_enterprise'],
+    'depends': ['project', 'web_map', 'web_gantt', 'resource_gantt', 'web_enterprise'],
     'data': [
         'security/ir.model.access.csv',
         'views/res_config_settings_views.xml',
@@ -1051,8 +1051,8 @@ class Task(models.Model):
         # we reverse sort the resources by date to keep the first one created in the dictionary
         # to anticipate the case of a resource added later for the same employee and company
         user_resource_mapping = {resource.user_id.id: resource.id for resource in resources}
-        leaves_mapping = resources._get_unavailable_intervals(start_datetime, end_datetime)
-        company_leaves = self.env.company.resource_calendar_id._unavailable_intervals(start_datetime.replace(tzinfo=utc), end_datetime.replace(tzinfo=utc))
+        leaves_mapping = resources._get_gantt_unavailable_intervals(start_datetime, end_datetime)
+        company_leaves = self.env.company.resource_calendar_id._get_gantt_unavailable_intervals(start_datetime, end_datetime)
 
         # function to recursively replace subrows with the ones returned by func
         def traverse(func, row):
@@ -0,0 +1,13 @@
+# -*- coding: utf-8 -*-
+# Part of Odoo. See LICENSE file for full copyright and licensing details.
+
+{
+    'name': 'Resources in Gantt',
+    'category': 'Hidden',
+    'summary': 'Cached unavailabilities of the resources in Gantt, and their invalidation',
+    'version': '1.0',
+    'description': """ """,
+    'depends': ['resource', 'web_gantt'],
+    'auto_install': True,
+    'license': 'OEEL-1',
+}
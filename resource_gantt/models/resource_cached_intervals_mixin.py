@@ -0,0 +1,55 @@
+# -*- coding: utf-8 -*-
+# Part of Odoo. See LICENSE file for full copyright and licensing details.
+
+from odoo import api, models
+
+
+class ResourceCachedIntervalsMixin(models.AbstractModel):
+    """ Invalidation of the intervals cached from the records of the resource models (leaves, attendances,
+        resources). The modules caching intervals only extend the hooks below instead of overriding the
+        create, write and unlink of these models.
+    """
+    _name = 'resource.cached.intervals.mixin'
+    _description = 'Cached Intervals Invalidation'
+
+    # fields of the records changing the intervals cached from them
+    _cached_intervals_fields = set()
+
+    def _affects_cached_intervals(self):
+        """ Whether intervals cached in the registry are computed from the records in self, in which case the
+            registry cache is cleared when they change. Evaluated before and after a write, as the records may
+            leave the cached intervals they were part of.
+        """
+        return False
+
+    def _invalidate_cached_intervals(self):
+        """ Hook invalidating the intervals cached outside of the registry cache from the records in self. Called
+            after they are created, before they are deleted, and both before and after they are written.
+        """
+
+    @api.model_create_multi
+    def create(self, vals_list):
+        records = super().create(vals_list)
+        if records._affects_cached_intervals():
+            self.env.registry.clear_cache()
+        records._invalidate_cached_intervals()
+        return records
+
+    def write(self, vals):
+        if not self._cached_intervals_fields & vals.keys():
+            return super().write(vals)
+        clear_cache = self._affects_cached_intervals()
+        self._invalidate_cached_intervals()
+        res = super().write(vals)
+        if clear_cache or self._affects_cached_intervals():
+            self.env.registry.clear_cache()
+        self._invalidate_cached_intervals()
+        return res
+
+    def unlink(self):
+        clear_cache = self._affects_cached_intervals()
+        self._invalidate_cached_intervals()
+        res = super().unlink()
+        if clear_cache:
+            self.env.registry.clear_cache()
+        return res
@@ -0,0 +1,56 @@
+# -*- coding: utf-8 -*-
+# Part of Odoo. See LICENSE file for full copyright and licensing details.
+
+from datetime import date, datetime, time, timedelta
+from pytz import timezone, utc
+
+from odoo import models
+from odoo.addons.resource.models.utils import timezone_datetime
+from odoo.tools import ormcache
+
+# number of days covered by a window of cached unavailable intervals
+WINDOW_DAYS = 7
+
+
+class ResourceCalendar(models.Model):
+    _inherit = 'resource.calendar'
+
+    def write(self, vals):
+        res = super().write(vals)
+        if {'company_id', 'tz', 'two_weeks_calendar'} & vals.keys():
+            # every interval cached from the calendar, see resource.cached.intervals.mixin
+            self.env.registry.clear_cache()
+        return res
+
+    @ormcache('self.id', 'tz', 'date_from', 'tuple(self.env.companies.ids)')
+    def _get_gantt_unavailable_window(self, tz, date_from):
+        """ Unavailable intervals (in UTC) of the calendar during the WINDOW_DAYS days starting at ``date_from``.
+            The allowed companies are part of the key as they restrict the leaves taken into account.
+        """
+        date_to = date_from + timedelta(days=WINDOW_DAYS)
+        intervals = self._unavailable_intervals_batch(date_from, date_to, tz=timezone(tz))[False]
+        return tuple((start, stop) for start, stop in intervals if start < stop)
+
+    def _get_gantt_unavailable_intervals(self, start_datetime, end_datetime):
+        """ Same as _unavailable_intervals, built from windows of unavailable intervals shared between the
+            requests until the calendar, its attendances or its leaves change. Empty intervals are left out.
+        """
+        self.ensure_one()
+        start_datetime = timezone_datetime(start_datetime).astimezone(utc)
+        end_datetime = timezone_datetime(end_datetime).astimezone(utc)
+        # windows are aligned on days, so that the ranges of all the scales and all the timezones share them
+        start_ordinal = start_datetime.date().toordinal()
+        window_start = datetime.combine(date.fromordinal(start_ordinal - start_ordinal % WINDOW_DAYS), time.min, tzinfo=utc)
+        intervals = []
+        while window_start < end_datetime:
+            for start, stop in self._get_gantt_unavailable_window(self.tz, window_start):
+                start, stop = max(start, start_datetime), min(stop, end_datetime)
+                if start >= stop:
+                    continue
+                # merge the intervals split by the bounds of the windows
+                if intervals and intervals[-1][1] == start:
+                    intervals[-1] = (intervals[-1][0], stop)
+                else:
+                    intervals.append((start, stop))
+            window_start += timedelta(days=WINDOW_DAYS)
+        return intervals
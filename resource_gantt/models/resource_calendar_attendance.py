@@ -0,0 +1,20 @@
+# -*- coding: utf-8 -*-
+# Part of Odoo. See LICENSE file for full copyright and licensing details.
+
+from odoo import models
+
+
+class ResourceCalendarAttendance(models.Model):
+    _name = 'resource.calendar.attendance'
+    _inherit = ['resource.calendar.attendance', 'resource.cached.intervals.mixin']
+
+    _cached_intervals_fields = {
+        'calendar_id', 'date_from', 'date_to', 'day_period', 'dayofweek', 'display_type', 'hour_from', 'hour_to',
+        'resource_id', 'week_type',
+    }
+
+    def _affects_cached_intervals(self):
+        """ The cached unavailable windows of the calendars only contain the attendances of the whole calendar, see
+            resource.calendar._get_gantt_unavailable_window. The attendances of a single resource don't change them.
+        """
+        return super()._affects_cached_intervals() or any(not attendance.resource_id for attendance in self)
@@ -0,0 +1,17 @@
+# -*- coding: utf-8 -*-
+# Part of Odoo. See LICENSE file for full copyright and licensing details.
+
+from odoo import models
+
+
+class ResourceCalendarLeaves(models.Model):
+    _name = 'resource.calendar.leaves'
+    _inherit = ['resource.calendar.leaves', 'resource.cached.intervals.mixin']
+
+    _cached_intervals_fields = {'calendar_id', 'company_id', 'date_from', 'date_to', 'resource_id', 'time_type'}
+
+    def _affects_cached_intervals(self):
+        """ The cached unavailable windows of the calendars only contain the leaves of the whole calendar, see
+            resource.calendar._get_gantt_unavailable_window. The time off of a single resource doesn't change them.
+        """
+        return super()._affects_cached_intervals() or any(not leave.resource_id for leave in self)
@@ -0,0 +1,55 @@
+# -*- coding: utf-8 -*-
+# Part of Odoo. See LICENSE file for full copyright and licensing details.
+
+from collections import defaultdict
+from pytz import utc
+
+from odoo import models
+from odoo.addons.resource.models.utils import timezone_datetime
+
+
+class ResourceResource(models.Model):
+    _name = 'resource.resource'
+    _inherit = ['resource.resource', 'resource.cached.intervals.mixin']
+
+    _cached_intervals_fields = {'active', 'calendar_id', 'company_id', 'tz', 'user_id'}
+
+    def _get_unavailable_intervals(self, start, end):
+        # gantt views whose unavailabilities are computed elsewhere opt in the cached intervals with the context
+        if self.env.context.get('gantt_unavailability_cache'):
+            return self.with_context(gantt_unavailability_cache=False)._get_gantt_unavailable_intervals(start, end)
+        return super()._get_unavailable_intervals(start, end)
+
+    def _get_gantt_specific_resources(self, start_datetime, end_datetime):
+        """ Resources having attendances of their own, or leaves of their own between the two datetimes. """
+        if not self:
+            return self
+        date_from = start_datetime.astimezone(utc).replace(tzinfo=None)
+        date_to = end_datetime.astimezone(utc).replace(tzinfo=None)
+        attendance_groups = self.env['resource.calendar.attendance']._read_group(
+            [('resource_id', 'in', self.ids)], ['resource_id'])
+        leave_groups = self.env['resource.calendar.leaves']._read_group(
+            [('resource_id', 'in', self.ids), ('date_from', '<=', date_to), ('date_to', '>=', date_from)], ['resource_id'])
+        return self.browse({resource.id for [resource] in attendance_groups + leave_groups})
+
+    def _get_gantt_unavailable_intervals(self, start_datetime, end_datetime):
+        """ Same as _get_unavailable_intervals (without the empty intervals), the resources without attendances or
+            leaves of their own sharing the cached unavailable intervals of their calendar.
+        """
+        start_datetime = timezone_datetime(start_datetime)
+        end_datetime = timezone_datetime(end_datetime)
+        specific_resources = self._get_gantt_specific_resources(start_datetime, end_datetime)
+        resource_mapping = {
+            resource_id: [(start, stop) for start, stop in intervals if start < stop]
+            for resource_id, intervals in specific_resources._get_unavailable_intervals(start_datetime, end_datetime).items()
+        }
+        calendar_mapping = defaultdict(lambda: self.env['resource.resource'])
+        for resource in self - specific_resources:
+            calendar_mapping[resource.calendar_id or resource.company_id.resource_calendar_id] |= resource
+
+        for calendar, resources in calendar_mapping.items():
+            if not calendar:
+                continue
+            intervals = calendar._get_gantt_unavailable_intervals(start_datetime, end_datetime)
+            resource_mapping.update({resource_id: list(intervals) for resource_id in resources.ids})
+        return resource_mapping
@@ -0,0 +1,164 @@
+# -*- coding: utf-8 -*-
+# Part of Odoo. See LICENSE file for full copyright and licensing details.
+
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+from pytz import utc
+from unittest.mock import patch
+
+from odoo.tests.common import TransactionCase, tagged
+
+
+def _non_empty(intervals):
+    return [(start, stop) for start, stop in intervals if start < stop]
+
+
+@tagged('post_install', '-at_install')
+class TestGanttUnavailability(TransactionCase):
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.calendars = cls.env['resource.calendar'].create([
+            {'name': 'Brussels', 'tz': 'Europe/Brussels'},
+            {'name': 'New York', 'tz': 'America/New_York'},
+            {'name': 'Kolkata', 'tz': 'Asia/Kolkata'},
+        ])
+        cls.resources = cls.env['resource.resource'].create([{
+            'name': f'Resource {i}',
+            'calendar_id': cls.calendars[i % len(cls.calendars)].id,
+        } for i in range(500)])
+        # a few resources have time off of their own, their unavailabilities are not shared
+        cls.env['resource.calendar.leaves'].create([{
+            'name': f'Time Off {i}',
+            'resource_id': resource.id,
+            'calendar_id': resource.calendar_id.id,
+            'date_from': datetime(2024, 1, 8 + i, 8, 0),
+            'date_to': datetime(2024, 1, 9 + i, 18, 0),
+        } for i, resource in enumerate(cls.resources[::25])])
+        cls.env['resource.calendar.leaves'].create({
+            'name': 'Public Holiday',
+            'calendar_id': cls.calendars[0].id,
+            'date_from': datetime(2024, 1, 31, 23, 0),
+            'date_to': datetime(2024, 2, 1, 23, 0),
+        })
+        # week scale ranges of a user in Brussels, from monday to monday
+        cls.weeks = [
+            (datetime(2023, 12, 31, 23, 0) + timedelta(weeks=week), datetime(2024, 1, 7, 23, 0) + timedelta(weeks=week))
+            for week in range(12)
+        ]
+
+    @contextmanager
+    def _count_window_lookups(self):
+        """ Count the lookups of the cached windows, and the ones that had to compute the window. """
+        ResourceCalendar = type(self.env['resource.calendar'])
+        get_window = ResourceCalendar._get_gantt_unavailable_window
+        unavailable_intervals_batch = ResourceCalendar._unavailable_intervals_batch
+        counts = {'lookups': 0, 'misses': 0}
+
+        def _get_gantt_unavailable_window(calendar, *args):
+            counts['lookups'] += 1
+            return get_window(calendar, *args)
+
+        def _unavailable_intervals_batch(calendar, start_dt, end_dt, resources=None, domain=None, tz=None):
+            if not resources:
+                counts['misses'] += 1
+            return unavailable_intervals_batch(calendar, start_dt, end_dt, resources, domain, tz)
+
+        with patch.object(ResourceCalendar, '_get_gantt_unavailable_window', _get_gantt_unavailable_window), \
+                patch.object(ResourceCalendar, '_unavailable_intervals_batch', _unavailable_intervals_batch):
+            yield counts
+
+    def test_same_intervals_as_resource(self):
+        resources = self.resources[:60]
+        for start, end in self.weeks[:4]:
+            expected = {
+                resource_id: _non_empty(intervals)
+                for resource_id, intervals in resources._get_unavailable_intervals(start, end).items()
+            }
+            self.assertEqual(resources._get_gantt_unavailable_intervals(start, end), expected)
+            calendar = self.calendars[0]
+            self.assertEqual(
+                calendar._get_gantt_unavailable_intervals(start, end),
+                _non_empty(calendar._unavailable_intervals(start.replace(tzinfo=utc), end.replace(tzinfo=utc))),
+            )
+
+    def test_cache_invalidation(self):
+        calendar = self.calendars[1]
+        start, end = self.weeks[0]
+        intervals = calendar._get_gantt_unavailable_intervals(start, end)
+        self.env['resource.calendar.leaves'].create({
+            'name': 'Company Event',
+            'calendar_id': calendar.id,
+            'date_from': datetime(2024, 1, 3, 0, 0),
+            'date_to': datetime(2024, 1, 4, 0, 0),
+        })
+        self.assertNotEqual(calendar._get_gantt_unavailable_intervals(start, end), intervals)
+        self.assertEqual(
+            calendar._get_gantt_unavailable_intervals(start, end),
+            _non_empty(calendar._unavailable_intervals(start.replace(tzinfo=utc), end.replace(tzinfo=utc))),
+        )
+
+    def test_cache_invalidation_resource_leave(self):
+        """ The time off of a single resource doesn't change the cached windows of its calendar. """
+        calendar = self.calendars[1]
+        start, end = self.weeks[0]
+        intervals = calendar._get_gantt_unavailable_intervals(start, end)
+        resource = self.resources.filtered(lambda resource: resource.calendar_id == calendar)[0]
+        with self._count_window_lookups() as counts:
+            self.env['resource.calendar.leaves'].create({
+                'name': 'Time Off',
+                'resource_id': resource.id,
+                'calendar_id': calendar.id,
+                'date_from': datetime(2024, 1, 3, 0, 0),
+                'date_to': datetime(2024, 1, 4, 0, 0),
+            })
+            self.assertEqual(calendar._get_gantt_unavailable_intervals(start, end), intervals)
+        self.assertFalse(counts['misses'])
+        self.assertNotEqual(
+            self.resources._get_gantt_unavailable_intervals(start, end)[resource.id],
+            intervals,
+            'The time off of the resource should still be part of its own unavailable intervals.'
+        )
+
+    def test_cache_invalidation_leave_given_to_resource(self):
+        """ A leave of the whole calendar given to a single resource is removed from the cached windows. """
+        calendar = self.calendars[1]
+        start, end = self.weeks[0]
+        leave = self.env['resource.calendar.leaves'].create({
+            'name': 'Company Event',
+            'calendar_id': calendar.id,
+            'date_from': datetime(2024, 1, 3, 0, 0),
+            'date_to': datetime(2024, 1, 4, 0, 0),
+        })
+        intervals = calendar._get_gantt_unavailable_intervals(start, end)
+        leave.resource_id = self.resources.filtered(lambda resource: resource.calendar_id == calendar)[0]
+        self.assertNotEqual(calendar._get_gantt_unavailable_intervals(start, end), intervals)
+        self.assertEqual(
+            calendar._get_gantt_unavailable_intervals(start, end),
+            _non_empty(calendar._unavailable_intervals(start.replace(tzinfo=utc), end.replace(tzinfo=utc))),
+        )
+
+    def test_scroll_hit_rate(self):
+        """ Scroll a gantt view of 500 resources over 12 weeks: once the windows of the weeks are computed,
+            the other scales and the other visits of these weeks are served from the cache.
+        """
+        self.env.registry.clear_cache()
+        with self._count_window_lookups() as counts:
+            for start, end in self.weeks:
+                self.resources._get_gantt_unavailable_intervals(start, end)
+        # each window is only computed once per calendar, whatever the number of resources
+        self.assertLessEqual(counts['misses'], len(self.calendars) * (len(self.weeks) + 1))
+
+        with self._count_window_lookups() as counts:
+            for start, end in reversed(self.weeks):
+                self.resources._get_gantt_unavailable_intervals(start, end)
+            # month scale
+            for month in (1, 2):
+                self.resources._get_gantt_unavailable_intervals(datetime(2024, month, 1), datetime(2024, month + 1, 1))
+            # day scale
+            for day in range(1, 29):
+                self.resources._get_gantt_unavailable_intervals(datetime(2024, 2, day), datetime(2024, 2, day + 1))
+        self.assertTrue(counts['lookups'])
+        hit_rate = 1 - counts['misses'] / counts['lookups']
+        self.assertGreater(hit_rate, 0.9)
@@ -17,13 +17,15 @@ class SignRequest(models.Model):
                     render_values={"request": request, "salesman": self.env.user.partner_id},
                     subtype_xmlid='mail.mt_note',
                 )
+
+    def _send_completed_document(self):
+        super()._send_completed_document()
+        for request in self:
+            if request.sale_order_id:
                 # attach a copy of the signed document to the SO for easy retrieval
-                self.env["ir.attachment"].create(
-                    {
-                        "name": request.reference,
-                        "datas": request.completed_document,
-                        "type": "binary",
-                        "res_model": self.env["sale.order"]._name,
-                        "res_id": request.sale_order_id.id,
-                    }
-                )
+                request._get_completed_document_attachment().copy({
+                    "name": request.reference,
+                    "res_model": self.env["sale.order"]._name,
+                    "res_field": False,
+                    "res_id": request.sale_order_id.id,
+                })
@@ -3,6 +3,7 @@
 
 import base64
 import io
+import logging
 import os
 import time
 import unicodedata
@@ -34,6 +35,11 @@ from odoo.tools import config, email_normalize, get_lang, is_html_empty, format_
 from odoo.exceptions import UserError, ValidationError
 from odoo.tools.misc import hmac
 
+_logger = logging.getLogger(__name__)
+
+# number of cron runs trying to complete a sign request before giving up
+MAX_COMPLETION_ATTEMPTS = 3
+
 TTFSearchPath.append(os.path.join(config["root_path"], "..", "addons", "web", "static", "fonts", "sign"))
 
 
@@ -87,6 +93,8 @@ class SignRequest(models.Model):
     ], default='sent', tracking=True, group_expand='_expand_states', copy=False, index=True)
 
     completed_document = fields.Binary(readonly=True, string="Completed Document", attachment=True, copy=False)
+    queued_for_completion = fields.Boolean(default=False, copy=False)
+    completion_attempt_count = fields.Integer(default=0, copy=False)
 
     nb_wait = fields.Integer(string="Sent Requests", compute="_compute_stats", store=True)
     nb_closed = fields.Integer(string="Completed Signatures", compute="_compute_stats", store=True)
@@ -414,16 +422,70 @@ class SignRequest(models.Model):
             self.env.cr.commit()
         if not self._check_is_encrypted():
             # if the file is encrypted, we must wait that the document is decrypted
-            self._send_completed_document()
+            # otherwise, the document is rendered and sent by the cron, so that the
+            # signer does not wait for it
+            self.queued_for_completion = True
+            self.env.ref('sign.ir_cron_generate_completed_documents')._trigger()
 
     def _check_is_encrypted(self):
         self.ensure_one()
         if not self.template_id.sign_item_ids:
             return False
 
-        old_pdf = PdfFileReader(io.BytesIO(base64.b64decode(self.template_id.attachment_id.datas)), strict=False, overwriteWarnings=False)
+        old_pdf = PdfFileReader(io.BytesIO(self.template_id.attachment_id.raw), strict=False, overwriteWarnings=False)
         return old_pdf.isEncrypted
 
+    def _process_completed_document(self):
+        """ Generate the completed document if needed and send it """
+        self.ensure_one()
+        self._send_completed_document()
+        self.queued_for_completion = False
+
+    def _give_up_completion(self):
+        """ Dequeues the sign request, and warns its sender with an activity that the
+        completed document could not be generated and sent. """
+        self.ensure_one()
+        _logger.error("Giving up completing the sign request %s after %s attempts", self.id, self.completion_attempt_count)
+        self.queued_for_completion = False
+        self.activity_schedule(
+            'mail.mail_activity_data_warning',
+            user_id=self.create_uid.id,
+            summary=_("Completed document not sent"),
+            note=_("The completed document could not be generated and sent to the signers after %s attempts.",
+                   self.completion_attempt_count),
+        )
+
+    @api.model
+    def _cron_generate_completed_documents(self, batch_size=False):
+        """
+        Completes a chunk of batch_size queued sign requests, the ones tried the
+        least first. The cron is triggered again for the remaining ones, so that
+        a run does not hold the cron too long. A request that fails stays queued
+        for the next runs, until MAX_COMPLETION_ATTEMPTS runs failed on it.
+        """
+        batch_size = batch_size or 20
+        domain = [('queued_for_completion', '=', True), ('state', '=', 'signed')]
+        start_time = time.time()
+        completed_count = 0
+        for sign_request in self.search(domain, limit=batch_size, order='completion_attempt_count, id'):
+            try:
+                with self.env.cr.savepoint():
+                    sign_request._process_completed_document()
+                completed_count += 1
+            except Exception:
+                _logger.exception("Could not complete the sign request %s", sign_request.id)
+                sign_request.completion_attempt_count += 1
+                if sign_request.completion_attempt_count >= MAX_COMPLETION_ATTEMPTS:
+                    sign_request._give_up_completion()
+        if completed_count:
+            elapsed_time = time.time() - start_time
+            _logger.info(
+                "Completed %s sign requests in %.2fs (%.2f requests/s)",
+                completed_count, elapsed_time, completed_count / (elapsed_time or 1))
+        if self.search_count(domain, limit=1):
+            self.env.ref('sign.ir_cron_generate_completed_documents')._trigger()
+        return False
+
     def cancel(self):
         for sign_request in self:
             sign_request.write({'access_token': self._default_access_token(), 'state': 'canceled'})
@@ -536,10 +598,10 @@ class SignRequest(models.Model):
         if self.state != 'signed':
             raise UserError(_("The completed document cannot be created because the sign request is not fully signed"))
         if not self.template_id.sign_item_ids:
-            self.completed_document = self.template_id.attachment_id.datas
+            document = self.template_id.attachment_id.raw
         else:
             try:
-                old_pdf = PdfFileReader(io.BytesIO(base64.b64decode(self.template_id.attachment_id.datas)), strict=False, overwriteWarnings=False)
+                old_pdf = PdfFileReader(io.BytesIO(self.template_id.attachment_id.raw), strict=False, overwriteWarnings=False)
                 old_pdf.getNumPages()
             except:
                 raise ValidationError(_("ERROR: Invalid PDF file!"))
@@ -684,12 +746,13 @@ class SignRequest(models.Model):
             except PdfReadError:
                 raise ValidationError(_("There was an issue downloading your document. Please contact an administrator."))
 
-            self.completed_document = base64.b64encode(output.getvalue())
+            document = output.getvalue()
             output.close()
 
+        self._set_completed_document(document)
         attachment = self.env['ir.attachment'].create({
             'name': "%s.pdf" % self.reference if self.reference.split('.')[-1] != 'pdf' else self.reference,
-            'datas': self.completed_document,
+            'raw': document,
             'type': 'binary',
             'res_model': self._name,
             'res_id': self.id,
@@ -718,6 +781,33 @@ class SignRequest(models.Model):
         })
         self.completed_document_attachment_ids = [Command.set([attachment.id, attachment_log.id])]
 
+    def _get_completed_document_attachment(self):
+        """ Attachment storing the completed_document field """
+        self.ensure_one()
+        return self.env['ir.attachment'].sudo().search([
+            ('res_model', '=', self._name),
+            ('res_field', '=', 'completed_document'),
+            ('res_id', '=', self.id),
+        ], limit=1)
+
+    def _set_completed_document(self, document):
+        """ Store the raw completed document in the attachment of the
+        completed_document field, without encoding it in base64 """
+        self.ensure_one()
+        attachment = self._get_completed_document_attachment()
+        if attachment:
+            attachment.raw = document
+        else:
+            self.env['ir.attachment'].sudo().create({
+                'name': 'completed_document',
+                'res_model': self._name,
+                'res_field': 'completed_document',
+                'res_id': self.id,
+                'type': 'binary',
+                'raw': document,
+            })
+        self.invalidate_recordset(['completed_document'])
+
     @api.model
     def _message_send_mail(self, body, email_layout_xmlid, message_values, notif_values, mail_values, force_send=False, **kwargs):
         """ Shortcut to send an email. """
@@ -1,10 +1,15 @@
 # -*- coding: utf-8 -*-
 # Part of Odoo. See LICENSE file for full copyright and licensing details.
 
+import base64
+from unittest.mock import patch
+
 from odoo.tests.common import Form, new_test_user
 from .sign_request_common import SignRequestCommon
 from odoo import Command
+from odoo.addons.sign.models.sign_request import MAX_COMPLETION_ATTEMPTS
 from odoo.exceptions import UserError, ValidationError
+from odoo.tools import mute_logger
 
 
 class TestSignRequest(SignRequestCommon):
@@ -87,6 +92,8 @@ class TestSignRequest(SignRequestCommon):
         sign_request_item._edit_and_sign(self.signature_fake)
         self.assertEqual(sign_request_item.state, 'completed', 'The sign.request.item should be completed')
         self.assertEqual(sign_request_no_item.state, 'signed', 'The sign request should be signed')
+        self.assertTrue(sign_request_no_item.queued_for_completion, 'The completed document should be generated by the cron')
+        self.env['sign.request']._cron_generate_completed_documents()
         self.assertEqual(len(sign_request_no_item.completed_document_attachment_ids), 2, 'The completed document and the certificate should be created')
         self.assertEqual(len(sign_request_no_item.sign_log_ids.filtered(
             lambda log: log.action == 'sign' and log.sign_request_item_id == sign_request_item)),
@@ -318,6 +325,8 @@ class TestSignRequest(SignRequestCommon):
         sign_request_item._edit_and_sign({'-1': value}, new_sign_items={'-1': new_sign_item_config})
         self.assertEqual(sign_request_item.state, 'completed', 'The sign.request.item should be completed')
         self.assertEqual(sign_request_no_item.state, 'signed', 'The sign request should be signed')
+        self.assertTrue(sign_request_no_item.queued_for_completion, 'The completed document should be generated by the cron')
+        self.env['sign.request']._cron_generate_completed_documents()
         self.assertEqual(len(sign_request_no_item.completed_document_attachment_ids), 2, 'The completed document and the certificate should be created')
         self.assertNotEqual(sign_request_no_item.template_id, template, 'An edited sign request should use a different template')
         self.assertEqual(template.sign_item_ids.ids, sign_item_ids, 'The original template should not be changed')
@@ -375,6 +384,8 @@ class TestSignRequest(SignRequestCommon):
         self.assertEqual(sign_request_item_employee.state, 'completed', 'The sign.request.item should be completed')
         self.assertEqual(sign_request_item_company.state, 'completed', 'The sign.request.item should be completed')
         self.assertEqual(sign_request_3_roles.state, 'signed', 'The sign request should be signed')
+        self.assertTrue(sign_request_3_roles.queued_for_completion, 'The completed document should be generated by the cron')
+        self.env['sign.request']._cron_generate_completed_documents()
         self.assertEqual(len(sign_request_3_roles.completed_document_attachment_ids), 2, 'The completed document and the certificate should be created')
         self.assertEqual(len(sign_request_3_roles.sign_log_ids.filtered(
             lambda log: log.action == 'sign' and log.sign_request_item_id == sign_request_item_company)),
@@ -456,3 +467,49 @@ class TestSignRequest(SignRequestCommon):
         wizard = Form(self.env['sign.send.request'].with_context(active_id=self.template_3_roles.id, sign_directly_without_mail=False))
         wizard.set_sign_order = True
         self.assertEqual([record['mail_sent_order'] for record in wizard.signer_ids._records], [1, 2, 3])
+
+    def test_sign_request_queued_completion(self):
+        sign_requests = self.env['sign.request']
+        for partner in (self.partner_1, self.partner_2):
+            sign_request = self.create_sign_request_no_item(signer=partner, cc_partners=self.partner_4)
+            sign_request.request_item_ids._edit_and_sign(self.signature_fake)
+            sign_requests |= sign_request
+        self.assertEqual(sign_requests.mapped('state'), ['signed', 'signed'])
+        self.assertEqual(sign_requests.mapped('queued_for_completion'), [True, True])
+        self.assertFalse(sign_requests.completed_document_attachment_ids)
+
+        cron = self.env.ref('sign.ir_cron_generate_completed_documents')
+        trigger_domain = [('cron_id', '=', cron.id)]
+        trigger_count = self.env['ir.cron.trigger'].search_count(trigger_domain)
+        # one chunk per run, the cron is triggered again for the remaining requests
+        self.env['sign.request']._cron_generate_completed_documents(batch_size=1)
+        self.assertEqual(sign_requests.mapped('queued_for_completion'), [False, True])
+        self.assertEqual(self.env['ir.cron.trigger'].search_count(trigger_domain), trigger_count + 1)
+        self.env['sign.request']._cron_generate_completed_documents(batch_size=1)
+        self.assertEqual(self.env['ir.cron.trigger'].search_count(trigger_domain), trigger_count + 1)
+        for sign_request in sign_requests:
+            self.assertFalse(sign_request.queued_for_completion)
+            self.assertTrue(sign_request.completed_document)
+            self.assertEqual(len(sign_request.completed_document_attachment_ids), 2, 'The completed document and the certificate should be created')
+            self.assertIn(sign_request.template_id.attachment_id.raw, sign_request.completed_document_attachment_ids.mapped('raw'))
+            self.assertEqual(base64.b64decode(sign_request.completed_document), sign_request.template_id.attachment_id.raw)
+
+    @mute_logger('odoo.addons.sign.models.sign_request')
+    def test_sign_request_queued_completion_failure(self):
+        sign_request = self.create_sign_request_no_item(signer=self.partner_1, cc_partners=self.partner_4)
+        sign_request.request_item_ids._edit_and_sign(self.signature_fake)
+        self.assertTrue(sign_request.queued_for_completion)
+
+        SignRequest = self.registry['sign.request']
+        with patch.object(SignRequest, '_send_completed_document', side_effect=UserError('failure')):
+            for attempt in range(1, MAX_COMPLETION_ATTEMPTS + 1):
+                self.env['sign.request']._cron_generate_completed_documents()
+                self.assertEqual(sign_request.completion_attempt_count, attempt)
+                self.assertEqual(sign_request.queued_for_completion, attempt < MAX_COMPLETION_ATTEMPTS)
+        # a request given up on is not tried anymore, and its sender is warned
+        self.env['sign.request']._cron_generate_completed_documents()
+        self.assertEqual(sign_request.completion_attempt_count, MAX_COMPLETION_ATTEMPTS)
+        self.assertFalse(sign_request.completed_document_attachment_ids)
+        activity = sign_request.activity_ids.filtered(
+            lambda activity: activity.activity_type_id == self.env.ref('mail.mail_activity_data_warning'))
+        self.assertEqual(activity.user_id, sign_request.create_uid)
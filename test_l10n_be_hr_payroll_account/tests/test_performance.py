@@ -282,7 +282,7 @@ class TestPayslipValidation(AccountTestInvoicingCommon):
                 'pdf_to_generate': True,
                 'pdf_to_post': True,
             })
-            self.env['hr.payslip']._cron_generate_pdf(batch_size=100)
+            self.env['hr.payroll.employee.declaration']._cron_generate_pdf(batch_size=100)
             # --- X seconds ---
             _logger.info("Declaration 281.10 PDF:--- %s seconds ---", time.time() - start_time)
 
@@ -305,7 +305,7 @@ class TestPayslipValidation(AccountTestInvoicingCommon):
                 'pdf_to_generate': True,
                 'pdf_to_post': True,
             })
-            self.env['hr.payslip']._cron_generate_pdf(batch_size=100)
+            self.env['hr.payroll.employee.declaration']._cron_generate_pdf(batch_size=100)
             # --- X seconds ---
             _logger.info("Declaration 281.45 PDF:--- %s seconds ---", time.time() - start_time)
 
@@ -322,7 +322,7 @@ class TestPayslipValidation(AccountTestInvoicingCommon):
                 'pdf_to_generate': True,
                 'pdf_to_post': True,
             })
-            self.env['hr.payslip']._cron_generate_pdf(batch_size=100)
+            self.env['hr.payroll.employee.declaration']._cron_generate_pdf(batch_size=100)
             # --- X seconds ---
             _logger.info("Individual Accounts PDF:--- %s seconds ---", time.time() - start_time)
 
@@ -2,6 +2,7 @@
 # Part of Odoo. See LICENSE file for full copyright and licensing details.
 
 from freezegun import freeze_time
+from unittest.mock import patch
 
 from odoo.addons.test_marketing_automation.tests.common import TestMACommon
 from odoo.tests import tagged, users
@@ -254,3 +255,64 @@ class MarketingCampaignTest(TestMACommon):
 
         self.assertEqual(campaign.running_participant_count, 4)
         self.assertEqual(campaign.participant_ids.mapped('res_id'), (test_records[0:3] | test_records[-1]).ids)
+
+    @users('user_marketing_automation')
+    @mute_logger('odoo.addons.marketing_automation.models.marketing_activity')
+    def test_activity_server_action_batch(self):
+        """ Server actions run once per trace, unless the activity runs them in
+        batch, in which case they run trace by trace only when the batch fails,
+        without applying the batch twice. """
+        test_records = self.test_records[:3].with_env(self.env)
+        descriptions = [description or '' for description in test_records.mapped('description')]
+        server_action = self.env['ir.actions.server'].sudo().create({
+            'code': """
+if record.description == 'boom':
+    raise UserError('boom')
+record.write({'description': (record.description or '') + ' - done'})""",
+            'model_id': self.env['ir.model']._get_id('marketing.test.sms'),
+            'name': 'Update description',
+            'state': 'code',
+        })
+        campaign = self.env['marketing.campaign'].create({
+            'domain': [('id', 'in', test_records.ids)],
+            'model_id': self.env['ir.model']._get_id('marketing.test.sms'),
+            'name': 'Test Campaign',
+        })
+        activity = self._create_activity(campaign, action=server_action, interval_number=0)
+        self.assertFalse(activity.server_action_batch)
+        campaign.action_start_campaign()
+        campaign.sync_participants()
+
+        ServerAction = self.registry['ir.actions.server']
+        with patch.object(ServerAction, 'run', autospec=True, side_effect=ServerAction.run) as mock_run:
+            activity.execute_on_traces(activity.trace_ids[:2])
+        self.assertEqual(mock_run.call_count, 2)
+        self.assertEqual(activity.trace_ids[:2].mapped('state'), ['processed', 'processed'])
+        self.assertEqual(test_records[:2].mapped('description'), [f'{descriptions[0]} - done', f'{descriptions[1]} - done'])
+
+        test_records[1].description = 'boom'
+        activity.trace_ids[:2].write({'state': 'scheduled'})
+        activity.execute_on_traces(activity.trace_ids)
+        self.assertEqual(activity.trace_ids.mapped('state'), ['processed', 'error', 'processed'])
+        self.assertEqual(
+            test_records.mapped('description'),
+            [f'{descriptions[0]} - done - done', 'boom', f'{descriptions[2]} - done'],
+        )
+
+        # actions handling several records can run once on the whole batch
+        server_action.code = """
+for record in records:
+    if record.description == 'boom':
+        raise UserError('boom')
+    record.write({'description': record.description + ' - batch'})"""
+        activity.server_action_batch = True
+        test_records[1].description = 'fixed'
+        activity.trace_ids.write({'state': 'scheduled'})
+        with patch.object(ServerAction, 'run', autospec=True, side_effect=ServerAction.run) as mock_run:
+            activity.execute_on_traces(activity.trace_ids)
+        self.assertEqual(mock_run.call_count, 1)
+        self.assertEqual(activity.trace_ids.mapped('state'), ['processed', 'processed', 'processed'])
+        self.assertEqual(
+            test_records.mapped('description'),
+            [f'{descriptions[0]} - done - done - batch', 'fixed - batch', f'{descriptions[2]} - done - batch'],
+        )
@@ -28,7 +28,7 @@ class TestUnityWebReadGroupGantt(TransactionCase):
 
     def test_get_gantt_data_without_limit(self):
         self.env.invalidate_all()
-        with self.assertQueryCount(2):  # One for read_group + One for reading name to compute display_name
+        with self.assertQueryCount(2):  # One for the groups and records + One for reading name to compute display_name
             result = self.env['test.web.gantt.pill'].get_gantt_data(
                 [('id', 'in', self.pills.ids)], [], {'display_name': {}},
             )
@@ -46,7 +46,7 @@ class TestUnityWebReadGroupGantt(TransactionCase):
             })
 
         self.env.invalidate_all()
-        # 1 SQL for read_group + 1 SQL for reading name of groups + 1 SQL reading records
+        # 1 SQL for the groups and records + 1 SQL for reading name of groups + 1 SQL reading records
         with self.assertQueryCount(3):
             result = self.env['test.web.gantt.pill'].get_gantt_data(
                 [('id', 'in', self.pills.ids)], ['dependency_field'], {'display_name': {}},
@@ -97,9 +97,9 @@ class TestUnityWebReadGroupGantt(TransactionCase):
 
     def test_get_gantt_data_with_limit(self):
         self.env.invalidate_all()
-        # 1 SQL for read_group + 1 SQL to count the number of group (because limit isn't reached)
+        # 1 SQL for the groups, their records and the number of groups
         # + 1 SQL for reading name of parent_id + 1 SQL reading records
-        with self.assertQueryCount(4):  # One for read_group + One for reading name (+order)
+        with self.assertQueryCount(3):
             result = self.env['test.web.gantt.pill'].get_gantt_data(
                 [('id', 'in', self.pills.ids)], ['parent_id', 'name'], {'display_name': {}}, limit=2
             )
@@ -124,9 +124,9 @@ class TestUnityWebReadGroupGantt(TransactionCase):
             })
 
         self.env.invalidate_all()
-        # 1 SQL for read_group + 1 SQL to count the number of group (because limit isn't reached)
+        # 1 SQL for the groups, their records and the number of groups
         # + 1 SQL for reading name of parent_id + 1 SQL reading records
-        with self.assertQueryCount(4):
+        with self.assertQueryCount(3):
             result = self.env['test.web.gantt.pill'].get_gantt_data(
                 [('id', 'in', self.pills.ids)], ['parent_id', 'name'], {'display_name': {}}, limit=2, offset=1,
             )
@@ -150,3 +150,54 @@ class TestUnityWebReadGroupGantt(TransactionCase):
                 ],
                 'length': 5,
             })
+
+    def test_get_gantt_data_with_group_record_limit(self):
+        self.env.invalidate_all()
+        with self.assertQueryCount(3):
+            result = self.env['test.web.gantt.pill'].get_gantt_data(
+                [('id', 'in', self.pills.ids)], ['parent_id'], {'display_name': {}}, group_record_limit=2,
+            )
+            self.assertEqual(result, {
+                'groups': [
+                    {
+                        'parent_id': (self.pill_1.id, 'PillParent1'),
+                        '__record_ids': [self.pills[0].id, self.pills[5].id],
+                        '__record_count': 2,
+                        '__next_record_offset': False,
+                    },
+                    {
+                        'parent_id': (self.pill_2.id, 'PillParent2'),
+                        '__record_ids': [self.pills[1].id, self.pills[2].id],
+                        '__record_count': 4,
+                        '__next_record_offset': 2,
+                    },
+                ],
+                'records': [
+                    {'id': self.pills[0].id, 'display_name': 'one'},
+                    {'id': self.pills[1].id, 'display_name': 'two'},
+                    {'id': self.pills[2].id, 'display_name': 'there'},
+                    {'id': self.pills[5].id, 'display_name': 'six'},
+                ],
+                'length': 2,
+            })
+
+        # load the next records of the second group, the first group is kept without records
+        result = self.env['test.web.gantt.pill'].get_gantt_data(
+            [('id', 'in', self.pills.ids)], ['parent_id'], {'display_name': {}},
+            group_record_limit=2, group_record_offset=2,
+        )
+        self.assertEqual(result['groups'], [
+            {
+                'parent_id': (self.pill_1.id, 'PillParent1'),
+                '__record_ids': [],
+                '__record_count': 2,
+                '__next_record_offset': False,
+            },
+            {
+                'parent_id': (self.pill_2.id, 'PillParent2'),
+                '__record_ids': [self.pills[3].id, self.pills[4].id],
+                '__record_count': 4,
+                '__next_record_offset': False,
+            },
+        ])
+        self.assertEqual([record['id'] for record in result['records']], self.pills[3:5].ids)
@@ -418,3 +418,73 @@ class TestWebGanttReschedule(TestWebGantt):
             self.pill_4_slave_in_conflict[self.date_start_field_name], self.pill_4_slave_in_conflict_start_date,
             'Pill in conflict with Pill 4 should not have been rescheduled.'
         )
+
+    def test_cascade_long_chain(self):
+        """ This test purpose is to ensure that a long chain of dependencies is rescheduled in one pass, without
+            recursion, and that its dates are all updated.
+        """
+        chain_length = 10000
+        chain_start_date = self.pill_4_stop_date + timedelta(days=1)
+        chain = self.TestWebGanttPill.create([{
+            'name': f'Chain Pill {index}',
+            self.date_start_field_name: chain_start_date + timedelta(hours=index),
+            self.date_stop_field_name: chain_start_date + timedelta(hours=index + 1),
+        } for index in range(chain_length)])
+        # Each pill of the chain depends on the previous one, the first one depends on Pill 4.
+        self.env.cr.execute(
+            "INSERT INTO web_gantt_test_pill_dep (slave, master) SELECT UNNEST(%s), UNNEST(%s)",
+            [chain.ids, [self.pill_4.id] + chain.ids[:-1]],
+        )
+        self.env.invalidate_all()
+
+        result = self.gantt_reschedule_backward(self.pill_4, chain[0])
+        self.assertTrue(result is True, 'The whole chain should have been rescheduled.')
+        self.assertEqual(chain[0][self.date_start_field_name], self.pill_4_stop_date)
+        self.assertEqual(
+            chain[-1][self.date_stop_field_name], self.pill_4_stop_date + timedelta(hours=chain_length),
+            'The reschedule should have cascaded up to the end of the chain.'
+        )
+        self.assertTrue(all(
+            master[self.date_stop_field_name] == slave[self.date_start_field_name]
+            for master, slave in zip(chain, chain[1:])
+        ), 'Each pill of the chain should move backward up to the end of the previous one.')
+
+    def test_circular_dependencies(self):
+        """ This test purpose is to ensure that circular dependencies are reported and that only the first move is
+            performed.
+        """
+        self.pill_1[self.dependency_field_name] = [Command.link(self.pill_4.id)]
+        result = self.gantt_reschedule_backward(self.pill_2, self.pill_3)
+        self.assertTrue(
+            result and result['type'] == 'ir.actions.client' and result['params']['type'] == 'warning',
+            'The rescheduling should return a notification when the dependencies are circular.'
+        )
+        self.assertEqual(
+            self.pill_3[self.date_start_field_name], self.pill_2[self.date_stop_field_name],
+            'The first move should be saved when the dependencies are circular.'
+        )
+        self.assertEqual(
+            (self.pill_4[self.date_start_field_name], self.pill_4[self.date_stop_field_name]),
+            (self.pill_4_start_date, self.pill_4_stop_date),
+            'Pill 4 should not have been rescheduled.'
+        )
+
+    def test_circular_dependencies_not_reached(self):
+        """ This test purpose is to ensure that circular dependencies which are not reached by the rescheduling do not
+            prevent it.
+        """
+        pill_5_start_date = self.pill_4_stop_date + timedelta(days=1)
+        pill_5 = self.create_pill('Pill 5', pill_5_start_date, pill_5_start_date + timedelta(hours=8), [self.pill_1.id])
+        pill_6_start_date = pill_5_start_date + timedelta(days=1)
+        pill_6 = self.create_pill('Pill 6', pill_6_start_date, pill_6_start_date + timedelta(hours=8), [pill_5.id])
+        pill_5[self.dependency_field_name] = [Command.link(pill_6.id)]
+        result = self.gantt_reschedule_backward(self.pill_3, self.pill_4)
+        self.assertTrue(result is True, 'A cycle that is not reached should not prevent the rescheduling.')
+        self.assertEqual(
+            self.pill_4[self.date_start_field_name], self.pill_3[self.date_stop_field_name],
+            'Pill 4 should have been rescheduled.'
+        )
+        self.assertEqual(
+            pill_5[self.date_start_field_name], pill_5_start_date,
+            'Pill 5 should not have been rescheduled.'
+        )
@@ -6,7 +6,6 @@ import re
 from datetime import datetime, timedelta
 from dateutil.relativedelta import relativedelta
 from dateutil.rrule import SU
-from collections import defaultdict
 
 from odoo import tools, models, fields, api, _
 from odoo.addons.resource.models.utils import make_aware
@@ -14,6 +13,11 @@ from odoo.addons.resource.models.utils import filter_domain_leaf
 from odoo.exceptions import UserError, AccessError
 from odoo.osv import expression
 
+from .timesheet_grid_cell import GRID_CELL_FIELDS, TIMESHEET_GRID_CELL_FIELDS
+
+# aggregates of the timesheets which can be answered by the grid cells
+GRID_CELL_AGGREGATES = ('__count', 'unit_amount:sum', 'validated:bool_and', 'id:array_agg')
+
 
 class AnalyticLine(models.Model):
     _name = 'account.analytic.line'
@@ -139,22 +143,58 @@ class AnalyticLine(models.Model):
                 line.user_can_validate = False
 
     def _update_last_validated_timesheet_date(self):
-        max_date_per_employee = {
-            employee: employee.sudo().last_validated_timesheet_date
-            for employee in self.employee_id
-        }
-        for timesheet in self:
-            max_date = max_date_per_employee[timesheet.employee_id]
-            if not max_date or max_date < timesheet.date:
-                max_date_per_employee[timesheet.employee_id] = timesheet.date
-
-        employee_ids_per_date = defaultdict(list)
-        for employee, max_date in max_date_per_employee.items():
-            if not employee.last_validated_timesheet_date or (max_date and employee.last_validated_timesheet_date < max_date):
-                employee_ids_per_date[max_date].append(employee.id)
-
-        for date, employee_ids in employee_ids_per_date.items():
-            self.env['hr.employee'].sudo().browse(employee_ids).write({'last_validated_timesheet_date': date})
+        """ Move the last validated timesheet date of the employees of the timesheets in self forward to the latest
+        date of their timesheets, in a single query. """
+        if not self:
+            return
+        self.flush_recordset(['employee_id', 'date'])
+        self.env['hr.employee'].flush_model(['last_validated_timesheet_date'])
+        self.env.cr.execute("""
+            UPDATE hr_employee employee
+               SET last_validated_timesheet_date = timesheet.max_date,
+                   write_uid = %(uid)s,
+                   write_date = NOW() AT TIME ZONE 'UTC'
+              FROM (
+                      SELECT employee_id, MAX(date) AS max_date
+                        FROM account_analytic_line
+                       WHERE id = ANY(%(ids)s)
+                         AND employee_id IS NOT NULL
+                    GROUP BY employee_id
+                   ) timesheet
+             WHERE employee.id = timesheet.employee_id
+               AND (employee.last_validated_timesheet_date IS NULL
+                    OR employee.last_validated_timesheet_date < timesheet.max_date)
+         RETURNING employee.id
+        """, {'uid': self.env.uid, 'ids': self.ids})
+        employee_ids = [employee_id for employee_id, in self.env.cr.fetchall()]
+        self.env['hr.employee'].browse(employee_ids).invalidate_recordset(['last_validated_timesheet_date', 'write_uid', 'write_date'])
+
+    def _get_running_timesheets_before_validation(self):
+        """ Return the timesheets with a running timer of the employees of the timesheets in self, dated before the
+        last validated timesheet date the employee will have once self is validated. """
+        if not self:
+            return self.browse()
+        self.flush_recordset(['employee_id', 'date'])
+        self.env['hr.employee'].flush_model(['last_validated_timesheet_date'])
+        self.env['timer.timer'].flush_model(['res_model', 'res_id', 'timer_start', 'timer_pause'])
+        self.env.cr.execute("""
+            WITH validation AS (
+                  SELECT employee_id, MAX(date) AS max_date
+                    FROM account_analytic_line
+                   WHERE id = ANY(%(ids)s)
+                     AND employee_id IS NOT NULL
+                GROUP BY employee_id
+            )
+            SELECT timesheet.id
+              FROM account_analytic_line timesheet
+              JOIN validation ON validation.employee_id = timesheet.employee_id
+              JOIN hr_employee employee ON employee.id = timesheet.employee_id
+              JOIN timer_timer timer ON timer.res_model = %(model)s AND timer.res_id = timesheet.id
+             WHERE timesheet.date < GREATEST(employee.last_validated_timesheet_date, validation.max_date)
+               AND timer.timer_start IS NOT NULL
+               AND timer.timer_pause IS NULL
+        """, {'ids': self.ids, 'model': self._name})
+        return self.browse(timesheet_id for timesheet_id, in self.env.cr.fetchall())
 
     @api.model
     def _search_last_validated_timesheet_date(self, employee_ids):
@@ -198,18 +238,13 @@ class AnalyticLine(models.Model):
             })
             return notification
 
-        analytic_lines._stop_all_users_timer()
+        # Interrupt the timers of the timesheets to validate, and of the timesheets with a timer running that will
+        # be before the last validated date of their employee
+        running_analytic_lines = analytic_lines._get_running_timesheets_before_validation()
+        (analytic_lines | running_analytic_lines)._stop_all_users_timer()
 
         analytic_lines.sudo().write({'validated': True})
         analytic_lines._update_last_validated_timesheet_date()
-        # Interrupt the timesheet with a timer running that is before the last validated date for each employee
-        running_analytic_lines = self.env['account.analytic.line'].search([
-            ('employee_id', 'in', analytic_lines.employee_id.ids),
-            ('date', '<', max(analytic_lines.employee_id.sudo().mapped('last_validated_timesheet_date'))),
-            ('is_timer_running', '=', True),
-        ])
-        running_analytic_lines.filtered(
-            lambda aal: aal.date < aal.employee_id.last_validated_timesheet_date)._stop_all_users_timer()
         if self.env.context.get('use_notification', True):
             notification['params'].update({
                 'message': _("The timesheets have successfully been validated."),
@@ -362,7 +397,24 @@ class AnalyticLine(models.Model):
 
         self.check_if_allowed(delete=True)
 
+    @api.model
+    def _create(self, data_list):
+        records = super()._create(data_list)
+        self.env['timesheet.grid.cell']._add_timesheets(records.ids)
+        return records
+
+    def _write(self, vals):
+        if not any(field_name in vals for field_name in TIMESHEET_GRID_CELL_FIELDS):
+            return super()._write(vals)
+        # move the timesheets from the cells of their former values to the cells of their new values
+        self.env['timesheet.grid.cell']._add_timesheets(self.ids, sign=-1)
+        res = super()._write(vals)
+        self.env['timesheet.grid.cell']._add_timesheets(self.ids)
+        return res
+
     def unlink(self):
+        self.flush_recordset(TIMESHEET_GRID_CELL_FIELDS)
+        self.env['timesheet.grid.cell']._add_timesheets(self.ids, sign=-1)
         res = super(AnalyticLine, self).unlink()
         self.env['timer.timer'].search([
             ('res_model', '=', self._name),
@@ -401,6 +453,78 @@ class AnalyticLine(models.Model):
             cell_field: change,
         }
 
+    @api.model
+    def _get_grid_cell_domain(self, domain):
+        """ Get the domain to apply on the grid cells to get the groups of the timesheets matching `domain`, or None
+            if the grid cells can't answer it. Only the timesheet grid asks for them, with the `timesheet_grid_cells`
+            context key, the other reports read the timesheets. The domain has to be restricted to the lines with a
+            project, and all its conditions and the record rules of the user have to be on fields copied on the grid
+            cells.
+        """
+        if not self.env.context.get('timesheet_grid_cells'):
+            return None
+        rule_domain = [] if self.env.su else self.env['ir.rule']._compute_domain(self._name, 'read')
+        domain = expression.normalize_domain(domain)
+        top_level_leaves = []
+
+        def parse(index, top_level):
+            token = domain[index]
+            if token in (expression.AND_OPERATOR, expression.OR_OPERATOR):
+                index = parse(index + 1, top_level and token == expression.AND_OPERATOR)
+                return parse(index, top_level and token == expression.AND_OPERATOR)
+            if token == expression.NOT_OPERATOR:
+                return parse(index + 1, False)
+            if top_level:
+                top_level_leaves.append(tuple(token))
+            return index + 1
+
+        parse(0, True)
+        if ('project_id', '!=', False) not in top_level_leaves:
+            return None
+        for leaf in domain + expression.normalize_domain(rule_domain):
+            if expression.is_leaf(leaf) and leaf not in (expression.TRUE_LEAF, expression.FALSE_LEAF) \
+                    and leaf[0].split('.')[0] not in GRID_CELL_FIELDS:
+                return None
+        return expression.AND([domain, rule_domain])
+
+    @api.model
+    def _read_group(self, domain, groupby=(), aggregates=(), having=(), offset=0, limit=None, order=None):
+        """ Answer the read_group of the timesheet grid from the grid cells when possible """
+        if having or any(spec.split(':')[0] not in GRID_CELL_FIELDS for spec in groupby) \
+                or any(aggregate not in GRID_CELL_AGGREGATES for aggregate in aggregates) \
+                or (order and any(term.split()[0].split(':')[0] not in GRID_CELL_FIELDS for term in order.split(','))):
+            return super()._read_group(domain, groupby, aggregates, having, offset, limit, order)
+        cell_domain = self._get_grid_cell_domain(domain)
+        if cell_domain is None:
+            return super()._read_group(domain, groupby, aggregates, having, offset, limit, order)
+
+        self.check_access_rights('read')
+        # the pending changes of the timesheets are applied to the grid cells when flushed
+        self.flush_model(TIMESHEET_GRID_CELL_FIELDS)
+        groups = self.env['timesheet.grid.cell'].sudo()._read_group(
+            cell_domain, groupby, ['line_count:sum', 'unit_amount:sum', 'validated_count:sum', 'id:array_agg'],
+            offset=offset, limit=limit, order=order,
+        )
+        line_ids_per_cell_id = {}
+        if 'id:array_agg' in aggregates:
+            cell_ids = [cell_id for *dummy, cell_ids in groups for cell_id in cell_ids or []]
+            self.env.cr.execute("SELECT id, line_ids FROM timesheet_grid_cell WHERE id = ANY(%s)", [cell_ids])
+            line_ids_per_cell_id = dict(self.env.cr.fetchall())
+
+        result = []
+        for *group_values, line_count, unit_amount, validated_count, cell_ids in groups:
+            aggregate_values = {
+                '__count': line_count,
+                'unit_amount:sum': unit_amount,
+                'validated:bool_and': bool(line_count) and validated_count == line_count,
+                'id:array_agg': [line_id for cell_id in cell_ids or [] for line_id in line_ids_per_cell_id[cell_id]],
+            }
+            result.append((
+                *(value.with_env(self.env) if isinstance(value, models.BaseModel) else value for value in group_values),
+                *(aggregate_values[aggregate] for aggregate in aggregates),
+            ))
+        return result
+
     def _group_expand_employee_ids(self, employees, domain, order):
         """ Group expand by employee_ids in grid view
 
@@ -458,6 +582,11 @@ class AnalyticLine(models.Model):
             order = 'employee_id desc'
         else:
             order = None
+        # the lines of projects allowing timesheets all have a project, which allows to answer from the grid cells
+        cell_domain = self._get_grid_cell_domain(expression.AND([[('project_id', '!=', False)], domain_search]))
+        if cell_domain is not None:
+            self.flush_model(TIMESHEET_GRID_CELL_FIELDS)
+            return self.env['timesheet.grid.cell'].sudo().search(cell_domain, order=order).employee_id.with_env(self.env)
         return self.search(domain_search, order=order).employee_id
 
     def _get_last_week(self):
@@ -576,9 +705,10 @@ class AnalyticLine(models.Model):
             raise UserError(_('Sorry, you cannot use a timer for a validated timesheet'))
         timers = self.env['timer.timer'].sudo().search([('res_id', 'in', self.ids), ('res_model', '=', self._name)])
         for timer in timers:
-            minutes_spent = timer.action_timer_stop()
+            minutes_spent = timer.timer_start and timer._get_minutes_spent()
             self.env["account.analytic.line"].browse(timer.res_id).sudo()._add_timesheet_time(minutes_spent, try_to_match)
-            timer.unlink()
+        # the timers are removed all at once, there is no need to stop them first
+        timers.unlink()
 
     def action_timer_unlink(self):
         """ Action unlink the timer of the current timesheet
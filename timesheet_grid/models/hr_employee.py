@@ -1,10 +1,10 @@
 # -*- coding: utf-8 -*-
 # Part of Odoo. See LICENSE file for full copyright and licensing details.
 from datetime import datetime, time, timedelta
-from pytz import UTC
+from pytz import UTC, timezone
 
 from odoo import api, fields, models, _
-from odoo.tools import float_round
+from odoo.tools import float_compare, float_round
 from odoo.addons.resource.models.utils import sum_intervals, HOURS_PER_DAY
 from odoo.exceptions import UserError
 
@@ -26,6 +26,51 @@ class Employee(models.Model):
 
         return employees_work_days_data
 
+    def _get_working_hours_per_employee(self, date_start, date_stop, intervals_cache=None):
+        """ Get the working hours of the employees in self for the period `date_start` - `date_stop` (inclusives).
+            The work intervals are computed once per calendar, timezone and period, and shared by the employees
+            working with the same calendar during the whole period, without personal leaves. The working hours of
+            the other employees are computed from the intervals of their own resource.
+            :param intervals_cache: dict mapping (calendar id, tz, date_start, date_stop) to the working hours, to
+                share them between several calls
+            :returns dict: a dict mapping the employee ids with their working hours
+        """
+        if intervals_cache is None:
+            intervals_cache = {}
+        start_datetime = datetime.combine(fields.Date.from_string(date_start), time.min).replace(tzinfo=UTC)
+        end_datetime = datetime.combine(fields.Date.from_string(date_stop), time.max).replace(tzinfo=UTC)
+        period_hours = (end_datetime - start_datetime).total_seconds() / 3600
+
+        resources = self.sudo().resource_id
+        calendars_validity = resources._get_calendars_validity_within_period(start_datetime, end_datetime)
+        resource_ids_with_leaves = set(self.env['resource.calendar.leaves'].sudo().search_fetch([
+            ('resource_id', 'in', resources.ids),
+            ('date_from', '<=', end_datetime.replace(tzinfo=None)),
+            ('date_to', '>=', start_datetime.replace(tzinfo=None)),
+        ], ['resource_id']).resource_id.ids)
+
+        result = {}
+        employees_without_shared_intervals = self.browse()
+        for employee in self:
+            resource = employee.sudo().resource_id
+            calendar = employee.sudo().resource_calendar_id
+            validity = calendars_validity[resource.id]
+            if resource.id in resource_ids_with_leaves or list(validity) != [calendar] \
+                    or float_compare(sum_intervals(validity[calendar]), period_hours, precision_digits=2) < 0:
+                employees_without_shared_intervals |= employee
+                continue
+            key = (calendar.id, resource.tz, date_start, date_stop)
+            if key not in intervals_cache:
+                work_intervals = calendar._work_intervals_batch(start_datetime, end_datetime, tz=timezone(resource.tz))
+                intervals_cache[key] = sum_intervals(work_intervals[False])
+            result[employee.id] = intervals_cache[key]
+
+        if employees_without_shared_intervals:
+            employees_work_days_data = self._get_employees_working_hours(employees_without_shared_intervals, date_start, date_stop)
+            for employee in employees_without_shared_intervals:
+                result[employee.id] = sum_intervals(employees_work_days_data[employee.resource_id.id])
+        return result
+
     def _get_timesheet_manager_id_domain(self):
         group = self.env.ref('hr_timesheet.group_hr_timesheet_approver', raise_if_not_found=False)
         return [('groups_id', 'in', [group.id])] if group else []
@@ -49,11 +94,12 @@ class Employee(models.Model):
             elif not employee.timesheet_manager_id:
                 employee.timesheet_manager_id = False
 
-    def get_timesheet_and_working_hours(self, date_start, date_stop):
+    def get_timesheet_and_working_hours(self, date_start, date_stop, intervals_cache=None):
         """ Get the difference between the supposed working hour (based on resource calendar) and
             the timesheeted hours, for the given period `date_start` - `date_stop` (inclusives).
             :param date_start: start date of the period to check (date string)
             :param date_stop: end date of the period to check (date string)
+            :param intervals_cache: cache of the working hours shared between calls, see `_get_working_hours_per_employee`
             :returns dict: a dict mapping the employee_id with his timesheeted and working hours for the
                 given period.
         """
@@ -72,10 +118,9 @@ class Employee(models.Model):
         for data_row in self.env.cr.dictfetchall():
             result[data_row['employee_id']]['timesheet_hours'] = float_round(data_row['amount_sum'], 2)
 
-        employees_work_days_data = self._get_employees_working_hours(employees, date_start, date_stop)
+        working_hours_per_employee = employees._get_working_hours_per_employee(date_start, date_stop, intervals_cache)
         for employee in employees:
-            working_hours = sum_intervals(employees_work_days_data[employee.resource_id.id])
-            result[employee.id]['working_hours'] = float_round(working_hours, 2)
+            result[employee.id]['working_hours'] = float_round(working_hours_per_employee[employee.id], 2)
         return result
 
     @api.model
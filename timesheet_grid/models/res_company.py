@@ -87,18 +87,20 @@ class Company(models.Model):
         """
         today_max = fields.Datetime.to_string(datetime.combine(date.today(), time.max))
         companies = self.search([('timesheet_mail_employee_allow', '=', True), ('timesheet_mail_employee_nextdate', '<', today_max)])
+        # the working hours are shared between the employees of all the companies having the same calendar and period
+        intervals_cache = {}
         for company in companies:
             if company.timesheet_mail_employee_nextdate < fields.Datetime.today():
                 _logger.warning('The cron "Timesheet: Employees Email Reminder" should have run on %s' % company.timesheet_mail_employee_nextdate)
 
             # get the employee that have at least a timesheet for the last 3 months
             # and that are still active; don't spam retired users
-            users = self.env['account.analytic.line'].search([
+            users = self.env['res.users'].concat(*(user for [user] in self.env['account.analytic.line']._read_group([
                 ('date', '>=', fields.Date.to_string(date.today() - relativedelta(months=3))),
                 ('date', '<=', fields.Date.today()),
                 ('is_timesheet', '=', True),
                 ('company_id', '=', company.id),
-            ]).mapped('user_id').filtered('active')
+            ], ['user_id']))).filtered('active')
 
             # calculate the period
             if company.timesheet_mail_employee_interval == 'months':
@@ -113,7 +115,7 @@ class Company(models.Model):
 
             # get the related employees timesheet status for the cron period
             employees = self.env['hr.employee'].search([('user_id', 'in', users.ids)])
-            work_hours_struct = employees.get_timesheet_and_working_hours(date_start, date_stop)
+            work_hours_struct = employees.get_timesheet_and_working_hours(date_start, date_stop, intervals_cache=intervals_cache)
 
             for employee in employees:
                 if employee.user_id and work_hours_struct[employee.id]['timesheet_hours'] < work_hours_struct[employee.id]['working_hours']:
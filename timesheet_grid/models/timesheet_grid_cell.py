@@ -0,0 +1,130 @@
+# -*- coding: utf-8 -*-
+# Part of Odoo. See LICENSE file for full copyright and licensing details.
+
+import logging
+
+from odoo import api, fields, models
+
+_logger = logging.getLogger(__name__)
+
+# fields of the timesheets copied on the grid cells, the domains on these fields apply as is on the cells
+GRID_CELL_FIELDS = ('employee_id', 'project_id', 'task_id', 'company_id', 'date')
+# fields of the timesheets changing the grid cells
+TIMESHEET_GRID_CELL_FIELDS = GRID_CELL_FIELDS + ('unit_amount', 'validated')
+
+
+class TimesheetGridCell(models.Model):
+    _name = 'timesheet.grid.cell'
+    _description = 'Timesheet Grid Cell'
+    _log_access = False
+
+    # Hours of the timesheets for each employee, project, task and day. They are kept up to date with delta
+    # updates when timesheets are created, written or deleted, and used to answer the read_group of the grid.
+    # The ids of the timesheets of a cell are kept in the line_ids column, which is not a field.
+    employee_id = fields.Many2one('hr.employee', required=True, readonly=True, ondelete='cascade')
+    project_id = fields.Many2one('project.project', required=True, readonly=True, ondelete='cascade')
+    task_id = fields.Many2one('project.task', readonly=True, ondelete='cascade')
+    company_id = fields.Many2one('res.company', required=True, readonly=True, ondelete='cascade')
+    date = fields.Date(required=True, readonly=True)
+    unit_amount = fields.Float(readonly=True)
+    line_count = fields.Integer(readonly=True)
+    validated_count = fields.Integer(readonly=True)
+
+    def init(self):
+        super().init()
+        self.env.cr.execute("ALTER TABLE timesheet_grid_cell ADD COLUMN IF NOT EXISTS line_ids int4[] NOT NULL DEFAULT '{}'")
+        self.env.cr.execute("""
+            CREATE UNIQUE INDEX IF NOT EXISTS timesheet_grid_cell_key_idx
+                ON timesheet_grid_cell (employee_id, project_id, COALESCE(task_id, 0), company_id, date)
+        """)
+        self.env.cr.execute("SELECT 1 FROM timesheet_grid_cell LIMIT 1")
+        if not self.env.cr.fetchone():
+            self._rebuild()
+
+    @api.model
+    def _get_timesheet_aggregate_query(self, where="TRUE", sign=1):
+        return f"""
+            SELECT employee_id, project_id, task_id, company_id, date,
+                   {sign} * COALESCE(SUM(unit_amount), 0),
+                   {sign} * COUNT(*),
+                   {sign} * COUNT(*) FILTER (WHERE validated),
+                   ARRAY_AGG(id ORDER BY id)
+              FROM account_analytic_line
+             WHERE project_id IS NOT NULL
+               AND employee_id IS NOT NULL
+               AND {where}
+          GROUP BY employee_id, project_id, task_id, company_id, date
+        """
+
+    @api.model
+    def _add_timesheets(self, timesheet_ids, sign=1):
+        """ Add (sign=1) or remove (sign=-1) the timesheets to/from their cells, as they are in the database. """
+        if not timesheet_ids:
+            return
+        if sign > 0:
+            line_ids = "cell.line_ids || EXCLUDED.line_ids"
+        else:
+            line_ids = "ARRAY(SELECT UNNEST(cell.line_ids) EXCEPT SELECT UNNEST(EXCLUDED.line_ids))"
+        self.env.cr.execute(f"""
+            INSERT INTO timesheet_grid_cell AS cell (employee_id, project_id, task_id, company_id, date,
+                                                     unit_amount, line_count, validated_count, line_ids)
+                 {self._get_timesheet_aggregate_query("id = ANY(%s)", sign)}
+            ON CONFLICT (employee_id, project_id, (COALESCE(task_id, 0)), company_id, date) DO UPDATE
+                    SET unit_amount = cell.unit_amount + EXCLUDED.unit_amount,
+                        line_count = cell.line_count + EXCLUDED.line_count,
+                        validated_count = cell.validated_count + EXCLUDED.validated_count,
+                        line_ids = {line_ids}
+              RETURNING id, line_count
+        """, [list(timesheet_ids)])
+        empty_cell_ids = [cell_id for cell_id, line_count in self.env.cr.fetchall() if line_count <= 0]
+        if empty_cell_ids:
+            self.env.cr.execute("DELETE FROM timesheet_grid_cell WHERE id = ANY(%s)", [empty_cell_ids])
+        self.invalidate_model()
+
+    @api.model
+    def _rebuild(self):
+        """ Recompute all the cells from the timesheets. """
+        self.env['account.analytic.line'].flush_model(TIMESHEET_GRID_CELL_FIELDS)
+        self.env.cr.execute("DELETE FROM timesheet_grid_cell")
+        self.env.cr.execute(f"""
+            INSERT INTO timesheet_grid_cell (employee_id, project_id, task_id, company_id, date,
+                                             unit_amount, line_count, validated_count, line_ids)
+                 {self._get_timesheet_aggregate_query()}
+        """)
+        self.invalidate_model()
+
+    @api.model
+    def _check_consistency(self, rebuild=False):
+        """ Compare the cells with the timesheets, and rebuild the cells if they differ and `rebuild` is set.
+
+            :returns: the list of (employee_id, project_id, task_id, company_id, date) of the inconsistent cells
+        """
+        self.env['account.analytic.line'].flush_model(TIMESHEET_GRID_CELL_FIELDS)
+        self.env.cr.execute(f"""
+            WITH expected (employee_id, project_id, task_id, company_id, date,
+                           unit_amount, line_count, validated_count, line_ids) AS (
+                {self._get_timesheet_aggregate_query()}
+            )
+            SELECT COALESCE(expected.employee_id, cell.employee_id),
+                   COALESCE(expected.project_id, cell.project_id),
+                   COALESCE(expected.task_id, cell.task_id),
+                   COALESCE(expected.company_id, cell.company_id),
+                   COALESCE(expected.date, cell.date)
+              FROM expected
+         FULL JOIN timesheet_grid_cell cell
+                ON cell.employee_id = expected.employee_id
+               AND cell.project_id = expected.project_id
+               AND COALESCE(cell.task_id, 0) = COALESCE(expected.task_id, 0)
+               AND cell.company_id = expected.company_id
+               AND cell.date = expected.date
+             WHERE ROUND(expected.unit_amount::numeric, 6) IS DISTINCT FROM ROUND(cell.unit_amount::numeric, 6)
+                OR expected.line_count IS DISTINCT FROM cell.line_count
+                OR expected.validated_count IS DISTINCT FROM cell.validated_count
+                OR expected.line_ids IS DISTINCT FROM ARRAY(SELECT UNNEST(cell.line_ids) ORDER BY 1)
+        """)
+        inconsistent_keys = self.env.cr.fetchall()
+        if inconsistent_keys:
+            _logger.warning("%s inconsistent timesheet grid cells%s", len(inconsistent_keys), ", rebuilding them" if rebuild else "")
+            if rebuild:
+                self._rebuild()
+        return inconsistent_keys
@@ -21,6 +21,14 @@ export class TimesheetGridDataPoint extends GridDataPoint {
         ];
     }
 
+    /**
+     * @override
+     */
+    get readGroupContext() {
+        // the timesheet groups of the grid are read from the grid cells
+        return { ...super.readGroupContext, timesheet_grid_cells: true };
+    }
+
     async _initialiseData() {
         await super._initialiseData();
         this.data.workingHours = {};
@@ -68,7 +76,7 @@ export class TimesheetGridDataPoint extends GridDataPoint {
                 Domain.and([this.searchParams.domain, previouslyTimesheetedDomain]).toList({}),
                 this.fields,
                 this.groupByFields,
-                { lazy: false }
+                { lazy: false, context: this.readGroupContext }
             )
             .then((readGroupResults) => {
                 const additionalData = {};
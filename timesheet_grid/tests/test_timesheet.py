@@ -130,6 +130,101 @@ class TestTimesheetValidation(TestCommonTimesheet, MockEmail):
         # Check if time spent is add to the validated timesheet
         self.assertGreater(timesheet.unit_amount, start_unit_amount, 'The unit amount has to be greater than at the beginning')
 
+    def test_timesheet_validation_query_count(self):
+        """ The number of queries to validate timesheets doesn't depend on the number of employees and timesheets """
+        today = fields.Date.today()
+
+        def create_timesheets(employee_count, timesheet_count):
+            employees = self.env['hr.employee'].create([{
+                'name': f'Employee {i}',
+                'timesheet_manager_id': self.user_manager.id,
+            } for i in range(employee_count)])
+            timesheets = self.env['account.analytic.line'].create([{
+                'name': f'Timesheet {i}',
+                'project_id': self.project_customer.id,
+                'employee_id': employees[i % employee_count].id,
+                'date': today - timedelta(days=i % 7 + 1),
+                'unit_amount': 1.0,
+            } for i in range(timesheet_count)])
+            # a running timer dated before the new validation date of its employee is stopped as well
+            running_timesheet = self.env['account.analytic.line'].create({
+                'name': 'Running timesheet',
+                'project_id': self.project_customer.id,
+                'employee_id': employees[0].id,
+                'date': today - timedelta(days=3),
+                'unit_amount': 1.0,
+            })
+            running_timesheet.action_timer_start()
+            return timesheets, running_timesheet
+
+        def validate(timesheets):
+            self.env.flush_all()
+            self.env.invalidate_all()
+            query_count = self.env.cr.sql_log_count
+            timesheets.with_user(self.user_manager).action_validate_timesheet()
+            self.env.flush_all()
+            return self.env.cr.sql_log_count - query_count
+
+        warmup_timesheets, dummy = create_timesheets(2, 10)
+        small_timesheets, dummy = create_timesheets(2, 25)
+        large_timesheets, running_timesheet = create_timesheets(40, 1000)
+
+        validate(warmup_timesheets)
+        self.assertEqual(validate(small_timesheets), validate(large_timesheets))
+        self.assertTrue(all(large_timesheets.mapped('validated')))
+        self.assertEqual(
+            set(large_timesheets.employee_id.mapped('last_validated_timesheet_date')),
+            {today - timedelta(days=1)},
+        )
+        self.assertFalse(running_timesheet.is_timer_running)
+        self.assertFalse(running_timesheet.validated)
+
+    def test_timesheet_grid_cells(self):
+        """ The grid cells are kept up to date and answer the read_group of the grid like the timesheets """
+        Timesheet = self.env['account.analytic.line']
+        GridCell = self.env['timesheet.grid.cell']
+        today = fields.Date.today()
+        timesheets = Timesheet.create([{
+            'name': f'Timesheet {i}',
+            'project_id': self.project_customer.id,
+            'task_id': (self.task1 if i % 2 else self.task2).id,
+            'employee_id': (self.empl_employee if i % 3 else self.empl_employee2).id,
+            'date': today - timedelta(days=i % 4),
+            'unit_amount': 0.5 * i,
+        } for i in range(12)])
+        timesheets[0].unit_amount = 5.0
+        timesheets[1].write({'date': today - timedelta(days=5), 'task_id': False})
+        timesheets[2].unlink()
+        self.timesheet1.with_user(self.user_manager).action_validate_timesheet()
+        self.assertFalse(GridCell._check_consistency())
+
+        domain = [('project_id', '!=', False), ('date', '>=', today - timedelta(days=7)), ('date', '<=', today)]
+        groupby = ['project_id', 'task_id', 'employee_id', 'date:day']
+        aggregates = ['__count', 'unit_amount:sum', 'validated:bool_and', 'id:array_agg']
+
+        def read_group(model):
+            return [
+                (*group_values, count, round(unit_amount, 2), validated, sorted(ids))
+                for *group_values, count, unit_amount, validated, ids in model._read_group(domain, groupby, aggregates)
+            ]
+
+        with patch.object(type(GridCell), '_read_group', autospec=True, side_effect=type(GridCell)._read_group) as patched:
+            cell_groups = read_group(Timesheet.with_context(timesheet_grid_cells=True))
+            patched.assert_called_once()
+            # the other read_group of the timesheets, e.g. the reports, don't use the grid cells
+            line_groups = read_group(Timesheet)
+            patched.assert_called_once()
+        self.assertEqual(cell_groups, line_groups)
+        self.assertEqual(
+            read_group(Timesheet.with_user(self.user_manager).with_context(timesheet_grid_cells=True)),
+            read_group(Timesheet.with_user(self.user_manager)),
+        )
+
+        # the consistency checker finds and fixes the cells changed behind the ORM
+        self.env.cr.execute("UPDATE timesheet_grid_cell SET unit_amount = unit_amount + 1 WHERE id = %s", [GridCell.search([], limit=1).id])
+        self.assertEqual(len(GridCell._check_consistency(rebuild=True)), 1)
+        self.assertFalse(GridCell._check_consistency())
+
     def _test_next_date(self, now, result, delay, interval):
 
         def _now(*args, **kwargs):
@@ -339,6 +434,23 @@ class TestTimesheetValidation(TestCommonTimesheet, MockEmail):
             self.assertEqual(len(self._new_mails.filtered(lambda x: x.res_id == user.employee_id.id)), 1, "An email sent to the 'Administrator Manager'")
             self.assertEqual(len(self._new_mails.filtered(lambda x: x.res_id == self.empl_manager.id)), 1, "An email sent to the 'User Empl Officer'")
 
+    def test_working_hours_shared_between_calendars(self):
+        """ The work intervals are only expanded once per calendar, whatever the number of employees """
+        calendars = self.env['resource.calendar'].create([{'name': f'Calendar {i}', 'tz': 'UTC'} for i in range(5)])
+        employees = self.env['hr.employee'].create([{
+            'name': f'Employee {i}',
+            'resource_calendar_id': calendars[i % 5].id,
+            'tz': 'UTC',
+            'employee_type': 'freelance',  # Avoid searching the contract if hr_contract module is installed before this module.
+        } for i in range(50)])
+
+        ResourceCalendar = type(self.env['resource.calendar'])
+        with patch.object(ResourceCalendar, '_work_intervals_batch', autospec=True, side_effect=ResourceCalendar._work_intervals_batch) as patched:
+            working_hours = employees.get_timesheet_and_working_hours('2021-12-01', '2021-12-31')
+        self.assertEqual(patched.call_count, 5)
+        for employee in employees:
+            self.assertEqual(working_hours[employee.id]['working_hours'], 184.0, "Number of hours should be 23d * 8h/d = 184h")
+
     def test_timesheet_employee_reminder(self):
         """ Reminder mail will be sent to each Users' Employee """
 
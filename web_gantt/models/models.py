@@ -1,11 +1,11 @@
 # -*- coding: utf-8 -*-
 
-from collections import defaultdict
 from datetime import datetime, timezone
 from lxml.builder import E
 
 from odoo import _, api, models
 from odoo.exceptions import UserError
+from odoo.tools import SQL
 from odoo.tools.misc import OrderedSet, unique
 
 
@@ -19,6 +19,7 @@ class Base(models.AbstractModel):
     _WEB_GANTT_RESCHEDULE_FORWARD = 'forward'
     _WEB_GANTT_RESCHEDULE_BACKWARD = 'backward'
     _WEB_GANTT_LOOP_ERROR = 'loop_error'
+    _WEB_GANTT_CYCLE_ERROR = 'cycle_error'
 
     @api.model
     def _get_default_gantt_view(self):
@@ -50,22 +51,32 @@ class Base(models.AbstractModel):
     @api.model
     def get_gantt_data(
         self, domain, groupby, read_specification, limit=None, offset=0,
+        group_record_limit=None, group_record_offset=0,
     ):
         """
-        Returns the result of a read_group (and optionally search for and read records inside each
-        group), and the total number of groups matching the search domain.
+        Returns the groups matching the search domain with the records inside each group, and the total
+        number of groups matching the search domain.
+
+        The groups and the records are fetched together with one windowed query. When
+        ``group_record_limit`` is given, only a slice of the records of each group is returned, and
+        each group gives the offset to use to load its next records (False when there are no more).
 
         :param domain: search domain
         :param groupby: list of field to group on (see ``groupby``` param of ``read_group``)
         :param read_specification: web_read specification to read records within the groups
         :param limit: see ``limit`` param of ``read_group``
         :param offset: see ``offset`` param of ``read_group``
+        :param group_record_limit: maximum number of records returned for each group
+        :param group_record_offset: number of records to skip in each group
         :return: {
             'groups': [
                 {
                     '<groupby_1>': <value_groupby_1>,
                     ...,
-                    '__record_ids': [<ids>]
+                    '__record_ids': [<ids>],
+                    # only when group_record_limit is given
+                    '__record_count': number of records in the group,
+                    '__next_record_offset': group_record_offset of the next slice or False,
                 }
             ],
             'records': [<record data>]
@@ -74,6 +85,180 @@ class Base(models.AbstractModel):
         """
         # TODO: group_expand doesn't currently respect the limit/offset
         lazy = not limit and not offset and len(groupby) == 1
+        if not all(self._gantt_is_sliceable_groupby(groupby_spec) for groupby_spec in groupby):
+            return self._get_gantt_data_from_read_group(
+                domain, groupby, read_specification, limit, offset, lazy, group_record_limit, group_record_offset,
+            )
+
+        groups, record_ranks, length = self._gantt_read_group_slices(
+            domain, groupby, limit, offset, group_record_limit, group_record_offset,
+        )
+        if lazy:
+            groups = self._gantt_expand_groups(domain, groupby[0], groups)
+            length = len(groups)
+        elif not groupby and not groups:
+            # like read_group, the groups without groupby always contain one group
+            groups = [{'values': [], 'record_ids': [], 'record_count': 0}]
+            length = 1
+
+        # display_name of the relational groups, read once per comodel
+        display_names = {}
+        for index, groupby_spec in enumerate(groupby):
+            field = self._fields[groupby_spec]
+            if field.relational:
+                comodel_ids = OrderedSet(group['values'][index] for group in groups if group['values'][index])
+                comodel_records = self.env[field.comodel_name].browse(comodel_ids).sudo()
+                display_names[groupby_spec] = dict(zip(comodel_records.ids, comodel_records.mapped('display_name')))
+
+        final_groups = []
+        for group in groups:
+            final_group = {}
+            for groupby_spec, value in zip(groupby, group['values']):
+                if groupby_spec in display_names:
+                    value = (value, display_names[groupby_spec][value]) if value else False
+                final_group[groupby_spec] = False if value is None else value
+            final_group['__record_ids'] = group['record_ids']
+            if group_record_limit is not None:
+                next_record_offset = group_record_offset + group_record_limit
+                final_group['__record_count'] = group['record_count']
+                final_group['__next_record_offset'] = next_record_offset < group['record_count'] and next_record_offset
+            final_groups.append(final_group)
+
+        records = self.browse(sorted(record_ranks, key=record_ranks.get))
+        return {
+            'groups': final_groups,
+            'records': records.web_read(read_specification),
+            'length': length,
+        }
+
+    @api.model
+    def _gantt_is_sliceable_groupby(self, groupby_spec):
+        """ Whether the groups of ``groupby_spec`` can be computed by :meth:`_gantt_read_group_slices`, the
+        other groupbys (granularity, dates, properties, ...) are formatted by ``read_group``.
+        """
+        field = self._fields.get(groupby_spec)
+        return bool(
+            field and field.store
+            and (field.column_type or field.type == 'many2many')
+            and field.type not in ('date', 'datetime', 'properties')
+        )
+
+    @api.model
+    def _gantt_read_group_slices(self, domain, groupby, limit, offset, group_record_limit, group_record_offset):
+        """ Fetch the groups of a page of groups and a slice of the records of each group in one query.
+
+        The groups are ordered like ``read_group`` orders them (the many2one groups follow the order of
+        their comodel) and the records of each group follow the order of the model.
+
+        :return: a tuple (groups, record_ranks, length) where groups is a list of dicts with the raw
+            ``values`` of the group, its ``record_ids`` and its ``record_count``, record_ranks maps the
+            returned record ids to their rank in the order of the model and length is the total number
+            of groups
+        """
+        query = self._search(domain)
+        groupby_terms = []
+        group_order_terms = []
+        self.flush_model()
+        for groupby_spec in groupby:
+            sql_groupby, __ = self._read_group_groupby(groupby_spec, query)
+            field = self._fields[groupby_spec]
+            if field.type == 'many2one':
+                comodel = self.env[field.comodel_name]
+                comodel.flush_model()
+                coalias = query.left_join(self._table, groupby_spec, comodel._table, 'id', groupby_spec)
+                group_order_terms.append(comodel._order_to_sql(comodel._order, query, alias=coalias))
+            # the raw value breaks the ties of the comodel order
+            group_order_terms.append(sql_groupby)
+            groupby_terms.append(sql_groupby)
+        record_order = SQL("%s, %s", self._order_to_sql(self._order, query), SQL.identifier(self._table, 'id'))
+
+        if groupby_terms:
+            partition = SQL("PARTITION BY %s", SQL(", ").join(groupby_terms))
+            group_rank = SQL("DENSE_RANK() OVER (ORDER BY %s)", SQL(", ").join(group_order_terms))
+        else:
+            partition = SQL("")
+            group_rank = SQL("1")
+
+        conditions = [SQL("group_rank > %s", offset or 0)]
+        if limit:
+            conditions.append(SQL("group_rank <= %s", (offset or 0) + limit))
+        # the first record of each group is always fetched, it brings the group when it is not in the slice
+        record_conditions = [SQL("group_record_rank > %s", group_record_offset)]
+        if group_record_limit is not None:
+            record_conditions.append(SQL("group_record_rank <= %s", group_record_offset + group_record_limit))
+        conditions.append(SQL("(group_record_rank = 1 OR %s)", SQL(" AND ").join(record_conditions)))
+
+        query.order = None
+        query_slice = query.select(
+            SQL("%s AS id", SQL.identifier(self._table, 'id')),
+            SQL("DENSE_RANK() OVER (ORDER BY %s) AS record_rank", record_order),
+            SQL("ROW_NUMBER() OVER (%s ORDER BY %s) AS group_record_rank", partition, record_order),
+            SQL("COUNT(*) OVER (%s) AS group_record_count", partition),
+            SQL("%s AS group_rank", group_rank),
+            *(SQL("%s AS %s", term, SQL.identifier(f'group_{index}')) for index, term in enumerate(groupby_terms)),
+        )
+        self.env.cr.execute(SQL(
+            """
+            SELECT *
+              FROM (SELECT MAX(slice.group_rank) OVER () AS group_count, slice.*
+                      FROM (%s) slice) slice
+             WHERE %s
+          ORDER BY group_rank, group_record_rank
+            """,
+            query_slice,
+            SQL(" AND ").join(conditions),
+        ))
+
+        groups = {}
+        record_ranks = {}
+        length = 0
+        for group_count, record_id, record_rank, group_record_rank, group_record_count, group_rank, *group_values \
+                in self.env.cr.fetchall():
+            length = group_count
+            group = groups.get(group_rank)
+            if group is None:
+                group = groups[group_rank] = {
+                    'values': group_values,
+                    'record_ids': [],
+                    'record_count': group_record_count,
+                }
+            if group_record_rank > group_record_offset and (
+                group_record_limit is None or group_record_rank <= group_record_offset + group_record_limit
+            ):
+                group['record_ids'].append(record_id)
+                record_ranks[record_id] = record_rank
+        return list(groups.values()), record_ranks, length
+
+    @api.model
+    def _gantt_expand_groups(self, domain, groupby_spec, groups):
+        """ Add the empty groups given by the group_expand of the field, like ``read_group`` does. """
+        field = self._fields[groupby_spec]
+        group_expand = field.group_expand
+        if not group_expand:
+            return groups
+        if isinstance(group_expand, str):
+            group_expand = getattr(type(self), group_expand)
+        values = [group['values'][0] for group in groups if group['values'][0]]
+        if field.relational:
+            comodel = self.env[field.comodel_name]
+            keys = group_expand(self, comodel.browse(values), domain, comodel._order).ids
+        else:
+            keys = group_expand(self, values, domain, None)
+
+        # expanded groups first, in the order given by group_expand, then the other groups
+        expanded_groups = dict.fromkeys(keys)
+        for group in groups:
+            expanded_groups[group['values'][0]] = group
+        return [
+            group or {'values': [key], 'record_ids': [], 'record_count': 0}
+            for key, group in expanded_groups.items()
+        ]
+
+    @api.model
+    def _get_gantt_data_from_read_group(
+        self, domain, groupby, read_specification, limit, offset, lazy, group_record_limit, group_record_offset,
+    ):
+        """ Fallback of :meth:`get_gantt_data` for the groupbys formatted by ``read_group``. """
         # Because there is no limit by group, we can fetch record_ids as aggregate
         final_result = self.web_read_group(
             domain, ['__record_ids:array_agg(id)'], groupby,
@@ -87,17 +272,24 @@ class Base(models.AbstractModel):
         ))
         # Do search_fetch to order records (model order can be no-trivial)
         all_records = self.search_fetch([('id', 'in', all_record_ids)], read_specification.keys())
-        final_result['records'] = all_records.web_read(read_specification)
 
         ordered_set_ids = OrderedSet(all_records._ids)
+        record_ids = OrderedSet()
         for group in final_result['groups']:
             # Reorder __record_ids
             group['__record_ids'] = list(ordered_set_ids & OrderedSet(group['__record_ids']))
+            if group_record_limit is not None:
+                next_record_offset = group_record_offset + group_record_limit
+                group['__record_count'] = len(group['__record_ids'])
+                group['__next_record_offset'] = next_record_offset < group['__record_count'] and next_record_offset
+                group['__record_ids'] = group['__record_ids'][group_record_offset:next_record_offset]
+            record_ids.update(group['__record_ids'])
             # We don't need these in the gantt view
             del group['__domain']
             del group[f'{groupby[0]}_count' if lazy else '__count']
             group.pop('__fold', None)
 
+        final_result['records'] = all_records.filtered(lambda record: record.id in record_ids).web_read(read_specification)
         return final_result
 
     @api.model
@@ -169,13 +361,10 @@ class Base(models.AbstractModel):
 
         sp = self.env.cr.savepoint()
 
-        record_ids_to_exclude = defaultdict(list)
-
         result = result is True and trigger_record._web_gantt_action_reschedule_related_records(
             dependency_field_name, dependency_inverted_field_name,
             start_date_field_name, stop_date_field_name,
             direction,
-            record_ids_to_exclude,
             cache
         )
 
@@ -187,6 +376,10 @@ class Base(models.AbstractModel):
                 notification_type = 'info'
                 message = _('You cannot reschedule tasks that do not follow a direct dependency path. '
                             'Only the first task has been automatically rescheduled.')
+            elif result == self._WEB_GANTT_CYCLE_ERROR:
+                notification_type = 'warning'
+                message = _('You cannot reschedule tasks having circular dependencies. '
+                            'Only the first task has been automatically rescheduled.')
             else:
                 raise ValueError('Unsupported result value')
             result = {
@@ -334,12 +527,17 @@ class Base(models.AbstractModel):
         dependency_field_name, dependency_inverted_field_name,
         start_date_field_name, stop_date_field_name,
         direction,
-        record_ids_to_exclude,
         cache
     ):
         """ Reschedule the related records, that is the records available in both fields dependency_field_name and
             dependency_inverted_field_name and which satisfies some conditions which are tested in
-            _web_gantt_get_rescheduling_candidates
+            _web_gantt_get_rescheduling_candidates.
+
+            The dependency graph of the records is loaded at once, then the records are rescheduled level by level
+            from the current records: each record is rescheduled against the record of the previous level it depends
+            on (or that depends on it). The new dates are kept in cache during the pass and flushed together. When
+            the pass reaches a record already rescheduled, the dependencies between the rescheduled records tell a
+            circular dependency from a `loop`.
 
             :param dependency_field_name: The field name of the relation between the master and slave records.
             :param dependency_inverted_field_name: The field name of the relation between the slave and the parent
@@ -347,104 +545,183 @@ class Base(models.AbstractModel):
             :param start_date_field_name: The start date field used in the gantt view.
             :param stop_date_field_name: The stop date field used in the gantt view.
             :param direction: The direction of the rescheduling 'forward' or 'backward'
-            :param record_ids_to_exclude: The record Ids that have to be excluded from the return candidates.
             :param cache: An object that contains reusable information in the context of gantt record rescheduling.
-            :return: True if successful, False if not.
-            :rtype: bool
+            :return: True if successful, False if a record cannot be rescheduled, _WEB_GANTT_LOOP_ERROR if the
+                     dependencies do not follow a direct path and _WEB_GANTT_CYCLE_ERROR if they are circular.
+            :rtype: bool | str
         """
-        rescheduling_candidates = self._web_gantt_get_rescheduling_candidates(
+        graph_records, masters, slaves = self._web_gantt_reschedule_get_dependency_graph(
             dependency_field_name, dependency_inverted_field_name,
-            start_date_field_name, stop_date_field_name,
-            direction,
-            record_ids_to_exclude
         )
-
-        if rescheduling_candidates is False:
-            return self._WEB_GANTT_LOOP_ERROR
-
-        if not rescheduling_candidates:
-            return True
-
-        result = True
-        records_to_propagate = self.env[self._name]
-        for rescheduling_candidate in rescheduling_candidates:
-            record, related_record, is_related_record_master = rescheduling_candidate
-
-            new_start_date, new_stop_date = record._web_gantt_reschedule_record(
-                related_record, is_related_record_master,
-                start_date_field_name, stop_date_field_name,
-                cache
-            )
-            record_write_result = record._web_gantt_reschedule_write_new_dates(
-                new_start_date, new_stop_date,
+        graph_records.fetch([start_date_field_name, stop_date_field_name])
+
+        # id of the rescheduled records -> id of the record they have been rescheduled against
+        parents = dict.fromkeys(self.ids, False)
+        records = self.with_prefetch(graph_records._prefetch_ids)
+        while records:
+            rescheduling_candidates = records._web_gantt_get_rescheduling_candidates(
+                masters, slaves,
                 start_date_field_name, stop_date_field_name,
+                direction,
+                parents
             )
 
-            if record_write_result:
-                records_to_propagate |= record
-                record_ids_to_exclude[record.id] = record_ids_to_exclude[related_record.id] + [related_record.id]
+            if rescheduling_candidates is False:
+                # only the records reached by the rescheduling matter, a cycle elsewhere in the graph is ignored
+                if self._web_gantt_reschedule_has_cycle(masters, slaves, parents):
+                    return self._WEB_GANTT_CYCLE_ERROR
+                return self._WEB_GANTT_LOOP_ERROR
+
+            next_record_ids = []
+            for record, related_record, is_related_record_master in rescheduling_candidates:
+                new_start_date, new_stop_date = record._web_gantt_reschedule_record(
+                    related_record, is_related_record_master,
+                    start_date_field_name, stop_date_field_name,
+                    cache
+                )
+                if not record._web_gantt_reschedule_write_new_dates(
+                    new_start_date, new_stop_date,
+                    start_date_field_name, stop_date_field_name,
+                ):
+                    return False
+                parents[record.id] = related_record.id
+                next_record_ids.append(record.id)
+            records = records.browse(next_record_ids).with_prefetch(records._prefetch_ids)
 
-            result &= record_write_result
+        self.flush_model([start_date_field_name, stop_date_field_name])
+        return True
 
-        for record in self:
-            record_ids_to_exclude.pop(record.id, None)
+    def _web_gantt_reschedule_get_dependency_graph(self, dependency_field_name, dependency_inverted_field_name):
+        """ Get the records connected to the current records through their dependencies, together with the
+            dependencies between them. When dependency_field_name is a stored many2many field, the whole graph is
+            loaded with one recursive query on its relation table.
 
-        related_records_result = records_to_propagate._web_gantt_action_reschedule_related_records(
-            dependency_field_name, dependency_inverted_field_name,
-            start_date_field_name, stop_date_field_name,
-            direction,
-            record_ids_to_exclude,
-            cache
-        )
-        if isinstance(related_records_result, bool):
-            result &= related_records_result
+            :param dependency_field_name: The field name of the relation between the master and slave records.
+            :param dependency_inverted_field_name: The field name of the relation between the slave and the parent
+                   records.
+            :return: a tuple (records, masters, slaves) where masters (resp. slaves) maps the id of each record to
+                     the ids of the records it depends on (resp. that depend on it)
+            :rtype: tuple(AbstractModel, dict, dict)
+        """
+        field = self._fields[dependency_field_name]
+        if field.type == 'many2many' and field.store:
+            self.flush_model([dependency_field_name])
+            self.env.cr.execute(SQL(
+                """
+                WITH RECURSIVE graph(id) AS (
+                    SELECT UNNEST(%(ids)s)
+                     UNION
+                    SELECT CASE WHEN %(slave)s = graph.id THEN %(master)s ELSE %(slave)s END
+                      FROM graph
+                      JOIN %(relation)s dependency ON %(slave)s = graph.id OR %(master)s = graph.id
+                )
+                SELECT graph.id, ARRAY_AGG(%(master)s ORDER BY %(master)s) FILTER (WHERE %(master)s IS NOT NULL)
+                  FROM graph
+             LEFT JOIN %(relation)s dependency ON %(slave)s = graph.id
+              GROUP BY graph.id
+                """,
+                ids=list(self.ids),
+                relation=SQL.identifier(field.relation),
+                slave=SQL.identifier('dependency', field.column1),
+                master=SQL.identifier('dependency', field.column2),
+            ))
+            master_ids_per_record = dict(self.env.cr.fetchall())
+            # like reading the field, only keep the active records the user can read
+            records = self.search([('id', 'in', list(master_ids_per_record))])
+            record_ids = set(records.ids)
+            masters = {
+                record_id: [master_id for master_id in master_ids_per_record[record_id] or [] if master_id in record_ids]
+                for record_id in records.ids
+            }
         else:
-            result = related_records_result
+            record_ids = set(self.ids)
+            new_records = self
+            while new_records:
+                new_records = (new_records[dependency_field_name] | new_records[dependency_inverted_field_name]) \
+                    .filtered(lambda record: record.id not in record_ids)
+                record_ids.update(new_records.ids)
+            records = self.browse(record_ids)
+            masters = {
+                record.id: [master_id for master_id in record[dependency_field_name].ids if master_id in record_ids]
+                for record in records
+            }
 
-        return result
+        slaves = {record_id: [] for record_id in masters}
+        for record_id, master_ids in masters.items():
+            for master_id in master_ids:
+                slaves[master_id].append(record_id)
+        return records, masters, slaves
+
+    @api.model
+    def _web_gantt_reschedule_has_cycle(self, masters, slaves, record_ids):
+        """ Get whether the dependencies between the given records contain a circular dependency, by sorting them
+            topologically.
+
+            :param masters: A dict mapping the record ids to the ids of the records they depend on.
+            :param slaves: A dict mapping the record ids to the ids of the records that depend on them.
+            :param record_ids: The ids of the records to consider, the dependencies with other records are ignored.
+            :return: True if there is a cycle, False if not.
+            :rtype: bool
+        """
+        record_ids = set(record_ids)
+        master_count = {
+            record_id: sum(master_id in record_ids for master_id in masters.get(record_id, ()))
+            for record_id in record_ids
+        }
+        record_ids_to_sort = [record_id for record_id, count in master_count.items() if not count]
+        sorted_count = 0
+        while record_ids_to_sort:
+            record_id = record_ids_to_sort.pop()
+            sorted_count += 1
+            for slave_id in slaves.get(record_id, ()):
+                if slave_id not in record_ids:
+                    continue
+                master_count[slave_id] -= 1
+                if not master_count[slave_id]:
+                    record_ids_to_sort.append(slave_id)
+        return sorted_count < len(master_count)
 
     def _web_gantt_get_rescheduling_candidates(
         self,
-        dependency_field_name, dependency_inverted_field_name,
+        masters, slaves,
         start_date_field_name, stop_date_field_name,
         direction,
-        record_ids_to_exclude
+        parents
     ):
         """ Get the current records' related records rescheduling candidates (the records that depend on them as well
             as the records they depend on) for the rescheduling process as well as their reference records (the
             furthest record that depends on it, as well as the furthest record it depends on).
 
-            :param dependency_field_name: The field name of the relation between the master and slave records.
-            :param dependency_inverted_field_name: The field name of the relation between the slave and the parent
-                   records.
+            :param masters: A dict mapping the record ids to the ids of the records they depend on.
+            :param slaves: A dict mapping the record ids to the ids of the records that depend on them.
             :param start_date_field_name: The start date field used in the gantt view.
             :param stop_date_field_name: The stop date field used in the gantt view.
             :param direction: The direction of the rescheduling 'forward' or 'backward'
-            :param record_ids_to_exclude: The record Ids that have to be excluded from the return candidates.
+            :param parents: A dict mapping the ids of the records already rescheduled to the id of the record they
+                   have been rescheduled against (False for the records that triggered the rescheduling).
             :return: a list of tuples (record, related_record, is_related_record_master)
                      where: - record is the record to be rescheduled
                             - related_record is the record that is the target of the rescheduling
                             - is_related_record_master informs whether the related_record is a record that the current
                               record depends on (so-called master) or a record that depends on the current record
                               (so-called slave)
-            :rtype: tuple(AbstractModel, AbstractModel, bool)
+                     or False if the records cannot be rescheduled because of a `loop`.
+            :rtype: list[tuple(AbstractModel, AbstractModel, bool)] | bool
         """
         rescheduling_forward = direction == self._WEB_GANTT_RESCHEDULE_FORWARD
         rescheduling_backward = direction == self._WEB_GANTT_RESCHEDULE_BACKWARD
 
-        slave_per_record = defaultdict(lambda: self.env[self._name])
-        master_per_record = defaultdict(lambda: self.env[self._name])
-        records_to_reschedule = self.env[self._name]
+        slave_per_record = {}
+        master_per_record = {}
+        records_to_reschedule = []
 
-        # The goal is to automatically exclude ids from the `dependency_field_name` and `dependency_inverted_field_name`
-        # fields but not the self.ids. And the later call on _web_gantt_reschedule_is_record_candidate will ensure that
-        # the self.ids are good candidates.
+        # The record a record has been rescheduled against is excluded from its candidates. Any other record that
+        # has already been rescheduled and would have to be rescheduled again means that we are resolving a `loop`.
 
         for record in self:
-            if record.id in record_ids_to_exclude[record.id] \
-               or not record._web_gantt_reschedule_is_record_candidate(start_date_field_name, stop_date_field_name):
+            if not record._web_gantt_reschedule_is_record_candidate(start_date_field_name, stop_date_field_name):
                 continue
-            for master_record in record[dependency_field_name]:
+            for master_record in self.browse(masters.get(record.id, ())).with_prefetch(self._prefetch_ids):
                 #
                 # A      B       C      D
                 #   \      \   /      /
@@ -458,7 +735,7 @@ class Base(models.AbstractModel):
                 # So if we are considering we are rescheduling F towards H then, once F is moved, A, B and G
                 # will be added to the candidates as we are rescheduling forward.
 
-                if master_record.id in record_ids_to_exclude[record.id] \
+                if master_record.id == parents[record.id] \
                    or not master_record._web_gantt_reschedule_is_record_candidate(
                         start_date_field_name, stop_date_field_name) \
                    or not self._web_web_gantt_reschedule_is_relation_candidate(
@@ -467,15 +744,15 @@ class Base(models.AbstractModel):
                             master_record, record, start_date_field_name, stop_date_field_name, rescheduling_forward):
                     continue
 
-                # If we have two same candidates, it means that we are resolving a `loop`
-                # with an even number of members.
-                if master_record in slave_per_record:
+                # If we have two same candidates, or a candidate that has already been rescheduled, it means that
+                # we are resolving a `loop`.
+                if master_record.id in parents or master_record in slave_per_record:
                     return False
 
                 slave_per_record[master_record] = record
-                records_to_reschedule |= master_record
+                records_to_reschedule.append(master_record)
 
-            for slave_record in record[dependency_inverted_field_name]:
+            for slave_record in self.browse(slaves.get(record.id, ())).with_prefetch(self._prefetch_ids):
                 #
                 # A      B       C      D
                 #   \      \   /      /
@@ -489,7 +766,7 @@ class Base(models.AbstractModel):
                 # So if we are considering we are rescheduling F towards G then C, once F is moved, D and H
                 # will be added to the candidates as we are rescheduling backward.
 
-                if slave_record.id in record_ids_to_exclude[record.id] \
+                if slave_record.id == parents[record.id] \
                    or not slave_record._web_gantt_reschedule_is_record_candidate(
                         start_date_field_name, stop_date_field_name) \
                    or not self._web_web_gantt_reschedule_is_relation_candidate(
@@ -498,30 +775,23 @@ class Base(models.AbstractModel):
                             record, slave_record, start_date_field_name, stop_date_field_name, rescheduling_backward):
                     continue
 
-                # If we have two same candidates, it means that we are resolving a `loop`
-                # with an even number of members.
-                if slave_record in master_per_record:
+                # If we have two same candidates, or a candidate that has already been rescheduled, it means that
+                # we are resolving a `loop`.
+                if slave_record.id in parents or slave_record in master_per_record:
                     return False
 
                 master_per_record[slave_record] = record
-                records_to_reschedule |= slave_record
-
-        # If we have a record that is both a slave and a master candidate, it means that we are resolving a `loop`
-        # with an even number of members.
-        if set.intersection(set(slave_per_record.keys()), set(master_per_record.keys())):
-            if set.intersection(*map(set, [record_ids_to_exclude[rec.id]for rec in self])):
-                return False
-
-        # If we have a record from self that is a slave candidate and a record from self that is a master candidate,
-        # it means that we are resolving a loop with an odd number of members.
-        if any(record in slave_per_record.keys() for record in self) and \
-           any(record in master_per_record.keys() for record in self):
+                records_to_reschedule.append(slave_record)
+
+        # If we have a record that is both a slave and a master candidate of records that have been rescheduled
+        # against another record, it means that we are resolving a `loop` with an even number of members.
+        if slave_per_record.keys() & master_per_record.keys() and any(parents[record.id] for record in self):
             return False
 
         return [
             (record_to_reschedule,
-             slave_per_record[record_to_reschedule] or master_per_record[record_to_reschedule],
-             bool(master_per_record[record_to_reschedule])
+             slave_per_record.get(record_to_reschedule) or master_per_record[record_to_reschedule],
+             record_to_reschedule in master_per_record
              ) for record_to_reschedule in records_to_reschedule
         ]
 
@@ -600,6 +600,15 @@ export class GridDataPoint {
         }
     }
 
+    /**
+     * Context added to the one of the user to read the groups of the grid.
+     *
+     * @returns {Object}
+     */
+    get readGroupContext() {
+        return {};
+    }
+
     async fetchData() {
         const data = await this.orm.webReadGroup(
             this.resModel,
@@ -610,6 +619,7 @@ export class GridDataPoint {
             this.groupByFields,
             {
                 lazy: false,
+                context: this.readGroupContext,
             }
         );
         if (this.orm.isSample) {